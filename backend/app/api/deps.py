@@ -1,13 +1,27 @@
+from typing import Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import Depends
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal, get_db  # get_db реэкспортируется для роутов
 
-def get_db():
-    db = SessionLocal()
-    try:
+# Сессия, которую отдаёт get_async_db
+AnySession = Union[Session, AsyncSession]
+
+async def get_async_db(db: Session = Depends(get_db)):
+    """
+    Сессия для async-роутов: AsyncSession при ASYNC_DATABASE, иначе обычная
+    Session. С любой из них работают через app.crud.aio — синхронная
+    уходит в пул потоков и не блокирует event loop.
+
+    Синхронная сессия — та же, что отдаёт get_db (FastAPI создаёт её один
+    раз на запрос и делит с get_current_user): с маршрутизацией чтения на
+    реплику и «прилипанием» к основной БД после записи. Закрывает её get_db.
+    """
+    if AsyncSessionLocal is None:
         yield db
-    finally:
-        db.close()
+        return
+    async with AsyncSessionLocal() as session:
+        yield session
 
 # Обёртка для security.py
 from app.core.security import get_current_user as _get_current_user
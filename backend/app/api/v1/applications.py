@@ -1,170 +1,269 @@
 # app/api/v1/applications.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Response, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import List, Optional
 import json
-import os
-import uuid
 from app import crud, models
-from app.schemas.application import ApplicationCreate, Application
-from app.api.deps import get_db
+from app.schemas.application import ApplicationCreate, Application, ApplicationSummary
+from app.api.deps import AnySession, get_async_db, get_db
+from app.core import storage
+from app.core.files import send_file
+from app.core.pagination import decode_cursor, set_next_cursor
 from app.core.security import get_current_user
+from app.core.serialization import PydanticSerializer, RowSerializer
 
 router = APIRouter()
 
-# Вспомогательная функция для сохранения файла
-def save_upload_file(upload_file: UploadFile, folder: str = "uploads/resumes") -> str:
-    os.makedirs(folder, exist_ok=True)
-    file_ext = os.path.splitext(upload_file.filename)[1]
-    if not file_ext:
-        file_ext = ".pdf"
-    filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(folder, filename)
-    with open(file_path, "wb") as f:
-        f.write(upload_file.file.read())
-    return file_path
+# Списки откликов — dict прямо из строк проекции; карточка — через Pydantic
+# (анкета хранится JSON-строкой, её разбирает валидатор схемы)
+_summary = RowSerializer(ApplicationSummary)
+_detail = PydanticSerializer(Application)
+
+_FIELDS_DESCRIPTION = "Только эти поля через запятую, например id,created_at,posting_title"
+
+async def _create_application(
+    db: AnySession,
+    *,
+    obj_in: ApplicationCreate,
+    applicant_id: int,
+    resume_file: Optional[UploadFile],
+):
+    """
+    Создать отклик; файл резюме — в контентно-адресуемое хранилище
+    (одинаковые резюме хранятся один раз). Файл переносится на место только
+    после коммита, при любой ошибке временная копия удаляется — в хранилище
+    не остаётся файлов без записи в resume_blobs.
+    """
+    if not resume_file:
+        return await crud.aio.application.create(db, obj_in=obj_in, applicant_id=applicant_id)
+
+    stored = await storage.receive_upload(resume_file)
+    filename = storage.blob_filename(stored.sha256, resume_file.filename)
+    try:
+        resume_blob, created = await crud.aio.resume_blob.get_or_create(
+            db, stored=stored, filename=filename
+        )
+        application = await crud.aio.application.create(
+            db, obj_in=obj_in, applicant_id=applicant_id, resume_blob=resume_blob
+        )
+    except BaseException:
+        await run_in_threadpool(storage.discard, stored.path)
+        raise
+    if created:
+        await run_in_threadpool(storage.promote, stored.path, filename)
+    else:
+        # Такое содержимое уже хранится — временная копия не нужна
+        await run_in_threadpool(storage.discard, stored.path)
+    return application
 
 
 @router.post("/vacancy/{vacancy_id}", response_model=Application)
 async def apply_to_vacancy(
     vacancy_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
     resume_file: UploadFile = File(None),
     resume_data: str = Form(None),  # JSON-строка из формы
 ):
     if current_user.role != "applicant":
         raise HTTPException(status_code=403, detail="Only applicant representatives can apply")
-    vacancy = crud.vacancy.get(db, id=vacancy_id)
+    vacancy = await crud.aio.vacancy.get(db, id=vacancy_id)
     if not vacancy or not vacancy.is_published:
         raise HTTPException(status_code=404, detail="Vacancy not found or not published")
-    if crud.application.get_by_user_and_vacancy(db, user_id=current_user.id, vacancy_id=vacancy_id):
+    if await crud.aio.application.get_by_user_and_vacancy(db, user_id=current_user.id, vacancy_id=vacancy_id):
         raise HTTPException(status_code=400, detail="You have already applied to this vacancy")
     if not resume_file and not resume_data:
         raise HTTPException(status_code=400, detail="Either resume file or resume data must be provided")
 
-    file_path = None
-    if resume_file:
-        file_path = save_upload_file(resume_file)
-
     # Передаём СТРОКУ напрямую — Pydantic сам распарсит благодаря Json[Dict]
     app_create = ApplicationCreate(
         vacancy_id=vacancy_id,
-        resume_file_path=file_path,
         resume_data=resume_data  # ← строка, не dict!
     )
-    return crud.application.create(db=db, obj_in=app_create, applicant_id=current_user.id)
+    return await _create_application(
+        db, obj_in=app_create, applicant_id=current_user.id, resume_file=resume_file
+    )
 
 
 @router.post("/internship/{internship_id}", response_model=Application)
 async def apply_to_internship(
     internship_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
     resume_file: UploadFile = File(None),
     resume_data: str = Form(None),
 ):
     if current_user.role != "applicant":
         raise HTTPException(status_code=403, detail="Only applicant representatives can apply")
-    internship = crud.internship.get(db, id=internship_id)
+    internship = await crud.aio.internship.get(db, id=internship_id)
     if not internship or not internship.is_published:
         raise HTTPException(status_code=404, detail="Internship not found or not published")
-    if crud.application.get_by_user_and_internship(db, user_id=current_user.id, internship_id=internship_id):
+    if await crud.aio.application.get_by_user_and_internship(db, user_id=current_user.id, internship_id=internship_id):
         raise HTTPException(status_code=400, detail="You have already applied to this internship")
     if not resume_file and not resume_data:
         raise HTTPException(status_code=400, detail="Either resume file or resume data must be provided")
 
-    file_path = None
-    if resume_file:
-        file_path = save_upload_file(resume_file)
-
     app_create = ApplicationCreate(
         internship_id=internship_id,
-        resume_file_path=file_path,
         resume_data=resume_data  # ← строка!
     )
-    return crud.application.create(db=db, obj_in=app_create, applicant_id=current_user.id)
+    return await _create_application(
+        db, obj_in=app_create, applicant_id=current_user.id, resume_file=resume_file
+    )
+
+
+def _inbox(
+    db: Session,
+    *,
+    owner_id: int,
+    kind: str,
+    posting_id: Optional[int],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    skill: Optional[List[str]],
+    education: Optional[str],
+    city: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+    fields: Optional[str],
+):
+    serializer = _summary.narrow(fields)
+    items = crud.application.get_inbox(
+        db,
+        owner_id=owner_id,
+        kind=kind,
+        posting_id=posting_id,
+        created_from=created_from,
+        created_to=created_to,
+        skills=skill,
+        education=education,
+        city=city,
+        before_id=decode_cursor(cursor),
+        limit=limit,
+        fields=serializer.fields,
+    )
+    response = Response(content=serializer.dump_json(items), media_type="application/json")
+    set_next_cursor(response, items, limit)
+    return response
 
 
 # HR: получить все отклики на свои вакансии
-@router.get("/my-vacancy-applications", response_model=list[Application])
+@router.get("/my-vacancy-applications", response_model=list[ApplicationSummary])
 def get_my_vacancy_applications(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    vacancy_id: Optional[int] = Query(None, description="Только отклики на эту вакансию"),
+    created_from: Optional[datetime] = Query(None, description="Отклики не раньше этой даты"),
+    created_to: Optional[datetime] = Query(None, description="Отклики раньше этой даты"),
+    skill: Optional[List[str]] = Query(None, description="Навык из анкеты (можно несколько — нужны все)"),
+    education: Optional[str] = Query(None, description="Образование из анкеты"),
+    city: Optional[str] = Query(None, description="Город из анкеты"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (заголовок X-Next-Cursor)"),
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
 ):
     if current_user.role != "hr":
         raise HTTPException(status_code=403, detail="Only HR can view applications")
 
-    my_vacancies = crud.vacancy.get_by_owner(db, owner_id=current_user.id)
-    vacancy_ids = [v.id for v in my_vacancies]
-    if not vacancy_ids:
-        return []
-
-    return db.query(models.Application).filter(
-        models.Application.vacancy_id.in_(vacancy_ids)
-    ).all()
+    return _inbox(
+        db,
+        owner_id=current_user.id, kind="vacancy", posting_id=vacancy_id,
+        created_from=created_from, created_to=created_to,
+        skill=skill, education=education, city=city, cursor=cursor, limit=limit, fields=fields,
+    )
 
 
-# HR: получить все отклики на свои стажировки
-@router.get("/my-internship-applications", response_model=list[Application])
+# Владелец стажировок: получить все отклики на свои стажировки
+@router.get("/my-internship-applications", response_model=list[ApplicationSummary])
 def get_my_internship_applications(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    internship_id: Optional[int] = Query(None, description="Только отклики на эту стажировку"),
+    created_from: Optional[datetime] = Query(None, description="Отклики не раньше этой даты"),
+    created_to: Optional[datetime] = Query(None, description="Отклики раньше этой даты"),
+    skill: Optional[List[str]] = Query(None, description="Навык из анкеты (можно несколько — нужны все)"),
+    education: Optional[str] = Query(None, description="Образование из анкеты"),
+    city: Optional[str] = Query(None, description="Город из анкеты"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (заголовок X-Next-Cursor)"),
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
 ):
     if current_user.role != "hr":
         raise HTTPException(status_code=403, detail="Only HR can view applications")
 
-    my_internships = crud.internship.get_by_owner(db, owner_id=current_user.id)
-    internship_ids = [i.id for i in my_internships]
-    if not internship_ids:
-        return []
-
-    return db.query(models.Application).filter(
-        models.Application.internship_id.in_(internship_ids)
-    ).all()
+    return _inbox(
+        db,
+        owner_id=current_user.id, kind="internship", posting_id=internship_id,
+        created_from=created_from, created_to=created_to,
+        skill=skill, education=education, city=city, cursor=cursor, limit=limit, fields=fields,
+    )
 
 
 # НОВЫЙ ЭНДПОИНТ: скачивание резюме по имени файла
 @router.get("/resume/{filename}")
 async def download_resume(
     filename: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AnySession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "hr":
         raise HTTPException(status_code=403, detail="Only HR can download resumes")
 
-    file_path = os.path.join("uploads", "resumes", filename)
-    if not os.path.isfile(file_path):
+    # Один запрос: файл по уникальному имени + проверка владельца через EXISTS
+    found = await crud.aio.resume_blob.get_for_owner(db, filename=filename, owner_id=current_user.id)
+    if not found:
         raise HTTPException(status_code=404, detail="Resume file not found")
+    blob, is_owner = found
+    if not is_owner:
+        raise HTTPException(status_code=403, detail="You don't own this application")
+
+    return await send_file(
+        request,
+        storage.blob_path(blob.filename),
+        # Тип — только по расширению из белого списка, не сохранённый от клиента
+        media_type=storage.guess_content_type(blob.filename),
+        etag=f'"{blob.sha256}"',
+        filename=blob.filename,
+    )
+
 
-    # Проверка: файл должен быть привязан к вакансии или стажировке этого HR
-    application = db.query(models.Application).filter(
-        models.Application.resume_file_path == os.path.join("uploads", "resumes", filename)
-    ).first()
+# Карточка отклика с полной анкетой (в списках анкета не отдаётся)
+@router.get("/{application_id}", response_model=Application)
+def read_application(
+    application_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
+):
+    serializer = _detail.narrow(fields)
+    found = crud.application.get_detail(db, application_id=application_id, fields=serializer.fields)
+    if not found:
+        raise HTTPException(status_code=404, detail="Application not found")
+    application, owner_id = found
+    if current_user.role != "admin" and current_user.id not in (owner_id, application.applicant_id):
+        raise HTTPException(status_code=403, detail="You don't have access to this application")
+    return Response(content=serializer.dump_json(application), media_type="application/json")
+
+
+# Отозвать отклик (соискатель — свой, администратор — любой). Файл резюме
+# удаляется с диска, когда на него не остаётся ссылок
+@router.delete("/{application_id}")
+def delete_application(
+    application_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    application = crud.application.get(db, id=application_id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
+    if application.applicant_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    # Проверка вакансии
-    if application.vacancy_id:
-        vacancy = db.query(models.Vacancy).filter(
-            models.Vacancy.id == application.vacancy_id
-        ).first()
-        if not vacancy or vacancy.owner_id != current_user.id:
-            raise HTTPException(status_code=403, detail="You don't own this application")
-
-    # Проверка стажировки
-    if application.internship_id:
-        internship = db.query(models.Internship).filter(
-            models.Internship.id == application.internship_id
-        ).first()
-        if not internship or internship.owner_id != current_user.id:
-            raise HTTPException(status_code=403, detail="You don't own this application")
-
-    return FileResponse(
-        file_path,
-        media_type='application/octet-stream',
-        filename=filename
-    )
\ No newline at end of file
+    orphan = crud.application.delete(db, application=application)
+    if orphan:
+        storage.discard_blob(orphan, lambda: crud.resume_blob.get_by_filename(db, orphan) is not None)
+    return {"message": "Application deleted successfully"}
@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 from app import crud
-from app.api.deps import get_db
-from app.core.security import verify_password, create_access_token
+from app.api.deps import AnySession, get_async_db
+from app.core.security import verify_password_pooled, create_access_token
 
 router = APIRouter()
 
+# async: проверка bcrypt ждёт пул процессов через await, не занимая поток
 @router.post("/token")
-def login_for_access_token(
-    db: Session = Depends(get_db),
+async def login_for_access_token(
+    db: AnySession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
-    user = crud.user.get_by_email(db, email=form_data.username)
+    user = await crud.aio.user.get_by_email(db, email=form_data.username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,20 +32,24 @@ def login_for_access_token(
                 detail="Account awaiting admin approval",
             )
     
-    if not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = await verify_password_pooled(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
     
-    access_token = create_access_token(data={"sub": str(user.id)})
+    # Поля читаем до коммита: после него атрибуты сессии истекают
+    user_info = {"id": user.id, "email": user.email, "role": user.role}
+
+    # Хэш посчитан со старой стоимостью — прозрачно пересохраняем
+    if new_hash:
+        await crud.aio.user.update_password_hash(db, user, new_hash)
+    
+    access_token = create_access_token(data={"sub": str(user_info["id"])})
     
     return {
         "access_token": access_token, 
         "token_type": "bearer",
-        "user": {
-            "id": user.id,
-            "email": user.email,
-            "role": user.role
-        }
+        "user": user_info
     }
\ No newline at end of file
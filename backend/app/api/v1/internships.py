@@ -1,22 +1,66 @@
 # backend/app/api/v1/internships.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from typing import Optional
 from app import crud, models
 from app.schemas.internship import InternshipCreate, Internship, InternshipPublic
 from app.api.deps import get_db
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.response_cache import CatalogueResponse
+from app.core.serialization import RowSerializer
 from app.core.security import get_current_user
 
 router = APIRouter()
 
+# Сериализатор публичного каталога: dict прямо из строк, без повторной валидации
+_public = RowSerializer(InternshipPublic)
+
 @router.get("/", response_model=list[InternshipPublic])
 @router.get("", response_model=list[InternshipPublic])  # ← поддержка без завершающего слеша
 def read_internships(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (заголовок X-Next-Cursor)"),
+    q: Optional[str] = Query(None, description="Полнотекстовый поиск по названию и описанию"),
+    text_limit: Optional[int] = Query(None, ge=100, description="Обрезать длинные текстовые поля до N символов"),
+    fields: Optional[str] = Query(None, description="Только эти поля через запятую, например id,title,salary_min"),
 ):
-    return crud.internship.get_multi(db, skip=skip, limit=limit, is_published=True)
+    serializer = _public.narrow(fields)
+    catalogue = CatalogueResponse(request, "internships")
+    early = catalogue.lookup(db)
+    if early is not None:
+        return early
+
+    columns = serializer.columns(models.Internship, text_limit=text_limit)
+    after_id = decode_cursor(cursor)
+    if q:
+        if after_id is not None:
+            # Выдача по релевантности не монотонна по id — листаем её через skip
+            raise HTTPException(status_code=400, detail="Cursor is not supported together with q")
+        items = crud.internship.search(db, skip=skip, limit=limit, q=q, is_published=True, columns=columns)
+    else:
+        items = crud.internship.get_multi(
+            db, skip=skip, limit=limit, is_published=True, after_id=after_id, columns=columns
+        )
+        set_next_cursor(response, items, limit)
+    return catalogue.respond(items, serializer=serializer, tags=("internships",), headers=response.headers)
+
+@router.get("/statistics")
+def get_internship_statistics(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Получить статистику по стажировкам (только для администраторов)
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view statistics")
+
+    return crud.internship.get_statistics(db)
 
 @router.get("/my", response_model=list[Internship])
 def read_my_internships(
@@ -1,13 +1,15 @@
 # app/api/v1/moderation.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from app import crud, models
 from app.schemas.vacancy import Vacancy
 from app.schemas.internship import Internship
 from app.schemas.user import UserResponse
 from app.api.deps import get_db
+from app.core.pagination import TOTAL_COUNT_HEADER, decode_cursor, set_next_cursor
 from app.core.security import get_current_user
 
 router = APIRouter()
@@ -15,16 +17,87 @@ router = APIRouter()
 class RejectionRequest(BaseModel):
     rejection_reason: str = Field(..., min_length=10, max_length=500)
 
+# Пакетная модерация: не больше MAX_BULK_IDS id за запрос
+MAX_BULK_IDS = 1000
+
+class BulkIdsRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_IDS)
+
+class BulkRejectionRequest(BulkIdsRequest):
+    rejection_reason: str = Field(..., min_length=10, max_length=500)
+
+class BulkItemResult(BaseModel):
+    id: int
+    status: str  # published / rejected / approved / already_published / already_active / not_found
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+    summary: Dict[str, int]
+
+_CURSOR_DESCRIPTION = "Курсор следующей страницы (заголовок X-Next-Cursor)"
+
+def _queue_page(response: Response, items, limit: int, total: int):
+    """Страница очереди: список в теле, курсор и общий размер очереди — в заголовках"""
+    set_next_cursor(response, items, limit)
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return items
+
+def _bulk_result(outcomes: Dict[int, str]) -> BulkResult:
+    summary: Dict[str, int] = {}
+    for outcome in outcomes.values():
+        summary[outcome] = summary.get(outcome, 0) + 1
+    return BulkResult(
+        results=[BulkItemResult(id=id_, status=outcome) for id_, outcome in outcomes.items()],
+        summary=summary,
+    )
+
 # --- Пользователи ---
 
+@router.get("/queues")
+def get_queue_metrics(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Глубина очередей модерации и возраст самой старой заявки в секундах"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can moderate")
+    return crud.moderation.queue_metrics(db)
+
 @router.get("/users/pending", response_model=list[UserResponse])
 def get_pending_users(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=_CURSOR_DESCRIPTION),
+    role: Optional[str] = Query(None, description="hr или university"),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admin can moderate")
-    return crud.user.get_pending(db)
+    items = crud.user.get_pending(db, limit=limit, after_id=decode_cursor(cursor), role=role)
+    return _queue_page(response, items, limit, crud.user.count_pending(db, role=role))
+
+@router.patch("/users/publish", response_model=BulkResult)
+def bulk_publish_users(
+    body: BulkIdsRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can publish")
+    return _bulk_result(crud.user.bulk_approve(db, ids=body.ids))
+
+@router.patch("/users/reject", response_model=BulkResult)
+def bulk_reject_users(
+    body: BulkRejectionRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can reject")
+    return _bulk_result(
+        crud.user.bulk_reject(db, ids=body.ids, rejection_reason=body.rejection_reason)
+    )
 
 @router.patch("/users/{user_id}/publish", response_model=UserResponse)
 def publish_user(
@@ -57,12 +130,43 @@ def reject_user(
 
 @router.get("/vacancies/pending", response_model=list[Vacancy])
 def get_pending_vacancies(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=_CURSOR_DESCRIPTION),
+    owner_id: Optional[int] = Query(None, description="Владелец"),
+    company_name: Optional[str] = Query(None, description="Компания"),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admin can moderate")
-    return crud.vacancy.get_unpublished(db)
+    items = crud.vacancy.get_unpublished(
+        db, limit=limit, after_id=decode_cursor(cursor), owner_id=owner_id, company_name=company_name
+    )
+    total = crud.vacancy.count_unpublished(db, owner_id=owner_id, company_name=company_name)
+    return _queue_page(response, items, limit, total)
+
+@router.patch("/vacancies/publish", response_model=BulkResult)
+def bulk_publish_vacancies(
+    body: BulkIdsRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can publish")
+    return _bulk_result(crud.vacancy.bulk_publish(db, ids=body.ids))
+
+@router.patch("/vacancies/reject", response_model=BulkResult)
+def bulk_reject_vacancies(
+    body: BulkRejectionRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can reject")
+    return _bulk_result(
+        crud.vacancy.bulk_reject(db, ids=body.ids, rejection_reason=body.rejection_reason)
+    )
 
 @router.patch("/vacancies/{vacancy_id}/publish", response_model=Vacancy)
 def publish_vacancy(
@@ -97,12 +201,43 @@ def reject_vacancy(
 
 @router.get("/internships/pending", response_model=list[Internship])
 def get_pending_internships(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=_CURSOR_DESCRIPTION),
+    owner_id: Optional[int] = Query(None, description="Владелец"),
+    company_name: Optional[str] = Query(None, description="Компания"),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admin can moderate")
-    return crud.internship.get_unpublished(db)
+    items = crud.internship.get_unpublished(
+        db, limit=limit, after_id=decode_cursor(cursor), owner_id=owner_id, company_name=company_name
+    )
+    total = crud.internship.count_unpublished(db, owner_id=owner_id, company_name=company_name)
+    return _queue_page(response, items, limit, total)
+
+@router.patch("/internships/publish", response_model=BulkResult)
+def bulk_publish_internships(
+    body: BulkIdsRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can publish")
+    return _bulk_result(crud.internship.bulk_publish(db, ids=body.ids))
+
+@router.patch("/internships/reject", response_model=BulkResult)
+def bulk_reject_internships(
+    body: BulkRejectionRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can reject")
+    return _bulk_result(
+        crud.internship.bulk_reject(db, ids=body.ids, rejection_reason=body.rejection_reason)
+    )
 
 @router.patch("/internships/{internship_id}/publish", response_model=Internship)
 def publish_internship(
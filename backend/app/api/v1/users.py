@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from app import crud
 from app.schemas.user import UserCreate, UserResponse
 from app.api.deps import get_db
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_pooled
 
 router = APIRouter()
 
@@ -18,7 +18,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     if user.role not in ["hr", "university", "applicant"]:
         raise HTTPException(status_code=400, detail="Invalid role")
     
-    hashed_pw = get_password_hash(user.password)
+    hashed_pw = get_password_hash_pooled(user.password)
     
     # Передаём UserCreate объект, но добавляем hashed_password и is_active в CRUD
     return crud.user.create(db=db, obj_in=user, hashed_password=hashed_pw)
\ No newline at end of file
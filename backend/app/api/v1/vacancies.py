@@ -1,30 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 from app import crud, models
-from app.schemas.vacancy import VacancyCreate, Vacancy, VacancyPublic
+from app.schemas.vacancy import VacancyCreate, Vacancy, VacancyPublic, vacancy_description
 from app.api.deps import get_db
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.response_cache import CatalogueResponse
+from app.core.serialization import RowSerializer
 from app.core.security import get_current_user
 
 router = APIRouter()
 
+# Сериализатор публичного каталога: dict прямо из строк, без повторной валидации
+_public = RowSerializer(
+    VacancyPublic,
+    computed={
+        "description": lambda item: vacancy_description(item["responsibilities"], item["requirements"]),
+    },
+    depends={"description": ("responsibilities", "requirements")},
+)
+
 @router.get("/", response_model=list[VacancyPublic])
 @router.get("", response_model=list[VacancyPublic])
 def read_vacancies(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (заголовок X-Next-Cursor)"),
     salary_min: Optional[float] = Query(None, description="Минимальная зарплата"),
     salary_max: Optional[float] = Query(None, description="Максимальная зарплата"),
     work_schedule: Optional[str] = Query(None, description="График работы"),
     location: Optional[str] = Query(None, description="Местоположение"),
+    q: Optional[str] = Query(None, description="Полнотекстовый поиск по названию и описанию"),
+    text_limit: Optional[int] = Query(None, ge=100, description="Обрезать длинные текстовые поля до N символов"),
+    fields: Optional[str] = Query(None, description="Только эти поля через запятую, например id,title,salary_min"),
 ):
     """
     Получить список опубликованных вакансий с возможностью фильтрации
     """
-    if any([salary_min, salary_max, work_schedule, location]):
+    serializer = _public.narrow(fields)
+    catalogue = CatalogueResponse(request, "vacancies")
+    early = catalogue.lookup(db)
+    if early is not None:
+        return early
+
+    columns = serializer.columns(models.Vacancy, text_limit=text_limit)
+    after_id = decode_cursor(cursor)
+    if q and after_id is not None:
+        # Выдача по релевантности не монотонна по id — листаем её через skip
+        raise HTTPException(status_code=400, detail="Cursor is not supported together with q")
+    if any([salary_min, salary_max, work_schedule, location, q]):
         # Используем поиск с фильтрами
-        return crud.vacancy.search(
+        items = crud.vacancy.search(
             db, 
             skip=skip, 
             limit=limit,
@@ -32,11 +61,19 @@ def read_vacancies(
             salary_max=salary_max,
             work_schedule=work_schedule,
             location=location,
-            is_published=True
+            q=q,
+            is_published=True,
+            after_id=after_id,
+            columns=columns,
         )
     else:
         # Получаем все опубликованные вакансии
-        return crud.vacancy.get_multi(db, skip=skip, limit=limit, is_published=True)
+        items = crud.vacancy.get_multi(
+            db, skip=skip, limit=limit, is_published=True, after_id=after_id, columns=columns
+        )
+    if not q:
+        set_next_cursor(response, items, limit)
+    return catalogue.respond(items, serializer=serializer, tags=("vacancies",), headers=response.headers)
 
 @router.get("/statistics")
 def get_vacancy_statistics(
@@ -67,39 +104,71 @@ def read_my_vacancies(
 
 @router.get("/remote", response_model=list[VacancyPublic])
 def read_remote_vacancies(
+    request: Request,
     db: Session = Depends(get_db),
     limit: int = 100,
+    text_limit: Optional[int] = Query(None, ge=100, description="Обрезать длинные текстовые поля до N символов"),
+    fields: Optional[str] = Query(None, description="Только эти поля через запятую, например id,title,salary_min"),
 ):
     """
     Получить все удаленные вакансии
     """
-    return crud.vacancy.get_remote_jobs(db, limit=limit)
+    serializer = _public.narrow(fields)
+    catalogue = CatalogueResponse(request, "vacancies")
+    early = catalogue.lookup(db)
+    if early is not None:
+        return early
+
+    columns = serializer.columns(models.Vacancy, text_limit=text_limit)
+    items = crud.vacancy.get_remote_jobs(db, limit=limit, columns=columns)
+    return catalogue.respond(items, serializer=serializer, tags=("vacancies",))
 
 @router.get("/high-salary", response_model=list[VacancyPublic])
 def read_high_salary_vacancies(
+    request: Request,
     db: Session = Depends(get_db),
     min_threshold: float = Query(200000, description="Минимальный порог зарплаты"),
     limit: int = 10,
+    text_limit: Optional[int] = Query(None, ge=100, description="Обрезать длинные текстовые поля до N символов"),
+    fields: Optional[str] = Query(None, description="Только эти поля через запятую, например id,title,salary_min"),
 ):
     """
     Получить вакансии с высокой зарплатой
     """
-    return crud.vacancy.get_high_salary(db, min_threshold=min_threshold, limit=limit)
+    serializer = _public.narrow(fields)
+    catalogue = CatalogueResponse(request, "vacancies")
+    early = catalogue.lookup(db)
+    if early is not None:
+        return early
+
+    columns = serializer.columns(models.Vacancy, text_limit=text_limit)
+    items = crud.vacancy.get_high_salary(db, min_threshold=min_threshold, limit=limit, columns=columns)
+    return catalogue.respond(items, serializer=serializer, tags=("vacancies",))
 
 @router.get("/{vacancy_id}", response_model=VacancyPublic)
 def read_vacancy(
     vacancy_id: int,
+    request: Request,
     db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Только эти поля через запятую, например id,title,salary_min"),
 ):
     """
     Получить детальную информацию о вакансии по ID
     """
+    serializer = _public.narrow(fields)
+    # ETag с id вакансии: валидатор другой вакансии не даст 304 для этой
+    # (в том числе удалённой или снятой с публикации)
+    catalogue = CatalogueResponse(request, "vacancies", item=vacancy_id)
+    early = catalogue.lookup(db)
+    if early is not None:
+        return early
+
     vacancy = crud.vacancy.get(db, id=vacancy_id)
     if not vacancy:
         raise HTTPException(status_code=404, detail="Vacancy not found")
     if not vacancy.is_published:
         raise HTTPException(status_code=404, detail="Vacancy not published")
-    return vacancy
+    return catalogue.respond(vacancy, serializer=serializer, tags=(f"vacancy:{vacancy_id}",))
 
 @router.post("/", response_model=Vacancy)
 def create_vacancy(
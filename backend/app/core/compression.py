@@ -0,0 +1,130 @@
+# app/core/compression.py
+"""
+Сжатие ответов gzip/brotli.
+
+- CompressionMiddleware сжимает тело ответа целиком, если клиент его
+  принимает (Accept-Encoding), тело не меньше COMPRESSION_MIN_SIZE байт,
+  а тип содержимого текстовый (JSON, text/*). Ответы, у которых уже есть
+  Content-Encoding, проходят как есть — так кэш ответов каталога отдаёт
+  заранее сжатые варианты (см. app.core.response_cache), не сжимая их
+  повторно. Потоковые ответы (файлы, докачка) и 206/304 не трогаются;
+- brotli — при COMPRESSION_BROTLI (pip install brotli), иначе только gzip.
+"""
+
+import gzip
+from functools import lru_cache
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+if settings.COMPRESSION_BROTLI:
+    import brotli
+
+# В порядке предпочтения при равном q
+ENCODINGS = ("br", "gzip") if settings.COMPRESSION_BROTLI else ("gzip",)
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+_SKIP_STATUSES = {204, 206, 304}
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Лучшая поддерживаемая кодировка из Accept-Encoding (с учётом q) или None"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def encoding_for(headers: Headers, size: int) -> Optional[str]:
+    """Кодировка для тела размера size по заголовкам запроса; None — не сжимать"""
+    if size < settings.COMPRESSION_MIN_SIZE:
+        return None
+    return negotiate(headers.get("accept-encoding", ""))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0: одинаковое тело — одинаковые байты (удобно кэшам и ETag)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _compressible(start: Message, headers: MutableHeaders) -> bool:
+    if start["status"] in _SKIP_STATUSES or "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    return headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов, тело которых приходит одним сообщением (обычные
+    Response/JSONResponse). Ответ, отправляемый кусками, передаётся без
+    изменений.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or len(body) < settings.COMPRESSION_MIN_SIZE
+                or not _compressible(start, headers)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
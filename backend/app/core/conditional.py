@@ -0,0 +1,98 @@
+# app/core/conditional.py
+"""
+Условные GET-запросы (RFC 9110): If-None-Match / If-Modified-Since → 304.
+
+Для публичного каталога валидаторы строятся по версии коллекции
+(app.models.CollectionVersion), поэтому проверка стоит один запрос по
+первичному ключу и выполняется до запроса списка.
+
+304 даёт только ETag: версия коллекции меняется при каждом изменении,
+а Last-Modified с точностью до секунды не отличит две правки в одну
+секунду. If-Modified-Since учитывается лишь для ответов без ETag.
+"""
+
+import calendar
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from fastapi import Request
+from starlette.responses import Response
+from app.core.config import settings
+
+# Заголовки, которые повторяются в ответе 304
+_VALIDATOR_HEADERS = ("etag", "last-modified", "cache-control")
+
+
+def etag_matches(if_none_match: str, etag: str, wildcard: bool = True) -> bool:
+    """
+    Слабое сравнение из RFC 9110: W/"x" и "x" совпадают.
+    «*» совпадает с любым существующим ресурсом; wildcard=False — пока
+    неизвестно, существует ли он (запись ещё не загружена).
+    """
+    if if_none_match.strip() == "*":
+        return wildcard
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return formatdate(calendar.timegm(value.timetuple()), usegmt=True)
+
+
+def collection_headers(name: str, version, item=None) -> Dict[str, str]:
+    """
+    ETag, Last-Modified и Cache-Control ответа каталога по версии коллекции.
+    ETag слабый: тело может отличаться сжатием, но не содержимым.
+    item — id записи для ответа по одной записи: ETag другой записи той же
+    версии коллекции с ним не совпадёт.
+    """
+    headers = {
+        "cache-control": f"public, max-age={settings.CATALOGUE_MAX_AGE}, must-revalidate",
+    }
+    if version is not None:
+        stamp = calendar.timegm(version.updated_at.timetuple())
+        scope = name if item is None else f"{name}-{item}"
+        headers["etag"] = f'W/"{scope}-{version.version}-{stamp}"'
+        headers["last-modified"] = http_date(version.updated_at)
+    return headers
+
+
+def is_not_modified(request: Request, headers: Mapping[str, str], wildcard: bool = True) -> bool:
+    """
+    Не изменился ли ресурс для клиента. If-None-Match важнее
+    If-Modified-Since: второй учитывается, только если первого нет
+    и у ответа нет ETag (см. описание модуля).
+    """
+    etag = headers.get("etag")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag, wildcard)
+    if etag is not None:
+        return False
+
+    last_modified = headers.get("last-modified")
+    if_modified_since = request.headers.get("if-modified-since")
+    if last_modified and if_modified_since:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified(request: Request, headers: Mapping[str, str], wildcard: bool = True) -> Optional[Response]:
+    """Ответ 304 с валидаторами или None, если клиенту нужен полный ответ"""
+    if not is_not_modified(request, headers, wildcard):
+        return None
+    return Response(
+        status_code=304,
+        headers={name: headers[name] for name in _VALIDATOR_HEADERS if name in headers},
+    )
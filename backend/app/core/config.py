@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings  # ← НОВОЕ! Установи: pip install pydantic-settings
 
 class Settings(BaseSettings):
@@ -5,4 +6,71 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     DATABASE_URL: str = "sqlite:///./test.db"
 
+    # Реплика для чтения: GET/HEAD-запросы идут на неё, остальные — на основную БД.
+    # Клиент, который только что писал, READ_YOUR_WRITES_SECONDS читает с основной
+    DATABASE_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Пул соединений (QueuePool): для SQLite-файла и серверных БД.
+    # pre_ping и recycle имеют смысл только для серверных БД
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # PRAGMA для каждого нового соединения SQLite. WAL: читатели не блокируются
+    # пишущей транзакцией; synchronous=NORMAL в WAL безопасен при сбое процесса.
+    # SQLITE_CACHE_SIZE_KB — кэш страниц на соединение, в КиБ
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+
+    # Асинхронный движок БД для async-роутов (нужен aiosqlite / asyncpg).
+    # ASYNC_DATABASE_URL по умолчанию выводится из DATABASE_URL;
+    # при ASYNC_DATABASE = False async-роуты работают с обычной сессией в пуле потоков
+    ASYNC_DATABASE: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Кэш проверенных JWT и пользователей в get_current_user
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    # bcrypt: стоимость хэша и пул процессов для хэширования/проверки паролей.
+    # PASSWORD_HASH_WORKERS = 0 — считать в текущем потоке (скрипты, отладка)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 10.0
+
+    # Загрузка резюме: максимальный размер файла и размер куска при записи на диск
+    MAX_RESUME_SIZE: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+
+    # Кэш ответов публичного каталога: бюджет памяти и страховочный срок жизни
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    # Cache-Control каталога: сколько секунд браузер/CDN может не перепроверять ответ
+    CATALOGUE_MAX_AGE: int = 0
+    # Кодировать JSON-ответы через orjson (необязательная зависимость)
+    FAST_JSON_RESPONSE: bool = False
+
+    # Сжатие ответов: тела меньше COMPRESSION_MIN_SIZE байт отдаются как есть.
+    # brotli — необязательная зависимость, без COMPRESSION_BROTLI только gzip
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI: bool = False
+    COMPRESSION_BROTLI_QUALITY: int = 5
+
+    # Метрики запросов (/metrics): время, число SQL и строк по маршрутам.
+    # Запросы дольше SLOW_REQUEST_SECONDS пишутся в лог со списком SQL
+    METRICS_ENABLED: bool = True
+    # /metrics доступен администраторам и, если задан, по этому токену
+    # (Authorization: Bearer <METRICS_TOKEN>) — для Prometheus
+    METRICS_TOKEN: Optional[str] = None
+    SLOW_REQUEST_SECONDS: float = 1.0
+    SLOW_REQUEST_MAX_QUERIES: int = 50
+
 settings = Settings()
\ No newline at end of file
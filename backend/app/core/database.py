@@ -1,11 +1,238 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.requests import Request
+from app.core import metrics
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}  # только для SQLite
-)
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool, который считает ожидание свободного соединения:
+    сколько раз и сколько секунд запросы ждали соединение и сколько
+    раз не дождались (pool timeout).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return _is_sqlite(url) and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+    """Параметры create_engine из настроек: пул и connect_args"""
+    if _is_memory_sqlite(url):
+        # БД в памяти живёт в одном соединении — пул по умолчанию
+        return {"connect_args": {"check_same_thread": False}}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if _is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}  # только для SQLite
+    else:
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record, read_only: bool = False) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        if read_only:
+            # Реплика только читается: journal_mode пишет в файл БД, synchronous
+            # касается только записи; query_only не даёт записать по ошибке
+            cursor.execute("PRAGMA query_only=ON")
+        else:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        # Отрицательное значение cache_size — размер в КиБ, а не в страницах
+        cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+    finally:
+        cursor.close()
+
+
+def _set_sqlite_replica_pragmas(dbapi_connection, connection_record) -> None:
+    _set_sqlite_pragmas(dbapi_connection, connection_record, read_only=True)
+
+
+def configure_engine(engine: Engine, read_only: bool = False) -> Engine:
+    """
+    Подключить PRAGMA SQLite к каждому новому соединению движка и учёт
+    SQL-запросов в метриках HTTP-запроса (app.core.metrics).
+    read_only — движок реплики: без PRAGMA, которые пишут в файл БД
+    """
+    if engine.dialect.name == "sqlite":
+        pragmas = _set_sqlite_replica_pragmas if read_only else _set_sqlite_pragmas
+        event.listen(engine, "connect", pragmas)
+    if settings.METRICS_ENABLED:
+        event.listen(engine, "before_cursor_execute", metrics.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", metrics.after_cursor_execute)
+    return engine
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Состояние пула соединений: занятые, свободные, overflow, ожидание"""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+    if isinstance(pool, TimedQueuePool):
+        with pool._stats_lock:
+            stats.update({
+                "checkouts": pool.checkouts,
+                "timeouts": pool.timeouts,
+                "wait_seconds_total": round(pool.wait_seconds_total, 6),
+                "wait_seconds_max": round(pool.wait_seconds_max, 6),
+            })
+    return stats
+
+
+def build_engine(url: str, read_only: bool = False) -> Engine:
+    options = engine_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = TimedQueuePool
+    return configure_engine(create_engine(url, **options), read_only=read_only)
+
+
+engine = build_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Реплика для чтения (необязательно). Миграции на неё не применяются —
+# схему и данные она получает репликацией с основной БД
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = build_engine(settings.DATABASE_REPLICA_URL, read_only=True)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+Base = declarative_base()
+
+
+# ---------- Маршрутизация чтения и записи ----------
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Клиенты, недавно выполнявшие запись: их чтения идут на основную БД,
+# пока реплика не догонит (read-your-writes). Ключ — токен или IP клиента
+recent_writers = TTLCache(max_size=100000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def client_key(request: Request) -> str:
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return authorization
+    return f"ip:{request.client.host if request.client else ''}"
+
+
+def use_replica(request: Request) -> bool:
+    """Можно ли обслужить запрос с реплики"""
+    return (
+        ReplicaSessionLocal is not None
+        and request.method in READ_METHODS
+        and recent_writers.get(client_key(request)) is None
+    )
+
+
+def get_db(request: Request):
+    """
+    Сессия БД для запроса. Чтения идут на реплику (если она настроена),
+    запись — на основную БД; после записи клиент какое-то время читает
+    с основной, чтобы видеть свои изменения.
+    """
+    replica = use_replica(request)
+    db = ReplicaSessionLocal() if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        if request.method not in READ_METHODS:
+            recent_writers.set(client_key(request), True)
+
+# Асинхронные драйверы для схем DATABASE_URL
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    """sqlite:///./test.db → sqlite+aiosqlite:///./test.db и т.п."""
+    parsed = make_url(url)
+    if "+" in parsed.drivername:
+        backend = parsed.get_backend_name()
+        if parsed.drivername == _ASYNC_DRIVERS.get(backend):
+            return url
+        parsed = parsed.set(drivername=backend)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        raise ValueError(f"No async driver known for {parsed.drivername}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Асинхронный движок создаётся только по настройке ASYNC_DATABASE:
+# драйверы aiosqlite / asyncpg — необязательные зависимости
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DATABASE:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    _async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    _async_options = engine_options(_async_url)
+    _async_options.pop("connect_args", None)
+    if "pool_size" in _async_options:
+        # Для aiosqlite SQLAlchemy по умолчанию берёт NullPool, который
+        # не принимает pool_size/max_overflow/pool_timeout
+        _async_options["poolclass"] = AsyncAdaptedQueuePool
+    async_engine = create_async_engine(_async_url, **_async_options)
+    configure_engine(async_engine.sync_engine)
+    # expire_on_commit=False: после коммита атрибуты не перечитываются лениво,
+    # что в async-сессии невозможно вне run_sync
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
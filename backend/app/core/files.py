@@ -0,0 +1,142 @@
+# app/core/files.py
+"""
+Отдача файлов с валидаторами кэша и докачкой.
+
+- ETag (сильный, по содержимому) и If-None-Match → 304 без тела;
+- Range: bytes=... → 206 с одним диапазоном, If-Range, 416 на невыполнимый;
+- zero-copy sendfile через ASGI-расширение http.response.zerocopysend,
+  если сервер его поддерживает; иначе файл читается кусками в пуле потоков.
+"""
+
+import os
+import re
+from email.utils import formatdate
+from typing import Optional, Tuple
+from urllib.parse import quote
+import anyio
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+from app.core.conditional import etag_matches
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Разобрать «bytes=start-end». None — заголовок не поддерживается (например,
+    несколько диапазонов), тогда отдаём файл целиком. (-1, -1) — невыполнимый.
+    """
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if start == "" and end == "":
+        return None
+    if start == "":
+        # bytes=-N — последние N байт
+        length = int(end)
+        if length == 0:
+            return (-1, -1)
+        return (max(size - length, 0), size - 1)
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or start > end:
+        return (-1, -1)
+    return (start, min(end, size - 1))
+
+
+class _FileRangeResponse(Response):
+    def __init__(self, path: str, start: int, length: int, status_code: int, headers: dict):
+        super().__init__(status_code=status_code, headers=headers)
+        self.path = path
+        self.start = start
+        self.length = length
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f,
+                    "offset": self.start,
+                    "count": self.length,
+                })
+            return
+
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.start)
+            remaining = self.length
+            while True:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                remaining -= len(chunk)
+                more_body = bool(chunk) and remaining > 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                if not more_body:
+                    break
+
+
+async def send_file(
+    request: Request,
+    path: str,
+    *,
+    media_type: str,
+    etag: Optional[str] = None,
+    filename: Optional[str] = None,
+    cache_control: str = "private, no-cache",
+) -> Response:
+    """Ответ с файлом: 200, 206, 304 или 416 в зависимости от заголовков запроса"""
+    try:
+        stat_result = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    size = stat_result.st_size
+    if etag is None:
+        etag = f'W/"{int(stat_result.st_mtime)}-{size}"'
+
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": cache_control,
+        "accept-ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if filename:
+        headers["content-disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+    headers["content-type"] = media_type
+
+    start, length, status_code = 0, size, 200
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range: диапазон отдаём, только если у клиента та же версия файла
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range == (-1, -1):
+            return Response(
+                status_code=416,
+                headers={**headers, "content-range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            status_code = 206
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+    headers["content-length"] = str(length)
+    return _FileRangeResponse(path, start, length, status_code, headers)
@@ -0,0 +1,33 @@
+# app/core/hashing.py
+"""
+bcrypt-хэширование паролей — то, что выполняется в процессах
+PasswordHashPool (app.core.security).
+
+Процессы пула запускаются через spawn и импортируют модуль функции заново,
+поэтому здесь нет импортов приложения (настроек, БД, роутов): рабочий
+процесс поднимает только passlib. Стоимость bcrypt передаётся аргументом.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    # bcrypt__rounds задаёт стоимость новых хэшей; хэши с меньшей стоимостью
+    # needs_update считает устаревшими и они пересчитываются при входе
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str, rounds: int) -> bool:
+    return _context(rounds).verify(plain_password, hashed_password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """(пароль верен, новый хэш или None, если сохранённый не устарел)"""
+    return _context(rounds).verify_and_update(plain_password, hashed_password)
@@ -0,0 +1,304 @@
+# app/core/metrics.py
+"""
+Метрики запросов и журнал медленных запросов.
+
+- MetricsMiddleware меряет каждый HTTP-запрос: гистограмма времени ответа
+  по шаблону маршрута (/api/v1/vacancies/{vacancy_id}, а не по URL),
+  число ответов по статусам, число SQL-запросов, их суммарное время
+  и число прочитанных строк;
+- SQL считается через события движка (before/after_cursor_execute, см.
+  configure_engine в app.core.database) в RequestTrace текущего запроса,
+  который лежит в contextvar: он виден и в sync-роутах из пула потоков;
+- запрос дольше SLOW_REQUEST_SECONDS пишется в лог app.slow_requests
+  вместе со списком его SQL-запросов и их временем;
+- render() — всё это в текстовом формате Prometheus для /metrics.
+"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger("app.slow_requests")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Запросы, не попавшие ни в один маршрут (404, статика): одна метка на всех
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# ---------- Учёт SQL текущего запроса ----------
+
+@dataclass
+class RequestTrace:
+    statements: int = 0
+    sql_seconds: float = 0.0
+    rows: int = 0
+    # (секунды, SQL) — для журнала медленных запросов, не больше SLOW_REQUEST_MAX_QUERIES
+    queries: List[Tuple[float, str]] = field(default_factory=list)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+class _RowCountingCursor:
+    """DBAPI-курсор, который считает строки, выбранные через fetch*"""
+
+    def __init__(self, cursor, trace: RequestTrace):
+        self._cursor = cursor
+        self._trace = trace
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._trace.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._trace.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._trace.rows += len(rows)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Время начала — в контексте выполнения этого запроса: если запрос упадёт,
+    # контекст просто выбросится и не собьёт замеры следующих запросов
+    if context is not None and _current_trace.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    trace = _current_trace.get()
+    started = getattr(context, "_metrics_started", None)
+    if trace is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    trace.statements += 1
+    trace.sql_seconds += elapsed
+    if len(trace.queries) < settings.SLOW_REQUEST_MAX_QUERIES:
+        trace.queries.append((elapsed, statement))
+    # Результат SELECT читается из context.cursor уже после этого события —
+    # подменяем курсор, чтобы посчитать строки, которые реально прочитаны
+    if context is not None and not executemany and cursor.description is not None:
+        context.cursor = _RowCountingCursor(cursor, trace)
+
+
+# ---------- Гистограммы и счётчики ----------
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """[(le, накопленное число)] включая +Inf"""
+        result, total = [], 0
+        for index, count in enumerate(self.counts):
+            total += count
+            le = _number(self.buckets[index]) if index < len(self.buckets) else "+Inf"
+            result.append((le, total))
+        return result
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.sql_seconds = 0.0
+        self.rows = 0
+        self.responses: Dict[int, int] = {}
+
+
+class MetricsRegistry:
+    """Метрики по (метод, маршрут). Потокобезопасен"""
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, trace: RequestTrace) -> None:
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            metrics.latency.observe(seconds)
+            metrics.statements.observe(trace.statements)
+            metrics.sql_seconds += trace.sql_seconds
+            metrics.rows += trace.rows
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = _histogram(
+                "http_request_duration_seconds", "Время обработки запроса",
+                [(key, m.latency) for key, m in routes],
+            )
+            lines += _histogram(
+                "http_request_sql_statements", "Число SQL-запросов на HTTP-запрос",
+                [(key, m.statements) for key, m in routes],
+            )
+            lines += _header("http_requests_total", "counter", "Ответы по статусам")
+            for (method, route), m in routes:
+                for status, count in sorted(m.responses.items()):
+                    labels = {"method": method, "route": route, "status": str(status)}
+                    lines.append(_sample("http_requests_total", labels, count))
+            lines += _header("http_request_sql_seconds_total", "counter", "Суммарное время SQL")
+            for (method, route), m in routes:
+                labels = {"method": method, "route": route}
+                lines.append(_sample("http_request_sql_seconds_total", labels, m.sql_seconds))
+            lines += _header("http_request_sql_rows_total", "counter", "Строки, прочитанные из БД")
+            for (method, route), m in routes:
+                labels = {"method": method, "route": route}
+                lines.append(_sample("http_request_sql_rows_total", labels, m.rows))
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+request_metrics = MetricsRegistry()
+
+
+# ---------- Текстовый формат Prometheus ----------
+
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _number(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{name}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _sample(name: str, labels: Mapping[str, str], value) -> str:
+    return f"{name}{_labels(labels)} {_number(value)}"
+
+
+def _header(name: str, kind: str, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _histogram(name: str, help_text: str, series: Iterable[Tuple[Tuple[str, str], Histogram]]) -> List[str]:
+    lines = _header(name, "histogram", help_text)
+    for (method, route), histogram in series:
+        labels = {"method": method, "route": route}
+        for le, count in histogram.cumulative():
+            lines.append(_sample(f"{name}_bucket", {**labels, "le": le}, count))
+        lines.append(_sample(f"{name}_sum", labels, histogram.sum))
+        lines.append(_sample(f"{name}_count", labels, histogram.count))
+    return lines
+
+
+def gauges(prefix: str, stats: Mapping[str, object], label: Optional[str] = None) -> List[str]:
+    """
+    Числовые значения словаря статистики (TTLCache.stats(), pool_stats()
+    и т.п.) — как gauge с именами <prefix>_<ключ>; нечисловые пропускаются.
+    С label stats — {значение метки: словарь статистики}, например
+    gauges("db_pool", {"sync": ..., "replica": ...}, label="engine").
+    """
+    series = stats.items() if label is not None else [(None, stats)]
+    samples: Dict[str, List[str]] = {}
+    for label_value, values in series:
+        labels = {label: label_value} if label is not None else {}
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                name = _NAME_INVALID.sub("_", f"{prefix}_{key}")
+                samples.setdefault(name, []).append(_sample(name, labels, value))
+    lines = []
+    for name, name_samples in samples.items():
+        lines.append(f"# TYPE {name} gauge")
+        lines += name_samples
+    return lines
+
+
+def render(extra: Iterable[str] = ()) -> str:
+    """Метрики запросов и дополнительные строки (gauges) одним текстом"""
+    return "\n".join([*request_metrics.lines(), *extra]) + "\n"
+
+
+# ---------- Middleware ----------
+
+def _log_slow_request(method: str, path: str, status: int, seconds: float, trace: RequestTrace) -> None:
+    lines = [
+        f"Slow request {method} {path} → {status} in {seconds:.3f}s: "
+        f"{trace.statements} SQL in {trace.sql_seconds:.3f}s, {trace.rows} rows"
+    ]
+    for elapsed, statement in trace.queries:
+        lines.append(f"  {elapsed * 1000:8.2f} ms  {' '.join(statement.split())[:500]}")
+    if trace.statements > len(trace.queries):
+        lines.append(f"  … ещё {trace.statements - len(trace.queries)} запросов")
+    logger.warning("\n".join(lines))
+
+
+class MetricsMiddleware:
+    """
+    Метрики каждого HTTP-запроса. Время — до отправки последнего байта
+    ответа; маршрут — шаблон пути, который FastAPI кладёт в scope["route"].
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = None):
+        self.app = app
+        self.registry = registry or request_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = _current_trace.set(trace)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - started
+            _current_trace.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.registry.observe(scope["method"], route_path, status, seconds, trace)
+            if seconds >= settings.SLOW_REQUEST_SECONDS:
+                _log_slow_request(scope["method"], scope["path"], status, seconds, trace)
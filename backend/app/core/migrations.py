@@ -0,0 +1,252 @@
+# app/core/migrations.py
+"""
+Версионированные миграции схемы.
+
+Base.metadata.create_all создаёт только отсутствующие таблицы и не трогает
+существующие, поэтому всё, что меняет уже развёрнутую БД (новые колонки,
+индексы), оформляется здесь отдельной миграцией. Применённые версии
+хранятся в таблице schema_migrations.
+
+Миграции идемпотентны: на свежей БД create_all уже создаёт актуальную
+схему, и миграция просто ничего не делает, кроме записи своей версии.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from app.core.database import Base
+
+_migrations_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _migrations_meta,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# ---------- Вспомогательные операции ----------
+
+def create_missing_indexes(conn: Connection, table_name: str) -> None:
+    """
+    Создать все индексы, объявленные на модели, которых ещё нет в БД.
+    Индексы по колонкам, которых в БД пока нет, пропускаются — их создаст
+    миграция, добавляющая колонку.
+    """
+    existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    for index in Base.metadata.tables[table_name].indexes:
+        if all(column.name in existing for column in index.columns):
+            index.create(conn, checkfirst=True)
+
+
+def add_missing_column(conn: Connection, table_name: str, column_name: str) -> None:
+    """ALTER TABLE ... ADD COLUMN для колонки, объявленной на модели"""
+    existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    if column_name in existing:
+        return
+    column = Base.metadata.tables[table_name].c[column_name]
+    column_type = column.type.compile(dialect=conn.dialect)
+    conn.exec_driver_sql(
+        f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}'
+    )
+
+
+# ---------- Миграции ----------
+
+def _hot_filter_indexes(conn: Connection) -> None:
+    for table_name in ("users", "vacancies", "internships", "applications"):
+        create_missing_indexes(conn, table_name)
+
+
+def _resume_blob_storage(conn: Connection) -> None:
+    """
+    Ссылка applications.resume_blob_id на resume_blobs. Уже загруженные файлы
+    регистрируются в хранилище под своими прежними именами.
+    """
+    from app.models import Application, ResumeBlob
+    from app.core import storage
+
+    add_missing_column(conn, "applications", "resume_blob_id")
+    create_missing_indexes(conn, "applications")
+
+    legacy = conn.execute(
+        select(Application.id, Application.resume_file_path).where(
+            Application.resume_file_path != None,
+            Application.resume_blob_id == None,
+        )
+    ).all()
+    for application_id, path in legacy:
+        if not os.path.isfile(path):
+            continue
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+
+        blob_id = conn.execute(
+            select(ResumeBlob.id).where(ResumeBlob.sha256 == sha256)
+        ).scalar()
+        if blob_id is None:
+            filename = os.path.basename(path)
+            blob_id = conn.execute(ResumeBlob.__table__.insert().values(
+                sha256=sha256,
+                filename=filename,
+                size=os.path.getsize(path),
+                content_type=storage.guess_content_type(filename),
+                ref_count=0,
+            )).inserted_primary_key[0]
+        conn.execute(
+            ResumeBlob.__table__.update()
+            .where(ResumeBlob.id == blob_id)
+            .values(ref_count=ResumeBlob.ref_count + 1)
+        )
+        conn.execute(
+            Application.__table__.update()
+            .where(Application.id == application_id)
+            .values(resume_blob_id=blob_id)
+        )
+
+
+def _application_fields(conn: Connection) -> None:
+    """Таблица application_fields (её создаёт create_all) и заполнение из уже сохранённых анкет"""
+    from app.models import Application, ApplicationField
+    from app.core.questionnaire import extract_fields
+
+    create_missing_indexes(conn, "application_fields")
+    done = select(ApplicationField.application_id)
+    rows = conn.execute(
+        select(Application.id, Application.resume_data).where(
+            Application.resume_data != None,
+            Application.id.not_in(done),
+        )
+    ).all()
+    values = []
+    for application_id, resume_data in rows:
+        try:
+            data = json.loads(resume_data)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        values.extend(
+            {"application_id": application_id, "key": key, "value": value}
+            for key, value in extract_fields(data)
+        )
+    if values:
+        conn.execute(ApplicationField.__table__.insert(), values)
+
+
+def _stat_counters(conn: Connection) -> None:
+    """Счётчики статистики (таблицу создаёт create_all): пересчёт с нуля по текущим данным"""
+    from app.crud import stats
+    from app.models import Internship, StatCounter, User, Vacancy
+
+    conn.execute(StatCounter.__table__.delete())
+    for entity, model in (("vacancy", Vacancy), ("internship", Internship), ("user", User)):
+        columns = [getattr(model, name) for name in stats.columns_of(entity)]
+        totals = stats.aggregate(entity, conn.execute(select(*columns)))
+        if totals:
+            conn.execute(StatCounter.__table__.insert(), [
+                {"entity": entity, "name": name, "count": count, "total": total}
+                for name, (count, total) in totals.items()
+            ])
+
+
+def _catalogue_versions(conn: Connection) -> None:
+    """
+    created_at/updated_at у вакансий и стажировок и начальные версии
+    коллекций для ETag каталога. Уже существующим записям проставляется
+    текущее время (SQLite не разрешает ADD COLUMN с DEFAULT CURRENT_TIMESTAMP).
+    """
+    from app.models import CollectionVersion
+
+    now = datetime.utcnow()
+    for table_name in ("vacancies", "internships"):
+        table = Base.metadata.tables[table_name]
+        add_missing_column(conn, table_name, "created_at")
+        add_missing_column(conn, table_name, "updated_at")
+        conn.execute(
+            table.update().where(table.c.created_at == None).values(created_at=now, updated_at=now)
+        )
+        existing = conn.execute(
+            select(CollectionVersion.name).where(CollectionVersion.name == table_name)
+        ).scalar()
+        if existing is None:
+            conn.execute(CollectionVersion.__table__.insert().values(
+                name=table_name, version=1, updated_at=now
+            ))
+
+
+def _moderation_queues(conn: Connection) -> None:
+    """
+    Время подачи заявок пользователей и пересчёт счётчиков: добавились
+    размеры очередей модерации по владельцу, компании и роли.
+    """
+    users = Base.metadata.tables["users"]
+    add_missing_column(conn, "users", "created_at")
+    conn.execute(users.update().where(users.c.created_at == None).values(created_at=datetime.utcnow()))
+    _stat_counters(conn)
+
+
+def _pending_is_null(conn: Connection) -> None:
+    """
+    Пересчёт счётчиков: «ожидает модерации» теперь rejection_reason IS NULL,
+    как в запросах очереди (раньше пустая причина считалась ожидающей).
+    """
+    _stat_counters(conn)
+
+
+def _bounded_counter_names(conn: Connection) -> None:
+    """
+    Пересчёт счётчиков: длинные имена (компания, локация) теперь
+    укладываются в StatCounter.name, нулевые счётчики не хранятся.
+    """
+    _stat_counters(conn)
+
+
+def _drop_moderation_queue_indexes(conn: Connection) -> None:
+    """
+    Частичные индексы очереди модерации планировщик не выбирал: запросы
+    очереди идут по ix_*_published_id, ix_*_owner_id и
+    ix_vacancies_company_published, а эти индексы только замедляли запись.
+    """
+    for table_name in ("vacancies", "internships"):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{table_name}_moderation_queue")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "indexes on hot filter columns", _hot_filter_indexes),
+    (2, "content-addressed resume storage", _resume_blob_storage),
+    (3, "queryable questionnaire fields", _application_fields),
+    (4, "incremental statistics counters", _stat_counters),
+    (5, "catalogue timestamps and collection versions", _catalogue_versions),
+    (6, "moderation queue counters", _moderation_queues),
+    (7, "pending status matches the moderation queue", _pending_is_null),
+    (8, "bounded statistics counter names", _bounded_counter_names),
+    (9, "drop unused moderation queue indexes", _drop_moderation_queue_indexes),
+]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Создать недостающие таблицы и применить все неприменённые миграции"""
+    import app.models  # noqa: F401 — регистрируем модели в Base.metadata
+
+    Base.metadata.create_all(bind=engine)
+    _migrations_meta.create_all(bind=engine)
+
+    applied = []
+    with engine.begin() as conn:
+        done = {row.version for row in conn.execute(schema_migrations.select())}
+        for version, name, upgrade in MIGRATIONS:
+            if version in done:
+                continue
+            upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version, name=name, applied_at=datetime.utcnow()
+            ))
+            applied.append(version)
+    return applied
@@ -0,0 +1,44 @@
+# app/core/pagination.py
+
+import base64
+import binascii
+import json
+from typing import Optional, Sequence
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Наибольший id, который влезает в INTEGER SQLite / BIGINT
+MAX_CURSOR_ID = 2 ** 63 - 1
+
+def encode_cursor(last_id: int) -> str:
+    """Непрозрачный курсор: base64 от JSON с id последней выданной записи"""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Разобрать курсор, пришедший от клиента. None — первая страница"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = data["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Только целое id из диапазона БД: 1e400, "1" или 2**70 от клиента — 400, а не 500
+    if type(last_id) is not int or not 0 < last_id <= MAX_CURSOR_ID:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> Optional[str]:
+    """
+    Если страница заполнена целиком — отдаём курсор на следующую в заголовке.
+    Тело ответа остаётся списком, поэтому старые клиенты ничего не замечают.
+    """
+    if limit <= 0 or len(items) < limit:
+        return None
+    cursor = encode_cursor(items[-1].id)
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
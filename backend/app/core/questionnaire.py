@@ -0,0 +1,60 @@
+# app/core/questionnaire.py
+"""
+Извлечение полей анкеты отклика для хранения в application_fields.
+
+Анкета (resume_data) хранится как JSON-строка; при записи из неё
+достаются поля, по которым HR фильтрует откликнувшихся:
+- skill — каждый навык из «skills» (через запятую, точку с запятой или перевод строки);
+- education — образование;
+- city — город из «city», а если его нет — первая часть «address».
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_VALUE_LENGTH = 255
+
+_SKILL_SEPARATORS = re.compile(r"[,;\n]+")
+_SPACES = re.compile(r"\s+")
+_CITY_PREFIX = re.compile(r"^(г\.|г |город )\s*")
+
+
+def normalize_value(value: Optional[str]) -> str:
+    """Нижний регистр, ё → е, схлопнутые пробелы — так же нормализуется и фильтр"""
+    if not value:
+        return ""
+    value = _SPACES.sub(" ", str(value)).strip().lower().replace("ё", "е")
+    return value[:MAX_VALUE_LENGTH]
+
+
+def normalize_city(value: Optional[str]) -> str:
+    return _CITY_PREFIX.sub("", normalize_value(value))
+
+
+def extract_fields(data: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """Пары (key, value) для application_fields, без повторов"""
+    if not isinstance(data, dict):
+        return []
+
+    fields = []
+    skills = data.get("skills")
+    if isinstance(skills, list):
+        skills = ",".join(str(s) for s in skills)
+    if isinstance(skills, str):
+        for skill in _SKILL_SEPARATORS.split(skills):
+            skill = normalize_value(skill)
+            if skill:
+                fields.append(("skill", skill))
+
+    education = normalize_value(data.get("education"))
+    if education:
+        fields.append(("education", education))
+
+    city = data.get("city")
+    if not city and isinstance(data.get("address"), str):
+        city = data["address"].split(",")[0]
+    city = normalize_city(city)
+    if city:
+        fields.append(("city", city))
+
+    return list(dict.fromkeys(fields))
@@ -0,0 +1,285 @@
+# app/core/response_cache.py
+"""
+Кэш готовых ответов публичного каталога (вакансии, стажировки).
+
+Хранит уже сериализованные в JSON байты: попадание в кэш не трогает ни
+SQLAlchemy, ни Pydantic. Ключ — путь и отсортированные query-параметры.
+Объём ограничен бюджетом в байтах, при переполнении вытесняются давно
+не использованные ответы (LRU).
+
+Записи помечаются тегами ("vacancies", "vacancy:<id>", "internships"),
+CRUD сбрасывает их по тегу после коммита. Счётчик поколений не даёт
+положить в кэш ответ, прочитанный из БД до сброса, но сохраняемый после.
+Вместе с ответом хранятся его ETag/Last-Modified (см. app.core.conditional),
+так что условный запрос к закэшированному ответу получает 304 без БД.
+С репликой для чтения ответ, прочитанный сразу после сброса, может быть
+ещё старым — поэтому settle_seconds после сброса ответы не кэшируются.
+Сжатые варианты тела (gzip, br — см. app.core.compression) хранятся в
+той же записи и учитываются в бюджете: каждый вариант сжимается один раз,
+при первом запросе с такой кодировкой.
+Кэш живёт в памяти процесса: при нескольких воркерах изменения в
+соседних процессах видны не позже RESPONSE_CACHE_TTL_SECONDS.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+from fastapi import Request
+from starlette.responses import Response
+from app.core import compression, conditional
+from app.core.config import settings
+
+# Заголовки, которые не переносятся из исходного ответа в кэш
+_SKIP_HEADERS = {"content-length", "content-type"}
+
+
+@dataclass
+class CachedEntry:
+    body: bytes
+    headers: Tuple[Tuple[str, str], ...]
+    tags: frozenset
+    # size растёт при добавлении сжатых вариантов (под блокировкой кэша)
+    size: int
+    expires_at: float
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttl: float, settle_seconds: float = 0.0):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8
+        self.ttl = ttl
+        self.settle_seconds = settle_seconds
+        self._invalidated_at = float("-inf")
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.compressions = 0
+        self.generation = 0
+        self._data: "OrderedDict[str, CachedEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: Request) -> str:
+        params = sorted(request.query_params.multi_items())
+        return f"{request.url.path.rstrip('/')}?{urlencode(params)}"
+
+    def get(self, key: str, request: Optional[Request] = None) -> Optional[Response]:
+        """Готовый ответ из кэша (или 304 для условного запроса) либо None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        encoding = None
+        if request is not None:
+            not_modified = conditional.not_modified(request, dict(entry.headers))
+            if not_modified is not None:
+                return not_modified
+            encoding = compression.encoding_for(request.headers, len(entry.body))
+            if encoding is not None and encoding not in entry.variants:
+                self._add_variant(key, entry, encoding)
+        return self._response(entry, "HIT", encoding)
+
+    def store(
+        self,
+        key: str,
+        content: Any,
+        *,
+        serializer,
+        tags: Iterable[str],
+        generation: int,
+        headers: Optional[Mapping[str, str]] = None,
+        request: Optional[Request] = None,
+    ) -> Response:
+        """
+        Сериализовать ответ (serializer — см. app.core.serialization),
+        положить его в кэш и вернуть.
+        generation — значение self.generation до чтения из БД: если
+        за это время был сброс, ответ отдаётся, но не кэшируется.
+        request — для выбора кодировки: сжатый вариант кэшируется сразу.
+        """
+        body = serializer.dump_json(content)
+        kept = tuple(
+            (name, value) for name, value in (headers or {}).items()
+            if name.lower() not in _SKIP_HEADERS
+        )
+        variants = {}
+        encoding = compression.encoding_for(request.headers, len(body)) if request is not None else None
+        if encoding is not None:
+            variants[encoding] = compression.compress(body, encoding)
+        size = (
+            len(key) + len(body) + sum(len(n) + len(v) for n, v in kept)
+            + sum(len(v) for v in variants.values())
+        )
+        entry = CachedEntry(
+            body=body,
+            headers=kept,
+            tags=frozenset(tags),
+            size=size,
+            expires_at=time.monotonic() + self.ttl,
+            variants=variants,
+        )
+        if variants:
+            with self._lock:
+                self.compressions += 1
+        if size <= self.max_entry_bytes:
+            with self._lock:
+                settled = time.monotonic() - self._invalidated_at >= self.settle_seconds
+                if generation == self.generation and settled:
+                    self._drop(key)
+                    self._data[key] = entry
+                    self.size += entry.size
+                    self._evict()
+        return self._response(entry, "MISS", encoding)
+
+    def invalidate(self, *tags: str) -> int:
+        """Сбросить все ответы с любым из тегов"""
+        tags = set(tags)
+        with self._lock:
+            self.generation += 1
+            self._invalidated_at = time.monotonic()
+            keys = [key for key, entry in self._data.items() if entry.tags & tags]
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "compressions": self.compressions,
+            }
+
+    def _drop(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _add_variant(self, key: str, entry: CachedEntry, encoding: str) -> None:
+        """Сжать тело записи вне блокировки и сохранить вариант в записи"""
+        body = compression.compress(entry.body, encoding)
+        with self._lock:
+            self.compressions += 1
+            if encoding in entry.variants:
+                return
+            entry.variants[encoding] = body
+            # Запись могли вытеснить или заменить, пока шло сжатие:
+            # тогда вариант нужен только этому ответу, в бюджет он не идёт
+            if self._data.get(key) is entry:
+                entry.size += len(body)
+                self.size += len(body)
+                self._evict()
+
+    @staticmethod
+    def _response(entry: CachedEntry, status: str, encoding: Optional[str] = None) -> Response:
+        if encoding is None:
+            response = Response(content=entry.body, media_type="application/json")
+        else:
+            response = Response(content=entry.variants[encoding], media_type="application/json")
+            response.headers["content-encoding"] = encoding
+            response.headers["vary"] = "Accept-Encoding"
+        for name, value in entry.headers:
+            response.headers[name] = value
+        response.headers["x-cache"] = status
+        return response
+
+
+class CatalogueResponse:
+    """
+    Ответ публичного роута каталога: кэш → 304 по версии коллекции →
+    запрос к БД. Использование в роуте:
+
+        catalogue = CatalogueResponse(request, "vacancies")
+        early = catalogue.lookup(db)
+        if early is not None:
+            return early
+        items = ...
+        return catalogue.respond(items, serializer=..., tags=("vacancies",))
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        collection: str,
+        cache: "ResponseCache" = None,
+        item: Optional[int] = None,
+    ):
+        self.request = request
+        self.collection = collection
+        # id записи, если ответ — одна запись: входит в её ETag
+        self.item = item
+        self.cache = cache or response_cache
+        self.key = self.cache.key(request)
+        self.generation = self.cache.generation
+        self.headers: dict = {}
+
+    def lookup(self, db) -> Optional[Response]:
+        """Ответ без запроса списка: из кэша или 304 по версии коллекции"""
+        cached = self.cache.get(self.key, self.request)
+        if cached is not None:
+            return cached
+        from app.crud import collection_version
+
+        version = collection_version.get(db, self.collection)
+        self.headers = conditional.collection_headers(self.collection, version, item=self.item)
+        # If-None-Match: * для одной записи — только когда она найдена (respond)
+        return conditional.not_modified(self.request, self.headers, wildcard=self.item is None)
+
+    def respond(
+        self,
+        content: Any,
+        *,
+        serializer,
+        tags: Iterable[str],
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        response = self.cache.store(
+            self.key,
+            content,
+            serializer=serializer,
+            tags=tags,
+            generation=self.generation,
+            headers={**(headers or {}), **self.headers},
+            request=self.request,
+        )
+        if self.item is not None:
+            # Запись загружена и существует — теперь и «*» означает 304
+            return conditional.not_modified(self.request, self.headers) or response
+        return response
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    settle_seconds=settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_REPLICA_URL else 0.0,
+)
@@ -0,0 +1,178 @@
+# app/core/search.py
+"""
+Полнотекстовый поиск по вакансиям и стажировкам на SQLite FTS5.
+
+В индекс кладём не исходный текст, а основы слов (см. app.core.stemmer),
+поэтому запрос «разработчиков» находит «разработчик». Индексируются только
+опубликованные записи: CRUD вызывает sync()/remove() в той же транзакции,
+что и изменение самой записи. Ранжирование — BM25, заголовок весит больше.
+
+Если БД не SQLite или FTS5 недоступен, поиск откатывается на ILIKE.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import bindparam, column, false, inspect, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.core.stemmer import stem
+from app.models import Internship, Vacancy
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+@dataclass(frozen=True)
+class _IndexSpec:
+    table: str
+    title: str
+    body: tuple
+
+_SPECS = {
+    Vacancy: _IndexSpec(
+        table="vacancies_fts",
+        title="title",
+        body=("company_name", "responsibilities", "requirements", "conditions",
+              "additional_info", "work_location", "work_schedule"),
+    ),
+    Internship: _IndexSpec(
+        table="internships_fts",
+        title="title",
+        body=("company_name", "responsibilities", "requirements",
+              "work_location", "work_schedule"),
+    ),
+}
+
+# Вес заголовка и тела в bm25()
+_RANK = "bm25(10.0, 1.0)"
+
+_enabled = False
+
+
+def normalize(value: Optional[str]) -> str:
+    """Текст → строка основ через пробел"""
+    if not value:
+        return ""
+    return " ".join(stem(token) for token in _TOKEN.findall(value))
+
+
+def build_match(q: str) -> Optional[str]:
+    """Запрос пользователя → выражение FTS5: все основы, каждая как префикс"""
+    stems = [stem(token) for token in _TOKEN.findall(q)]
+    if not stems:
+        return None
+    return " ".join(f'"{s}"*' for s in stems)
+
+
+def _row_values(spec: _IndexSpec, obj) -> dict:
+    return {
+        "id": obj.id,
+        "title": normalize(getattr(obj, spec.title)),
+        "body": normalize(" ".join(filter(None, (getattr(obj, c) for c in spec.body)))),
+    }
+
+
+def create_search_index(engine: Engine) -> None:
+    """Создать FTS-таблицы (если их ещё нет) и заполнить их опубликованными записями"""
+    global _enabled
+    if engine.dialect.name != "sqlite":
+        return
+
+    try:
+        existing = set(inspect(engine).get_table_names())
+        with engine.begin() as conn:
+            for model, spec in _SPECS.items():
+                if spec.table in existing:
+                    continue
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {spec.table} USING fts5("
+                    f"title, body, tokenize='unicode61 remove_diacritics 2')"
+                ))
+                conn.execute(text(
+                    f"INSERT INTO {spec.table}({spec.table}, rank) VALUES ('rank', :rank)"
+                ), {"rank": _RANK})
+
+                rows = conn.execute(
+                    select(*[getattr(model, c) for c in ("id", spec.title, *spec.body)])
+                    .where(model.is_published == True)
+                )
+                values = [_row_values(spec, row) for row in rows]
+                if values:
+                    conn.execute(text(
+                        f"INSERT INTO {spec.table}(rowid, title, body) VALUES (:id, :title, :body)"
+                    ), values)
+    except OperationalError:
+        # SQLite собран без FTS5 — остаёмся на ILIKE
+        return
+    _enabled = True
+
+
+def remove(db: Session, obj) -> None:
+    """Убрать запись из индекса (снятие с публикации, отклонение, удаление)"""
+    if not _enabled:
+        return
+    spec = _SPECS[type(obj)]
+    db.execute(text(f"DELETE FROM {spec.table} WHERE rowid = :id"), {"id": obj.id})
+
+
+def sync(db: Session, obj) -> None:
+    """Привести индекс в соответствие с записью: опубликована — в индексе, иначе — нет"""
+    if not _enabled:
+        return
+    remove(db, obj)
+    if obj.is_published:
+        spec = _SPECS[type(obj)]
+        db.execute(text(
+            f"INSERT INTO {spec.table}(rowid, title, body) VALUES (:id, :title, :body)"
+        ), _row_values(spec, obj))
+
+
+def remove_many(db: Session, model, ids) -> None:
+    """Убрать из индекса записи с указанными id одним запросом"""
+    if not _enabled or not ids:
+        return
+    spec = _SPECS[model]
+    db.execute(
+        text(f"DELETE FROM {spec.table} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(ids)},
+    )
+
+
+def index_many(db: Session, model, objs) -> None:
+    """(Пере)индексировать записи, которые становятся опубликованными"""
+    if not _enabled or not objs:
+        return
+    spec = _SPECS[model]
+    remove_many(db, model, [obj.id for obj in objs])
+    db.execute(
+        text(f"INSERT INTO {spec.table}(rowid, title, body) VALUES (:id, :title, :body)"),
+        [_row_values(spec, obj) for obj in objs],
+    )
+
+
+def _like_pattern(q: str) -> str:
+    """Подстрока для ILIKE: %, _ и \\ из запроса ищутся буквально (ESCAPE '\\')"""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def apply_match(query, model, q: str):
+    """
+    Добавить к запросу полнотекстовое условие и сортировку по релевантности.
+    Без FTS5 — ILIKE по заголовку и текстовым полям (полный скан, но работает везде).
+    """
+    spec = _SPECS[model]
+    if not _enabled:
+        columns = [getattr(model, c) for c in (spec.title, *spec.body)]
+        pattern = _like_pattern(q)
+        return query.filter(or_(*(c.ilike(pattern, escape="\\") for c in columns)))
+
+    expression = build_match(q)
+    if expression is None:
+        return query.filter(false())
+    fts = table(spec.table, column("rowid"), column("rank"))
+    return (
+        query.join(fts, fts.c.rowid == model.id)
+        .filter(text(f"{spec.table} MATCH :fts_query").bindparams(fts_query=expression))
+        .order_by(fts.c.rank)
+    )
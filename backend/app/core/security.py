@@ -1,20 +1,156 @@
-from passlib.context import CryptContext
 from jose import jwt
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import asyncio
+import hmac
+import multiprocessing
+import threading
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core import hashing
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import SessionLocal
+from app.core.database import get_db
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return hashing.verify_password(plain_password, hashed_password, settings.BCRYPT_ROUNDS)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return hashing.hash_password(password, settings.BCRYPT_ROUNDS)
+
+
+class PasswordHashPool:
+    """
+    Пул процессов для bcrypt. Один вызов — 100–300 мс CPU; в пуле процессов
+    он не занимает GIL и потоки воркера, обслуживающие остальные запросы.
+
+    Одновременно в пул уходит не больше max_concurrency задач, остальные ждут
+    слота. Если слот не освободился за queue_timeout секунд — 503, чтобы
+    волна входов не копила бесконечную очередь.
+    """
+
+    def __init__(self, workers: int, max_concurrency: int, queue_timeout: float):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max(max_concurrency, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "in_flight": 0,
+            "completed": 0,
+            "rejected": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, а не fork: форк многопоточного сервера небезопасен.
+                # Процесс импортирует только app.core.hashing (без приложения)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _wait_started(self) -> float:
+        with self._lock:
+            self._stats["queued"] += 1
+        return time.perf_counter()
+
+    def _enter(self, acquired: bool, queued_at: float) -> float:
+        """Учесть ожидание слота; без слота — 503. Возвращает время старта"""
+        waited = time.perf_counter() - queued_at
+        with self._lock:
+            self._stats["queued"] -= 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+            if not acquired:
+                self._stats["rejected"] += 1
+            else:
+                self._stats["in_flight"] += 1
+        if not acquired:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+            )
+        return time.perf_counter()
+
+    def _leave(self, started: float) -> None:
+        self._slots.release()
+        with self._lock:
+            self._stats["in_flight"] -= 1
+            self._stats["completed"] += 1
+            self._stats["run_seconds_total"] += time.perf_counter() - started
+
+    def run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        queued_at = self._wait_started()
+        started = self._enter(self._slots.acquire(timeout=self.queue_timeout), queued_at)
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._leave(started)
+
+    async def run_async(self, fn, *args):
+        """
+        run для async-роутов: результат ждётся через await, без потока.
+        Поток из пула нужен, только если все слоты заняты и приходится ждать
+        """
+        if self.workers <= 0:
+            return await run_in_threadpool(fn, *args)
+
+        queued_at = self._wait_started()
+        acquired = self._slots.acquire(blocking=False) or await run_in_threadpool(
+            self._slots.acquire, True, self.queue_timeout
+        )
+        started = self._enter(acquired, queued_at)
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._leave(started)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, workers=self.workers)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
+
+def get_password_hash_pooled(password: str) -> str:
+    """get_password_hash, вынесенный в пул процессов"""
+    return password_pool.run(hashing.hash_password, password, settings.BCRYPT_ROUNDS)
+
+async def verify_password_pooled(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Проверка пароля в пуле процессов. Вторым элементом возвращается новый хэш,
+    если сохранённый устарел (например, выросла BCRYPT_ROUNDS), иначе None.
+    """
+    return await password_pool.run_async(
+        hashing.verify_and_update, plain_password, hashed_password, settings.BCRYPT_ROUNDS
+    )
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -22,19 +158,52 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-def get_db():
-    """Функция-генератор для получения DB сессии"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+@dataclass(frozen=True)
+class CurrentUser:
+    """Лёгкий снимок пользователя для кэша: без сессии и ленивой загрузки"""
+    id: int
+    email: str
+    role: str
+    is_active: bool
+    rejection_reason: Optional[str] = None
+
+    @classmethod
+    def from_orm(cls, user) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            rejection_reason=user.rejection_reason,
+        )
+
+# token -> (claims, CurrentUser). Запись живёт не дольше, чем сам токен.
+# Кэш локален для процесса: в других воркерах изменение статуса
+# пользователя станет видно не позже чем через AUTH_CACHE_TTL_SECONDS.
+token_cache = TTLCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+def invalidate_user(user_id: int) -> None:
+    """Сбросить закэшированные токены пользователя (смена статуса модератором)"""
+    invalidate_users([user_id])
+
+def invalidate_users(user_ids) -> None:
+    """То же для нескольких пользователей — один проход по кэшу"""
+    user_ids = set(user_ids)
+    if user_ids:
+        token_cache.delete_where(lambda entry: entry[1].id in user_ids)
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
     """Получение текущего пользователя по JWT токену"""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -56,4 +225,19 @@ def get_current_user(
     if user is None:
         raise credentials_exception
     
-    return user
\ No newline at end of file
+    current_user = CurrentUser.from_orm(user)
+    expires_in = payload.get("exp", 0) - time.time()
+    token_cache.set(token, (payload, current_user), ttl=expires_in)
+    return current_user
+def require_metrics_access(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Доступ к /metrics: сборщик метрик — по METRICS_TOKEN
+    (Authorization: Bearer <токен>), люди — только администраторы
+    """
+    if settings.METRICS_TOKEN and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return
+    if get_current_user(token, db).role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view metrics")
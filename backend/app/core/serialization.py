@@ -0,0 +1,224 @@
+# app/core/serialization.py
+"""
+Быстрая сериализация ответов каталога.
+
+- RowSerializer собирает dict прямо из строк запроса (ORM-объектов или
+  кортежей Row) по заранее вычисленному списку полей схемы — без повторной
+  валидации Pydantic данных, которые только что прочитаны из своей же БД.
+  RowSerializer.columns — проекция: только колонки полей схемы, длинные
+  тексты при необходимости обрезает сама БД (substr);
+- PydanticSerializer — путь через Pydantic (для схем с валидаторами,
+  которые преобразуют данные, например JSON-строку анкеты в dict);
+- dumps — orjson при FAST_JSON_RESPONSE (pip install orjson), иначе
+  кодировщик pydantic-core; FastJSONResponse — ответ через dumps, при
+  FAST_JSON_RESPONSE он же ответ FastAPI по умолчанию.
+
+Результат RowSerializer совпадает с response_model побайтно: тот же
+порядок полей, вычисляемые поля — те же функции, что и в схеме.
+
+Оба сериализатора поддерживают sparse fieldsets: narrow("id,title")
+проверяет поля по списку полей схемы (иначе 400) и возвращает
+сериализатор только с ними. Результат запоминается для каждого набора
+полей, так что на каждый запрос сужение стоит один поиск в dict.
+"""
+
+from abc import ABC, abstractmethod
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple, Type
+from fastapi import HTTPException
+from pydantic import BaseModel, create_model
+from pydantic_core import to_json
+from sqlalchemy import Text, func
+from sqlalchemy.engine import Row
+from starlette.responses import JSONResponse
+from app.core.config import settings
+
+if settings.FAST_JSON_RESPONSE:
+    from orjson import dumps
+else:
+    def dumps(content: Any) -> bytes:
+        return to_json(content)
+
+# Сколько разных наборов fields= запоминать на один сериализатор
+MAX_FIELD_SETS = 64
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse, который кодирует тело через dumps (orjson, если включён)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[FrozenSet[str]]:
+    """Разобрать fields=a,b,c. None — поля не заданы; неизвестное поле — 400"""
+    if not fields:
+        return None
+    requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}",
+        )
+    return requested or None
+
+
+class _Narrowing(ABC):
+    """Кэш сериализаторов по наборам полей"""
+
+    allowed: Tuple[str, ...] = ()
+
+    def narrow(self, fields: Optional[str]):
+        requested = parse_fields(fields, self.allowed)
+        if requested is None:
+            return self
+        narrowed = self._narrowed.get(requested)
+        if narrowed is None:
+            narrowed = self._build_narrowed(requested)
+            if len(self._narrowed) < MAX_FIELD_SETS:
+                self._narrowed[requested] = narrowed
+        return narrowed
+
+    @abstractmethod
+    def _build_narrowed(self, requested: FrozenSet[str]):
+        """Сериализатор только с полями requested"""
+
+
+class PydanticSerializer(_Narrowing):
+    """
+    Валидация и сериализация через Pydantic — как у response_model.
+    fields — поля схемы, которые нужно прочитать из БД (как у RowSerializer):
+    суженный сериализатор валидирует только их, остальные поля схемы
+    в нём необязательны, так что на вход годится строка-проекция.
+    """
+
+    def __init__(self, schema: Type[BaseModel], include: Optional[FrozenSet[str]] = None):
+        self.include = include
+        self.allowed = tuple(schema.model_fields) + tuple(schema.model_computed_fields)
+        self.fields = tuple(name for name in schema.model_fields if include is None or name in include)
+        if include is not None:
+            # Подкласс схемы: валидаторы наследуются, невыбранные поля — None
+            schema = create_model(
+                schema.__name__,
+                __base__=schema,
+                **{name: (Optional[Any], None) for name in schema.model_fields if name not in self.fields},
+            )
+        self.schema = schema
+        self._narrowed: Dict[FrozenSet[str], "PydanticSerializer"] = {}
+
+    def _build_narrowed(self, requested: FrozenSet[str]) -> "PydanticSerializer":
+        return PydanticSerializer(self.schema, include=requested)
+
+    def _dump(self, obj) -> bytes:
+        return self.schema.model_validate(obj, from_attributes=True).model_dump_json(include=self.include)
+
+    def dump_json(self, content: Any) -> bytes:
+        if isinstance(content, (list, tuple)):
+            return b"[" + b",".join(self._dump(obj) for obj in content) + b"]"
+        return self._dump(content)
+
+
+def _getter(make, names: Tuple[str, ...]):
+    """attrgetter/itemgetter, который всегда возвращает кортеж"""
+    if len(names) == 1:
+        get = make(names[0])
+        return lambda obj: (get(obj),)
+    return make(*names)
+
+
+class RowSerializer(_Narrowing):
+    """
+    dict из строки по полям схемы. computed — вычисляемые поля схемы:
+    имя → функция от уже собранного dict; depends — от каких полей она
+    зависит (чтобы при fields= их всё равно выбрать из БД).
+    """
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        computed: Mapping[str, Callable[[Dict[str, Any]], Any]] = None,
+        depends: Mapping[str, Iterable[str]] = None,
+    ):
+        computed = dict(computed or {})
+        self._setup(tuple(schema.model_fields), computed, dict(depends or {}), output=None)
+        self.allowed = self.fields + tuple(computed)
+        self._narrowed: Dict[FrozenSet[str], "RowSerializer"] = {}
+
+    def _setup(self, fields, computed, depends, output) -> None:
+        self.fields = fields
+        self.computed = tuple(computed.items())
+        self.depends = depends
+        # output — какие ключи отдавать, None — все (fields и computed)
+        self.output = output
+        self._get = _getter(attrgetter, fields)
+        self._item = _getter(itemgetter, fields)
+        self._columns: Dict[tuple, tuple] = {}
+
+    def _build_narrowed(self, requested: FrozenSet[str]) -> "RowSerializer":
+        # id выбирается всегда: по нему строится курсор следующей страницы
+        needed = set(requested) | {"id"}
+        for name, _ in self.computed:
+            if name in requested:
+                needed.update(self.depends.get(name, ()))
+        narrowed = object.__new__(RowSerializer)
+        narrowed._setup(
+            tuple(name for name in self.fields if name in needed),
+            {name: compute for name, compute in self.computed if name in requested},
+            self.depends,
+            output=tuple(name for name in self.allowed if name in requested),
+        )
+        narrowed.allowed = self.allowed
+        narrowed._narrowed = self._narrowed
+        return narrowed
+
+    def columns(self, model, *, text_limit: Optional[int] = None) -> tuple:
+        """
+        Колонки model для полей схемы в том же порядке — для query(*columns).
+        Такие строки идут в rows() как есть. text_limit — Text-колонки
+        обрезаются до text_limit символов на стороне БД.
+        """
+        key = (model, text_limit)
+        if key not in self._columns:
+            columns = []
+            for name in self.fields:
+                column = getattr(model, name)
+                if text_limit is not None and isinstance(column.type, Text):
+                    column = func.substr(column, 1, text_limit).label(name)
+                columns.append(column)
+            self._columns[key] = tuple(columns)
+        return self._columns[key]
+
+    def _values(self, obj):
+        if isinstance(obj, Row):
+            # Row из query(колонки...): в порядке полей схемы — как есть
+            return obj if obj._fields == self.fields else self._item(obj._mapping)
+        try:
+            # Загруженные атрибуты ORM-объекта лежат в __dict__ — в разы
+            # быстрее, чем через дескрипторы SQLAlchemy
+            return self._item(obj.__dict__)
+        except KeyError:
+            # Что-то не загружено (expire, deferred) — обычный доступ с подгрузкой
+            return self._get(obj)
+
+    def _complete(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        for name, compute in self.computed:
+            item[name] = compute(item)
+        if self.output is not None:
+            return {name: item[name] for name in self.output}
+        return item
+
+    def row(self, obj) -> Dict[str, Any]:
+        return self._complete(dict(zip(self.fields, self._values(obj))))
+
+    def rows(self, objs) -> list:
+        objs = list(objs)
+        if objs and isinstance(objs[0], Row) and objs[0]._fields == self.fields:
+            # Все строки одного запроса — порядок колонок проверяем один раз
+            return [self._complete(dict(zip(self.fields, row))) for row in objs]
+        return [self.row(obj) for obj in objs]
+
+    def dump_json(self, content: Any) -> bytes:
+        if isinstance(content, (list, tuple)):
+            return dumps(self.rows(content))
+        return dumps(self.row(content))
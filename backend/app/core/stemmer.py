@@ -0,0 +1,85 @@
+# app/core/stemmer.py
+"""
+Стеммер для русского языка (алгоритм Snowball / Портер).
+Нужен полнотекстовому индексу: «разработчика», «разработчики» и
+«разработчик» должны попадать в один и тот же терм.
+"""
+
+import re
+
+_VOWELS = "аеиоуыэюя"
+
+_PERFECTIVE_GERUND = re.compile(
+    r"((?<=[ая])(в|вши|вшись)|(ив|ивши|ившись|ыв|ывши|ывшись))$"
+)
+_REFLEXIVE = re.compile(r"(ся|сь)$")
+_ADJECTIVAL = re.compile(
+    r"(((?<=[ая])(ем|нн|вш|ющ|щ))|(ивш|ывш|ующ))?"
+    r"(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому"
+    r"|их|ых|ую|юю|ая|яя|ою|ею)$"
+)
+_VERB = re.compile(
+    r"((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)"
+    r"|(ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло"
+    r"|ено|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю))$"
+)
+_NOUN = re.compile(
+    r"(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием"
+    r"|ем|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$"
+)
+_DERIVATIONAL = re.compile(r"(ост|ость)$")
+_SUPERLATIVE = re.compile(r"(ейше|ейш)$")
+
+
+def _region_after_vc(word: str, start: int) -> int:
+    """Позиция после первой пары «гласная + согласная», начиная со start"""
+    for i in range(start + 1, len(word)):
+        if word[i] not in _VOWELS and word[i - 1] in _VOWELS:
+            return i + 1
+    return len(word)
+
+
+def stem(word: str) -> str:
+    """Основа русского слова. Слова без кириллицы возвращаются как есть"""
+    word = word.lower().replace("ё", "е")
+    match = re.search(f"[{_VOWELS}]", word)
+    if not match:
+        return word
+
+    prefix, rv = word[:match.end()], word[match.end():]
+
+    # Шаг 1: деепричастия, иначе возвратность + прилагательное/глагол/существительное
+    stripped = _PERFECTIVE_GERUND.sub("", rv, 1)
+    if stripped == rv:
+        rv = _REFLEXIVE.sub("", rv, 1)
+        stripped = _ADJECTIVAL.sub("", rv, 1)
+        if stripped == rv:
+            stripped = _VERB.sub("", rv, 1)
+            if stripped == rv:
+                stripped = _NOUN.sub("", rv, 1)
+    rv = stripped
+
+    # Шаг 2
+    if rv.endswith("и"):
+        rv = rv[:-1]
+
+    # Шаг 3: словообразовательный суффикс, только внутри R2
+    word = prefix + rv
+    r2 = _region_after_vc(word, _region_after_vc(word, 0))
+    derivational = _DERIVATIONAL.search(rv)
+    if derivational and len(prefix) + derivational.start() >= r2:
+        rv = rv[:derivational.start()]
+
+    # Шаг 4: «нн» → «н», превосходная степень, мягкий знак
+    if rv.endswith("нн"):
+        rv = rv[:-1]
+    else:
+        superlative = _SUPERLATIVE.search(rv)
+        if superlative:
+            rv = rv[:superlative.start()]
+            if rv.endswith("нн"):
+                rv = rv[:-1]
+        elif rv.endswith("ь"):
+            rv = rv[:-1]
+
+    return prefix + rv
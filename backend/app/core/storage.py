@@ -0,0 +1,91 @@
+# app/core/storage.py
+"""
+Контентно-адресуемое хранилище резюме.
+
+Файл сначала потоково пишется во временный каталог (с подсчётом SHA-256),
+затем либо переносится в uploads/resumes/<sha256><ext>, либо удаляется,
+если такое содержимое уже хранится. Учёт ссылок — в таблице resume_blobs
+(см. app.crud.resume_blob).
+
+Имя файла зависит только от содержимого, поэтому удаление файла, на который
+не осталось ссылок, может встретиться с новой загрузкой того же резюме:
+promote и discard_blob выполняются под одной блокировкой, а discard_blob
+перед удалением ещё раз проверяет по БД, что записи о файле нет.
+"""
+
+import os
+import threading
+import uuid
+from typing import Callable, Optional
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.uploads import StoredUpload, stream_upload
+
+RESUME_DIR = os.path.join("uploads", "resumes")
+TMP_DIR = os.path.join(RESUME_DIR, ".tmp")
+
+# Типы резюме, которые отдаются как есть; остальное — application/octet-stream.
+# Определяются по расширению: Content-Type от клиента не проверяется
+RESUME_CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# Перенос файлов на постоянное место и удаление ненужных (в пределах процесса)
+_blob_lock = threading.Lock()
+
+
+async def receive_upload(upload_file: UploadFile) -> StoredUpload:
+    """Принять файл во временный каталог, посчитав его хэш и размер"""
+    await run_in_threadpool(os.makedirs, TMP_DIR, exist_ok=True)
+    tmp_path = os.path.join(TMP_DIR, uuid.uuid4().hex)
+    return await stream_upload(upload_file, tmp_path, max_size=settings.MAX_RESUME_SIZE)
+
+
+def blob_filename(sha256: str, original_filename: Optional[str]) -> str:
+    ext = os.path.splitext(original_filename or "")[1].lower() or ".pdf"
+    return f"{sha256}{ext}"
+
+
+def blob_path(filename: str) -> str:
+    return os.path.join(RESUME_DIR, filename)
+
+
+def guess_content_type(filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    return RESUME_CONTENT_TYPES.get(ext, "application/octet-stream")
+
+
+def promote(tmp_path: str, filename: str) -> str:
+    """
+    Перенести принятый файл на постоянное место (атомарно). Вызывается
+    после коммита записи о файле: при откате файл остаётся временным
+    и удаляется через discard
+    """
+    path = blob_path(filename)
+    with _blob_lock:
+        os.replace(tmp_path, path)
+    return path
+
+
+def discard_blob(filename: str, is_referenced: Callable[[], bool]) -> bool:
+    """
+    Удалить файл хранилища, на который не осталось ссылок. Вызывается после
+    коммита удаления записи; is_referenced — проверка по БД, не появилась ли
+    запись о файле снова (параллельная загрузка того же содержимого уже
+    закоммитила её и переносит файл на место). Возвращает True, если файл удалён.
+    """
+    with _blob_lock:
+        if is_referenced():
+            return False
+        discard(blob_path(filename))
+    return True
+
+
+def discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,100 @@
+# app/core/uploads.py
+
+import hashlib
+import os
+from dataclasses import dataclass
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is too large (max {settings.MAX_RESUME_SIZE} bytes)",
+    )
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+
+
+async def stream_upload(upload_file: UploadFile, dest_path: str, max_size: int) -> StoredUpload:
+    """
+    Записать загруженный файл на диск кусками по UPLOAD_CHUNK_SIZE.
+    Файловые операции уходят в пул потоков и не блокируют event loop,
+    SHA-256 считается в том же проходе. Превышение max_size — 413,
+    недописанный файл удаляется.
+    """
+    # Starlette знает размер уже принятого файла — отказываем, не читая его
+    if upload_file.size is not None and upload_file.size > max_size:
+        raise _too_large()
+
+    digest = hashlib.sha256()
+    size = 0
+    out = await run_in_threadpool(open, dest_path, "wb")
+    try:
+        while True:
+            chunk = await upload_file.read(settings.UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise _too_large()
+            digest.update(chunk)
+            await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(os.remove, dest_path)
+        raise
+    await run_in_threadpool(out.close)
+    return StoredUpload(path=dest_path, sha256=digest.hexdigest(), size=size)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Ограничение размера тела запросов с файлами. Срабатывает до того, как
+    multipart-парсер начнёт буферизовать тело: по Content-Length — сразу,
+    для chunked-запросов — как только принято больше max_body_size байт.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefix: str, max_body_size: int):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse(
+                {"detail": _too_large().detail},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise _too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
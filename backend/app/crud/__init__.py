@@ -1 +1,2 @@
-from . import user, vacancy, internship, application
\ No newline at end of file
+from . import collection_version, stats, bulk, user, vacancy, internship, application, resume_blob, moderation
+from . import aio
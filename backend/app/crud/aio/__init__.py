@@ -0,0 +1,67 @@
+# backend/app/crud/aio/__init__.py
+"""
+Асинхронные версии модулей app.crud для async-роутов:
+
+    await crud.aio.vacancy.get(db, id=vacancy_id)
+
+Функции те же, что в app.crud (логика не дублируется), меняется только
+способ вызова:
+- AsyncSession (ASYNC_DATABASE=true) — через AsyncSession.run_sync: код
+  CRUD выполняется над асинхронным драйвером, поток не занимается;
+- обычная Session — в пуле потоков, чтобы не блокировать event loop.
+"""
+
+import contextvars
+from types import ModuleType
+from typing import Any, Callable
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.crud import application as _application
+from app.crud import collection_version as _collection_version
+from app.crud import internship as _internship
+from app.crud import resume_blob as _resume_blob
+from app.crud import stats as _stats
+from app.crud import user as _user
+from app.crud import vacancy as _vacancy
+
+
+async def run_sync(db, func: Callable, *args, **kwargs) -> Any:
+    """
+    Вызвать синхронную функцию CRUD func(db, ...) из async-кода.
+    func выполняется в копии текущего контекста (contextvars): и в greenlet
+    AsyncSession.run_sync, и в потоке из пула видны contextvars запроса —
+    например RequestTrace, в который события движка считают SQL для метрик.
+    """
+    context = contextvars.copy_context()
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: context.run(func, session, *args, **kwargs))
+    return await run_in_threadpool(context.run, func, db, *args, **kwargs)
+
+
+class AsyncCrud:
+    """Обёртка над модулем CRUD: каждая функция становится корутиной"""
+
+    def __init__(self, module: ModuleType):
+        self._module = module
+
+    def __getattr__(self, name: str):
+        func = getattr(self._module, name)
+        if not callable(func):
+            return func
+
+        async def call(db, *args, **kwargs):
+            return await run_sync(db, func, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = func.__doc__
+        setattr(self, name, call)
+        return call
+
+
+user = AsyncCrud(_user)
+vacancy = AsyncCrud(_vacancy)
+internship = AsyncCrud(_internship)
+application = AsyncCrud(_application)
+resume_blob = AsyncCrud(_resume_blob)
+stats = AsyncCrud(_stats)
+collection_version = AsyncCrud(_collection_version)
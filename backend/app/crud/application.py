@@ -1,11 +1,25 @@
 # crud/application.py
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.models import Application
+from datetime import datetime
+from typing import List, Optional, Sequence
+from app.core import questionnaire, storage
+from app.crud import resume_blob as crud_resume_blob
+from app.models import Application, ApplicationField, Internship, ResumeBlob, Vacancy
 from app.schemas.application import ApplicationCreate
 import json
 
-def create(db: Session, *, obj_in: ApplicationCreate, applicant_id: int):
+def get(db: Session, id: int):
+    return db.query(Application).filter(Application.id == id).first()
+
+def create(
+    db: Session,
+    *,
+    obj_in: ApplicationCreate,
+    applicant_id: int,
+    resume_blob: Optional[ResumeBlob] = None
+):
     # Преобразуем resume_data в JSON-строку для БД
     resume_data_json = None
     if obj_in.resume_data is not None:
@@ -19,11 +33,36 @@ def create(db: Session, *, obj_in: ApplicationCreate, applicant_id: int):
         # ИСПРАВЛЕНО: Поле в схеме называется resume_file_path
         resume_file_path=obj_in.resume_file_path
     )
+    if resume_blob is not None:
+        # Файл из хранилища: ссылка на blob и +1 к его счётчику в той же транзакции
+        db_obj.resume_blob_id = resume_blob.id
+        db_obj.resume_file_path = storage.blob_path(resume_blob.filename)
+        crud_resume_blob.acquire(db, resume_blob)
     db.add(db_obj)
+    db.flush()
+    # Поля анкеты для фильтров HR — в той же транзакции, что и отклик
+    for key, value in questionnaire.extract_fields(obj_in.resume_data):
+        db.add(ApplicationField(application_id=db_obj.id, key=key, value=value))
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+def delete(db: Session, *, application: Application) -> Optional[str]:
+    """
+    Удалить отклик и освободить ссылку на файл резюме. Возвращает имя файла,
+    на который больше никто не ссылается: удалить его с диска
+    (storage.discard_blob) вызывающий код должен после коммита.
+    """
+    orphan = None
+    if application.resume_blob_id:
+        orphan = crud_resume_blob.release(db, application.resume_blob_id)
+    db.query(ApplicationField).filter(
+        ApplicationField.application_id == application.id
+    ).delete(synchronize_session=False)
+    db.delete(application)
+    db.commit()
+    return orphan
+
 def get_by_user_and_vacancy(db: Session, *, user_id: int, vacancy_id: int):
     return db.query(Application).filter(
         Application.applicant_id == user_id,
@@ -34,4 +73,107 @@ def get_by_user_and_internship(db: Session, *, user_id: int, internship_id: int)
     return db.query(Application).filter(
         Application.applicant_id == user_id,
         Application.internship_id == internship_id
-    ).first()
\ No newline at end of file
+    ).first()
+
+def get_inbox(
+    db: Session,
+    *,
+    owner_id: int,
+    kind: str = "vacancy",
+    posting_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    skills: Optional[List[str]] = None,
+    education: Optional[str] = None,
+    city: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = 100,
+    fields: Optional[Sequence[str]] = None,
+):
+    """
+    Отклики на вакансии (kind="vacancy") или стажировки (kind="internship")
+    владельца — одним запросом с JOIN по owner_id, новые сверху.
+    Keyset-пагинация: before_id — id последнего отклика предыдущей страницы.
+    skills (все сразу), education, city — фильтры по полям анкеты
+    из application_fields, сравнение с нормализованным значением.
+
+    Возвращает строки-проекции для schemas.ApplicationSummary: колонка
+    resume_data (анкета) не читается, полная анкета — через get_detail.
+    fields — какие поля ApplicationSummary выбрать и в каком порядке
+    (по умолчанию все).
+    """
+    posting = Vacancy if kind == "vacancy" else Internship
+    posting_fk = Application.vacancy_id if kind == "vacancy" else Application.internship_id
+
+    available = {
+        "id": Application.id,
+        "vacancy_id": Application.vacancy_id,
+        "internship_id": Application.internship_id,
+        "applicant_id": Application.applicant_id,
+        "created_at": Application.created_at,
+        "has_file": (Application.resume_file_path != None).label("has_file"),
+        "posting_title": posting.title.label("posting_title"),
+    }
+    query = (
+        db.query(*(available[name] for name in fields or available))
+        .join(posting, posting.id == posting_fk)
+        .filter(posting.owner_id == owner_id)
+    )
+    if posting_id is not None:
+        query = query.filter(posting_fk == posting_id)
+    if created_from is not None:
+        query = query.filter(Application.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(Application.created_at < created_to)
+    if before_id is not None:
+        query = query.filter(Application.id < before_id)
+
+    field_filters = [("skill", questionnaire.normalize_value(skill)) for skill in skills or []]
+    if education:
+        field_filters.append(("education", questionnaire.normalize_value(education)))
+    if city:
+        field_filters.append(("city", questionnaire.normalize_city(city)))
+    for key, value in field_filters:
+        query = query.filter(Application.id.in_(
+            select(ApplicationField.application_id).where(
+                ApplicationField.key == key,
+                ApplicationField.value == value,
+            )
+        ))
+
+    return query.order_by(Application.id.desc()).limit(limit).all()
+
+def get_detail(db: Session, *, application_id: int, fields: Optional[Sequence[str]] = None):
+    """
+    Отклик вместе с владельцем и названием вакансии/стажировки — для
+    проверки доступа и карточки отклика одним запросом.
+    fields — какие поля schemas.Application выбрать (по умолчанию все):
+    без resume_data анкета не читается. applicant_id выбирается всегда —
+    по нему проверяется доступ.
+    Возвращает (строка-проекция, posting_owner_id) или None.
+    """
+    available = {
+        "id": Application.id,
+        "vacancy_id": Application.vacancy_id,
+        "internship_id": Application.internship_id,
+        "applicant_id": Application.applicant_id,
+        "resume_file_path": Application.resume_file_path,
+        "resume_data": Application.resume_data,
+        "created_at": Application.created_at,
+        "posting_title": func.coalesce(Vacancy.title, Internship.title).label("posting_title"),
+    }
+    names = [name for name in fields or available if name != "applicant_id"]
+    row = (
+        db.query(
+            Application.applicant_id,
+            *(available[name] for name in names),
+            func.coalesce(Vacancy.owner_id, Internship.owner_id).label("posting_owner_id"),
+        )
+        .outerjoin(Vacancy, Vacancy.id == Application.vacancy_id)
+        .outerjoin(Internship, Internship.id == Application.internship_id)
+        .filter(Application.id == application_id)
+        .first()
+    )
+    if not row:
+        return None
+    return row, row.posting_owner_id
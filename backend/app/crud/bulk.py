@@ -0,0 +1,104 @@
+# backend/app/crud/bulk.py
+"""
+Пакетная модерация вакансий и стажировок (пользователей — в app.crud.user).
+
+Вместо «загрузить → изменить → commit → refresh» на каждую запись:
+один SELECT по списку id, один UPDATE ... WHERE id IN (...), счётчики
+статистики — одной разницей на каждый затронутый счётчик, поисковый
+индекс — одним DELETE и одним пакетным INSERT. Коммит, версия коллекции
+и сброс кэша — в функциях bulk_* модулей vacancy/internship.
+"""
+
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core import search as search_index
+from app.crud import stats
+
+# Итоги по отдельным id
+PUBLISHED = "published"
+REJECTED = "rejected"
+ALREADY_PUBLISHED = "already_published"
+NOT_FOUND = "not_found"
+
+
+def unique_ids(ids: Iterable[int]) -> List[int]:
+    """id без повторов, в исходном порядке"""
+    return list(dict.fromkeys(ids))
+
+
+def snapshot(obj, entity: str, **changes) -> SimpleNamespace:
+    """Снимок полей, от которых зависят счётчики, с учётом изменений"""
+    values = {name: getattr(obj, name) for name in stats.columns_of(entity)}
+    values.update(changes)
+    return SimpleNamespace(**values)
+
+
+def apply_stats(db: Session, entity: str, before: list, after: list) -> None:
+    """Применить к счётчикам разницу между состояниями до и после"""
+    delta = stats.aggregate(entity, after)
+    for name, (count, total) in stats.aggregate(entity, before).items():
+        new_count, new_total = delta.get(name, (0, 0.0))
+        delta[name] = (new_count - count, new_total - total)
+    for name, (count, total) in delta.items():
+        if count or total:
+            stats.upsert(db, entity, name, count, total)
+    stats.prune(db, entity, [name for name, (count, _) in delta.items() if count < 0])
+
+
+def moderate(
+    db: Session,
+    model,
+    ids: Iterable[int],
+    *,
+    publish: bool,
+    rejection_reason: Optional[str] = None,
+) -> Tuple[Dict[int, str], List[Tuple[int, bool]]]:
+    """
+    Опубликовать (publish=True) или отклонить записи model с указанными id
+    в текущей транзакции, без коммита.
+
+    Возвращает итог по каждому id и список изменённых записей
+    (id, была ли опубликована) — для версии коллекции и сброса кэша.
+    """
+    ids = unique_ids(ids)
+    rows = db.query(model).filter(model.id.in_(ids)).all() if ids else []
+    found = {row.id: row for row in rows}
+
+    outcomes: Dict[int, str] = {}
+    targets = []
+    for id_ in ids:
+        row = found.get(id_)
+        if row is None:
+            outcomes[id_] = NOT_FOUND
+        elif publish and row.is_published:
+            outcomes[id_] = ALREADY_PUBLISHED
+        else:
+            outcomes[id_] = PUBLISHED if publish else REJECTED
+            targets.append(row)
+    if not targets:
+        return outcomes, []
+
+    if publish:
+        values = {"is_published": True}
+    else:
+        values = {"is_published": False, "rejection_reason": rejection_reason}
+
+    entity = stats.entity_of(targets[0])
+    before = [snapshot(row, entity) for row in targets]
+    after = [snapshot(row, entity, **values) for row in targets]
+    changed = [(row.id, bool(row.is_published)) for row in targets]
+
+    db.query(model).filter(model.id.in_([row.id for row in targets])).update(
+        values, synchronize_session=False
+    )
+    apply_stats(db, entity, before, after)
+    if publish:
+        search_index.index_many(db, model, targets)
+    else:
+        search_index.remove_many(db, model, [row.id for row in targets])
+
+    # Загруженные объекты больше не соответствуют БД
+    for row in targets:
+        db.expire(row)
+    return outcomes, changed
@@ -0,0 +1,20 @@
+# backend/app/crud/collection_version.py
+
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models import CollectionVersion
+
+def get(db: Session, name: str):
+    """Текущая версия коллекции (None, если коллекция ещё не менялась)"""
+    return db.query(CollectionVersion).filter(CollectionVersion.name == name).first()
+
+def bump(db: Session, name: str):
+    """Увеличить версию коллекции в текущей транзакции (коммит — за вызывающим)"""
+    now = datetime.utcnow()
+    updated = db.query(CollectionVersion).filter(CollectionVersion.name == name).update(
+        {CollectionVersion.version: CollectionVersion.version + 1, CollectionVersion.updated_at: now},
+        synchronize_session=False,
+    )
+    if not updated:
+        db.add(CollectionVersion(name=name, version=1, updated_at=now))
+        db.flush()
@@ -2,29 +2,98 @@
 
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
+from typing import List, Optional, Sequence
 from app.models import Internship
+from app.core import search as search_index
+from app.core.response_cache import response_cache
+from app.crud import bulk, collection_version, stats
 from app.schemas.internship import InternshipCreate
 
 def get(db: Session, id: int):
     """Получить стажировку по ID"""
     return db.query(Internship).filter(Internship.id == id).first()
 
-def get_multi(db: Session, *, skip: int = 0, limit: int = 100, is_published: bool = True):
-    """Получить список опубликованных стажировок"""
-    return (
-        db.query(Internship)
-        .filter(Internship.is_published == is_published)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+def _touch_public(db: Session, *published: bool):
+    """Новая версия публичной коллекции (в текущей транзакции), если стажировка была или стала опубликованной"""
+    if any(published):
+        collection_version.bump(db, "internships")
+
+def _invalidate_public(*published: bool):
+    """Сбросить кэш публичного каталога, если стажировка была или стала опубликованной"""
+    if any(published):
+        response_cache.invalidate("internships")
 
-def get_unpublished(db: Session):
-    """Получить все неопубликованные стажировки (для модерации), исключая отклонённые"""
-    return db.query(Internship).filter(
+def _paginate(query, *, skip: int, limit: int, after_id: Optional[int]):
+    """
+    Keyset-пагинация по (is_published, id): с курсором — WHERE id > :after_id,
+    без курсора — старый OFFSET для обратной совместимости.
+    """
+    query = query.order_by(Internship.id)
+    if after_id is not None:
+        query = query.filter(Internship.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_multi(
+    db: Session,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    is_published: bool = True,
+    after_id: Optional[int] = None,
+    columns: Sequence = (),
+):
+    """
+    Получить список опубликованных стажировок.
+    columns — проекция (см. RowSerializer.columns): вместо ORM-объектов
+    вернутся лёгкие строки Row только с нужными колонками.
+    """
+    query = db.query(*(columns or (Internship,))).filter(Internship.is_published == is_published)
+    return _paginate(query, skip=skip, limit=limit, after_id=after_id)
+
+def _unpublished_query(db: Session, *columns):
+    return db.query(*(columns or (Internship,))).filter(
         Internship.is_published == False,
         Internship.rejection_reason == None
-    ).all()
+    )
+
+def get_unpublished(
+    db: Session,
+    *,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    company_name: Optional[str] = None,
+):
+    """
+    Очередь модерации: неопубликованные стажировки, исключая отклонённые,
+    в порядке подачи (id растёт вместе с created_at), с курсором по id.
+    """
+    query = _unpublished_query(db)
+    if owner_id is not None:
+        query = query.filter(Internship.owner_id == owner_id)
+    if company_name is not None:
+        query = query.filter(Internship.company_name == company_name)
+    return _paginate(query, skip=0, limit=limit, after_id=after_id)
+
+def count_unpublished(
+    db: Session,
+    *,
+    owner_id: Optional[int] = None,
+    company_name: Optional[str] = None,
+) -> int:
+    """Размер очереди — из счётчиков; COUNT(*) только для сочетания обоих фильтров"""
+    name = stats.pending_counter(owner_id=owner_id, company_name=company_name)
+    if name is not None:
+        return stats.count(db, "internship", name)
+    return _unpublished_query(db, Internship.id).filter(
+        Internship.owner_id == owner_id, Internship.company_name == company_name
+    ).count()
+
+def oldest_unpublished(db: Session):
+    """Время подачи самой старой записи в очереди (None — очередь пуста)"""
+    return _unpublished_query(db, Internship.created_at).order_by(Internship.id).limit(1).scalar()
 
 def get_by_owner(db: Session, owner_id: int, include_rejected: bool = False):
     """Получить все стажировки пользователя (владельца)"""
@@ -47,16 +116,23 @@ def create_with_owner(db: Session, *, obj_in: InternshipCreate, owner_id: int):
         is_published=False
     )
     db.add(db_obj)
+    db.flush()
+    stats.add(db, db_obj)
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 def update(db: Session, *, db_obj: Internship, obj_in: InternshipCreate):
     """Обновить стажировку"""
+    stats.remove(db, db_obj)
     update_data = obj_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
+    stats.add(db, db_obj)
+    search_index.sync(db, db_obj)
+    _touch_public(db, db_obj.is_published)
     db.commit()
+    _invalidate_public(db_obj.is_published)
     db.refresh(db_obj)
     return db_obj
 
@@ -64,8 +140,14 @@ def publish(db: Session, *, internship_id: int):
     """Опубликовать стажировку (модератор)"""
     internship = db.query(Internship).filter(Internship.id == internship_id).first()
     if internship:
+        was_published = internship.is_published
+        stats.remove(db, internship)
         internship.is_published = True
+        stats.add(db, internship)
+        search_index.sync(db, internship)
+        _touch_public(db, was_published, True)
         db.commit()
+        _invalidate_public(was_published, True)
         db.refresh(internship)
     return internship
 
@@ -73,8 +155,14 @@ def unpublish(db: Session, *, internship_id: int):
     """Снять с публикации"""
     internship = db.query(Internship).filter(Internship.id == internship_id).first()
     if internship:
+        was_published = internship.is_published
+        stats.remove(db, internship)
         internship.is_published = False
+        stats.add(db, internship)
+        search_index.sync(db, internship)
+        _touch_public(db, was_published, False)
         db.commit()
+        _invalidate_public(was_published, False)
         db.refresh(internship)
     return internship
 
@@ -82,8 +170,13 @@ def delete(db: Session, *, internship_id: int):
     """Удалить стажировку"""
     internship = db.query(Internship).filter(Internship.id == internship_id).first()
     if internship:
+        was_published = internship.is_published
+        stats.remove(db, internship)
+        search_index.remove(db, internship)
         db.delete(internship)
+        _touch_public(db, was_published)
         db.commit()
+        _invalidate_public(was_published)
     return internship
 
 def search(
@@ -93,53 +186,62 @@ def search(
     limit: int = 100,
     work_location: str = None,
     work_schedule: str = None,
-    is_published: bool = True
+    q: str = None,
+    is_published: bool = True,
+    after_id: Optional[int] = None,
+    columns: Sequence = (),
 ):
     """
-    Поиск стажировок по площадке и специальности
+    Поиск стажировок по площадке, специальности и полнотекстовому запросу q
     """
-    query = db.query(Internship).filter(Internship.is_published == is_published)
+    query = db.query(*(columns or (Internship,))).filter(Internship.is_published == is_published)
+
+    if q:
+        query = search_index.apply_match(query, Internship, q)
 
     if work_location:
         query = query.filter(Internship.work_location.ilike(f"%{work_location}%"))
     if work_schedule:
         query = query.filter(Internship.work_schedule.ilike(f"%{work_schedule}%"))
 
-    return query.offset(skip).limit(limit).all()
+    return _paginate(query, skip=skip, limit=limit, after_id=after_id)
 
 def reject_internship(db: Session, *, internship_id: int, rejection_reason: str):
     internship = db.query(Internship).filter(Internship.id == internship_id).first()
     if internship:
+        was_published = internship.is_published
+        stats.remove(db, internship)
         internship.is_published = False
         internship.rejection_reason = rejection_reason
+        stats.add(db, internship)
+        search_index.remove(db, internship)
+        _touch_public(db, was_published)
         db.commit()
+        _invalidate_public(was_published)
         db.refresh(internship)
     return internship
 
+def bulk_publish(db: Session, *, ids: List[int]):
+    """Опубликовать несколько стажировок одним UPDATE; итог по каждому id"""
+    outcomes, changed = bulk.moderate(db, Internship, ids, publish=True)
+    _finish_bulk(db, changed, now_published=True)
+    return outcomes
+
+def bulk_reject(db: Session, *, ids: List[int], rejection_reason: str):
+    """Отклонить несколько стажировок одним UPDATE; итог по каждому id"""
+    outcomes, changed = bulk.moderate(db, Internship, ids, publish=False, rejection_reason=rejection_reason)
+    _finish_bulk(db, changed, now_published=False)
+    return outcomes
+
+def _finish_bulk(db: Session, changed, *, now_published: bool):
+    """Версия коллекции, коммит и сброс кэша — один раз на пакет"""
+    touched = any(was_published or now_published for _, was_published in changed)
+    _touch_public(db, touched)
+    db.commit()
+    _invalidate_public(touched)
+
 def get_statistics(db: Session):
     """
-    Статистика по стажировкам
+    Статистика по стажировкам (из счётчиков stat_counters)
     """
-    total = db.query(Internship).count()
-    published = db.query(Internship).filter(Internship.is_published == True).count()
-    pending = total - published
-
-    # Статистика по площадкам
-    locations = db.query(
-        Internship.work_location,
-        db.func.count(Internship.id)
-    ).filter(Internship.is_published == True).group_by(Internship.work_location).all()
-
-    # Статистика по специальностям
-    schedules = db.query(
-        Internship.work_schedule,
-        db.func.count(Internship.id)
-    ).filter(Internship.is_published == True).group_by(Internship.work_schedule).all()
-
-    return {
-        'total': total,
-        'published': published,
-        'pending_moderation': pending,
-        'by_work_location': {loc: cnt for loc, cnt in locations},
-        'by_work_schedule': {sch: cnt for sch, cnt in schedules}
-    }
\ No newline at end of file
+    return stats.get_internship_statistics(db)
@@ -0,0 +1,37 @@
+# backend/app/crud/moderation.py
+"""
+Метрики очередей модерации: глубина (из счётчиков статистики) и возраст
+самой старой заявки (одна строка по частичному индексу очереди).
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.crud import internship, user, vacancy
+
+
+def _age_seconds(submitted_at: Optional[datetime], now: datetime) -> float:
+    if submitted_at is None:
+        return 0.0
+    if submitted_at.tzinfo is not None:
+        submitted_at = submitted_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return max((now - submitted_at).total_seconds(), 0.0)
+
+
+def queue_metrics(db: Session):
+    """{"vacancies": {"depth": ..., "oldest_age_seconds": ...}, "internships": ..., "users": ...}"""
+    now = datetime.utcnow()
+    return {
+        "vacancies": {
+            "depth": vacancy.count_unpublished(db),
+            "oldest_age_seconds": _age_seconds(vacancy.oldest_unpublished(db), now),
+        },
+        "internships": {
+            "depth": internship.count_unpublished(db),
+            "oldest_age_seconds": _age_seconds(internship.oldest_unpublished(db), now),
+        },
+        "users": {
+            "depth": user.count_pending(db),
+            "oldest_age_seconds": _age_seconds(user.oldest_pending(db), now),
+        },
+    }
@@ -0,0 +1,89 @@
+# app/crud/resume_blob.py
+
+from typing import Optional, Tuple
+from sqlalchemy import literal, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core import storage
+from app.core.uploads import StoredUpload
+from app.models import Application, Internship, ResumeBlob, Vacancy
+
+def get_by_sha256(db: Session, sha256: str):
+    return db.query(ResumeBlob).filter(ResumeBlob.sha256 == sha256).first()
+
+def get_by_filename(db: Session, filename: str):
+    return db.query(ResumeBlob).filter(ResumeBlob.filename == filename).first()
+
+def get_for_owner(db: Session, *, filename: str, owner_id: int):
+    """
+    Файл резюме и признак «есть отклик с этим файлом на вакансию/стажировку
+    owner_id» — одним запросом: поиск по уникальному индексу filename
+    и EXISTS по индексу applications.resume_blob_id.
+    Возвращает (blob, is_owner) или None, если файла нет.
+    """
+    owned = (
+        select(literal(1))
+        .select_from(Application)
+        .outerjoin(Vacancy, Vacancy.id == Application.vacancy_id)
+        .outerjoin(Internship, Internship.id == Application.internship_id)
+        .where(
+            Application.resume_blob_id == ResumeBlob.id,
+            or_(Vacancy.owner_id == owner_id, Internship.owner_id == owner_id),
+        )
+        .exists()
+    )
+    row = db.execute(
+        select(ResumeBlob, owned.label("is_owner")).where(ResumeBlob.filename == filename)
+    ).first()
+    if row is None:
+        return None
+    return row.ResumeBlob, bool(row.is_owner)
+
+def get_or_create(db: Session, *, stored: StoredUpload, filename: str) -> Tuple[ResumeBlob, bool]:
+    """
+    Найти файл с таким же содержимым или завести запись для принятого файла
+    под именем filename (storage.blob_filename). Возвращает (blob, created).
+    С файлами на диске функция не работает: при created=True вызывающий
+    код переносит файл на место (storage.promote) после коммита, иначе
+    удаляет временную копию — так откат не оставляет файлов без записи.
+    Счётчик ссылок не меняется — его увеличивает acquire() в транзакции отклика.
+    """
+    blob = get_by_sha256(db, stored.sha256)
+    if blob:
+        return blob, False
+
+    blob = ResumeBlob(
+        sha256=stored.sha256,
+        filename=filename,
+        size=stored.size,
+        content_type=storage.guess_content_type(filename),
+        ref_count=0,
+    )
+    db.add(blob)
+    try:
+        db.flush()
+    except IntegrityError:
+        # Тот же файл параллельно загрузил кто-то ещё — используем его запись
+        db.rollback()
+        return get_by_sha256(db, stored.sha256), False
+    return blob, True
+
+def acquire(db: Session, blob: ResumeBlob):
+    """+1 ссылка (атомарно, на стороне БД). Коммитит вызывающий код"""
+    blob.ref_count = ResumeBlob.ref_count + 1
+
+def release(db: Session, blob_id: int) -> Optional[str]:
+    """
+    -1 ссылка. Если ссылок не осталось, запись удаляется, а имя файла
+    возвращается — удалить его с диска нужно после коммита.
+    """
+    blob = db.query(ResumeBlob).filter(ResumeBlob.id == blob_id).first()
+    if not blob:
+        return None
+    blob.ref_count = ResumeBlob.ref_count - 1
+    db.flush()
+    db.refresh(blob)
+    if blob.ref_count > 0:
+        return None
+    db.delete(blob)
+    return blob.filename
@@ -0,0 +1,268 @@
+# backend/app/crud/stats.py
+"""
+Инкрементальная статистика по вакансиям, стажировкам и пользователям.
+
+Каждая запись вносит в счётчики свой «вклад» (contribution): total,
+статус, а опубликованная — ещё график, локацию и зарплату; ожидающая
+модерации — размер очереди по владельцу и компании. При изменении
+записи CRUD вызывает remove() до изменения и add() после — в той же
+транзакции, поэтому счётчики всегда согласованы с таблицей, а чтение
+статистики — один запрос по первичному ключу вместо группировок.
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import Internship, StatCounter, User, Vacancy
+
+# Графики, которые статистика вакансий показывает всегда (даже с нулём)
+VACANCY_SCHEDULES = ['Полный день', 'Гибкий график', 'Удаленная работа', 'Сменный график', 'Вахтовый метод']
+
+
+# Поля, от которых зависит вклад записи в счётчики
+CONTRIBUTION_COLUMNS = (
+    "is_published", "rejection_reason", "work_schedule", "work_location", "salary_min", "salary_max",
+    "owner_id", "company_name",
+)
+
+# То же для пользователей
+USER_CONTRIBUTION_COLUMNS = ("role", "is_active", "rejection_reason")
+
+# Роли, регистрация которых проходит модерацию
+MODERATED_ROLES = ("hr", "university")
+
+# Длина StatCounter.name
+MAX_NAME_LENGTH = 255
+
+
+def entity_of(obj) -> str:
+    if isinstance(obj, User):
+        return "user"
+    return "vacancy" if isinstance(obj, Vacancy) else "internship"
+
+
+def columns_of(entity: str) -> Tuple[str, ...]:
+    return USER_CONTRIBUTION_COLUMNS if entity == "user" else CONTRIBUTION_COLUMNS
+
+
+def counter_name(prefix: str, value) -> str:
+    """
+    Имя счётчика для значения из свободного текста (компания, локация,
+    график). Значение берётся как есть — ровно то, по чему фильтрует
+    запрос очереди. Слишком длинное обрезается, а чтобы разные длинные
+    значения не слились в один счётчик, к обрезанному дописывается хэш.
+    """
+    name = f"{prefix}:{value}"
+    if len(name) <= MAX_NAME_LENGTH:
+        return name
+    digest = hashlib.sha256(str(value).encode()).hexdigest()[:16]
+    return f"{name[:MAX_NAME_LENGTH - len(digest) - 2]}…#{digest}"
+
+
+def status_of(obj) -> str:
+    # Тот же признак, что и у очереди модерации (rejection_reason IS NULL):
+    # пустая причина — всё равно отклонение
+    if obj.is_published:
+        return "published"
+    if obj.rejection_reason is not None:
+        return "rejected"
+    return "pending"
+
+
+def contribution(obj) -> Dict[str, Tuple[int, float]]:
+    """Вклад записи в счётчики: name → (count, total)"""
+    status = status_of(obj)
+    result = {"total": (1, 0.0), f"status:{status}": (1, 0.0)}
+    if status == "pending":
+        # Очередь модерации с фильтрами по владельцу и компании
+        result[f"pending_owner:{obj.owner_id}"] = (1, 0.0)
+        if obj.company_name:
+            result[counter_name("pending_company", obj.company_name)] = (1, 0.0)
+    if obj.is_published:
+        if obj.work_schedule:
+            result[counter_name("schedule", obj.work_schedule)] = (1, 0.0)
+        if obj.work_location:
+            result[counter_name("location", obj.work_location)] = (1, 0.0)
+        if obj.salary_min is not None:
+            result["salary_min"] = (1, float(obj.salary_min))
+        if obj.salary_max is not None:
+            result["salary_max"] = (1, float(obj.salary_max))
+    return result
+
+
+def user_status_of(obj) -> str:
+    if obj.is_active:
+        return "active"
+    if obj.rejection_reason is not None:
+        return "rejected"
+    return "pending" if obj.role in MODERATED_ROLES else "inactive"
+
+
+def user_contribution(obj) -> Dict[str, Tuple[int, float]]:
+    """Вклад пользователя: total, статус и очередь модерации по роли"""
+    status = user_status_of(obj)
+    result = {"total": (1, 0.0), f"status:{status}": (1, 0.0)}
+    if status == "pending":
+        result[counter_name("pending_role", obj.role)] = (1, 0.0)
+    return result
+
+
+def _contribution_of(entity: str):
+    return user_contribution if entity == "user" else contribution
+
+
+def upsert(db: Session, entity: str, name: str, count: int, total: float) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(StatCounter).values(entity=entity, name=name, count=count, total=total)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatCounter.entity, StatCounter.name],
+            set_={
+                "count": StatCounter.count + stmt.excluded.count,
+                "total": StatCounter.total + stmt.excluded.total,
+            },
+        )
+        db.execute(stmt)
+        return
+
+    updated = db.query(StatCounter).filter(
+        StatCounter.entity == entity, StatCounter.name == name
+    ).update(
+        {StatCounter.count: StatCounter.count + count, StatCounter.total: StatCounter.total + total},
+        synchronize_session=False,
+    )
+    if not updated:
+        db.add(StatCounter(entity=entity, name=name, count=count, total=total))
+        db.flush()
+
+
+def prune(db: Session, entity: str, names: Iterable[str]) -> None:
+    """
+    Удалить счётчики, которые дошли до нуля: иначе строки по каждой
+    когда-либо встречавшейся компании или локации копились бы вечно.
+    Отсутствующий счётчик читается как 0.
+    """
+    names = list(names)
+    if names:
+        db.query(StatCounter).filter(
+            StatCounter.entity == entity, StatCounter.name.in_(names), StatCounter.count <= 0
+        ).delete(synchronize_session=False)
+
+
+def _apply(db: Session, obj, sign: int) -> None:
+    entity = entity_of(obj)
+    values = _contribution_of(entity)(obj)
+    for name, (count, total) in values.items():
+        upsert(db, entity, name, sign * count, sign * total)
+    if sign < 0:
+        prune(db, entity, values)
+
+
+def add(db: Session, obj) -> None:
+    """Учесть запись в счётчиках (после создания или изменения)"""
+    _apply(db, obj, 1)
+
+
+def remove(db: Session, obj) -> None:
+    """Убрать вклад записи из счётчиков (до изменения или удаления)"""
+    _apply(db, obj, -1)
+
+
+def aggregate(entity: str, rows: Iterable) -> Dict[str, Tuple[int, float]]:
+    """
+    Суммарный вклад набора записей — для пересчёта счётчиков с нуля.
+    rows — объекты или строки с полями из columns_of(entity).
+    """
+    contribute = _contribution_of(entity)
+    totals = defaultdict(lambda: [0, 0.0])
+    for row in rows:
+        for name, (count, total) in contribute(row).items():
+            totals[name][0] += count
+            totals[name][1] += total
+    return {name: (count, total) for name, (count, total) in totals.items()}
+
+
+def _read(db: Session, entity: str) -> Dict[str, Tuple[int, float]]:
+    rows = db.query(StatCounter.name, StatCounter.count, StatCounter.total).filter(
+        StatCounter.entity == entity
+    ).all()
+    return {name: (count, total) for name, count, total in rows}
+
+
+def count(db: Session, entity: str, name: str) -> int:
+    """Значение одного счётчика — чтение по первичному ключу"""
+    value = db.query(StatCounter.count).filter(
+        StatCounter.entity == entity, StatCounter.name == name
+    ).scalar()
+    return value or 0
+
+
+def pending_counter(
+    *,
+    owner_id: Optional[int] = None,
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Имя счётчика очереди модерации для набора фильтров. None — для такого
+    сочетания фильтров счётчика нет (размер придётся считать запросом).
+    """
+    filters = [
+        counter_name(f"pending_{key}", value)
+        for key, value in (("owner", owner_id), ("company", company_name), ("role", role))
+        if value is not None
+    ]
+    if not filters:
+        return "status:pending"
+    return filters[0] if len(filters) == 1 else None
+
+
+def _group(counters: Dict[str, Tuple[int, float]], prefix: str) -> Dict[str, int]:
+    return {
+        name[len(prefix):]: count
+        for name, (count, _) in counters.items()
+        if name.startswith(prefix) and count > 0
+    }
+
+
+def _average(counters: Dict[str, Tuple[int, float]], name: str) -> float:
+    count, total = counters.get(name, (0, 0.0))
+    return total / count if count else 0
+
+
+def get_vacancy_statistics(db: Session):
+    counters = _read(db, "vacancy")
+    by_schedule = {schedule: 0 for schedule in VACANCY_SCHEDULES}
+    by_schedule.update(_group(counters, "schedule:"))
+    published = counters.get("status:published", (0, 0))[0]
+    return {
+        'total': counters.get("total", (0, 0))[0],
+        'published': published,
+        'pending_moderation': counters.get("status:pending", (0, 0))[0],
+        'rejected': counters.get("status:rejected", (0, 0))[0],
+        'by_work_schedule': by_schedule,
+        'by_work_location': _group(counters, "location:"),
+        'average_salary': {
+            'min': _average(counters, "salary_min"),
+            'max': _average(counters, "salary_max"),
+        }
+    }
+
+
+def get_internship_statistics(db: Session):
+    counters = _read(db, "internship")
+    return {
+        'total': counters.get("total", (0, 0))[0],
+        'published': counters.get("status:published", (0, 0))[0],
+        'pending_moderation': counters.get("status:pending", (0, 0))[0],
+        'rejected': counters.get("status:rejected", (0, 0))[0],
+        'by_work_location': _group(counters, "location:"),
+        'by_work_schedule': _group(counters, "schedule:"),
+        'average_salary': {
+            'min': _average(counters, "salary_min"),
+            'max': _average(counters, "salary_max"),
+        }
+    }
@@ -1,9 +1,17 @@
 # app/crud/user.py
 
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, invalidate_user, invalidate_users
+from app.crud import stats
+from app.crud.bulk import NOT_FOUND, apply_stats, snapshot, unique_ids
+
+# Итоги пакетной модерации пользователей
+APPROVED = "approved"
+REJECTED = "rejected"
+ALREADY_ACTIVE = "already_active"
 
 def get(db: Session, id: int):
     return db.query(User).filter(User.id == id).first()
@@ -20,30 +28,106 @@ def create(db: Session, *, obj_in: UserCreate, hashed_password: str = None):
         is_active=is_active
     )
     db.add(db_obj)
+    stats.add(db, db_obj)
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
-def get_pending(db: Session):
-    return db.query(User).filter(
-        User.role.in_(["hr", "university"]),
+def _pending_query(db: Session, *columns):
+    return db.query(*(columns or (User,))).filter(
+        User.role.in_(stats.MODERATED_ROLES),
         User.is_active == False,
         User.rejection_reason == None
-    ).all()
+    )
+
+def get_pending(
+    db: Session,
+    *,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    role: Optional[str] = None,
+):
+    """Очередь модерации в порядке подачи заявок (id растёт вместе с created_at)"""
+    query = _pending_query(db)
+    if role is not None:
+        query = query.filter(User.role == role)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    return query.order_by(User.id).limit(limit).all()
+
+def count_pending(db: Session, *, role: Optional[str] = None) -> int:
+    """Размер очереди — из счётчиков, без COUNT(*)"""
+    return stats.count(db, "user", stats.pending_counter(role=role))
+
+def oldest_pending(db: Session):
+    """Время подачи самой старой заявки в очереди (None — очередь пуста)"""
+    return _pending_query(db, User.created_at).order_by(User.id).limit(1).scalar()
 
 def approve(db: Session, user_id: int):
     user = db.query(User).filter(User.id == user_id).first()
     if user:
+        stats.remove(db, user)
         user.is_active = True
+        stats.add(db, user)
         db.commit()
+        invalidate_user(user.id)
         db.refresh(user)
     return user
 
 def reject(db: Session, user_id: int, rejection_reason: str):
     user = db.query(User).filter(User.id == user_id).first()
     if user:
+        stats.remove(db, user)
         user.rejection_reason = rejection_reason
         # is_active остаётся False
+        stats.add(db, user)
         db.commit()
+        invalidate_user(user.id)
         db.refresh(user)
-    return user
\ No newline at end of file
+    return user
+
+def _bulk_moderate(db: Session, ids: List[int], values: dict, done: str):
+    """Один SELECT и один UPDATE на пакет; активных пользователей не трогаем"""
+    ids = unique_ids(ids)
+    columns = [getattr(User, name) for name in stats.USER_CONTRIBUTION_COLUMNS]
+    rows = db.query(User.id, *columns).filter(User.id.in_(ids)).all() if ids else []
+    found = {row.id: row for row in rows}
+
+    outcomes = {}
+    targets = []
+    for user_id in ids:
+        row = found.get(user_id)
+        if row is None:
+            outcomes[user_id] = NOT_FOUND
+        elif row.is_active:
+            outcomes[user_id] = ALREADY_ACTIVE
+        else:
+            outcomes[user_id] = done
+            targets.append(row)
+
+    if targets:
+        db.query(User).filter(User.id.in_([row.id for row in targets]), User.is_active == False).update(
+            values, synchronize_session=False
+        )
+        apply_stats(
+            db, "user",
+            [snapshot(row, "user") for row in targets],
+            [snapshot(row, "user", **values) for row in targets],
+        )
+    db.commit()
+    invalidate_users([row.id for row in targets])
+    return outcomes
+
+def bulk_approve(db: Session, *, ids: List[int]):
+    """Одобрить несколько пользователей; итог по каждому id"""
+    return _bulk_moderate(db, ids, {"is_active": True}, APPROVED)
+
+def bulk_reject(db: Session, *, ids: List[int], rejection_reason: str):
+    """Отклонить несколько пользователей; итог по каждому id"""
+    return _bulk_moderate(db, ids, {"rejection_reason": rejection_reason}, REJECTED)
+
+def update_password_hash(db: Session, user: User, hashed_password: str):
+    """Сохранить пересчитанный хэш пароля (rehash при входе)"""
+    user.hashed_password = hashed_password
+    db.commit()
+    return user
@@ -1,25 +1,97 @@
 # backend/app/crud/vacancy.py
 from sqlalchemy.orm import Session
 from app.models import Vacancy
+from app.core import search as search_index
+from app.core.response_cache import response_cache
+from app.crud import bulk, collection_version, stats
 from app.schemas.vacancy import VacancyCreate
-from typing import Optional
+from typing import List, Optional, Sequence
 
 def get(db: Session, id: int):
     """Получить вакансию по ID"""
     return db.query(Vacancy).filter(Vacancy.id == id).first()
 
-def get_multi(db: Session, *, skip: int = 0, limit: int = 100, is_published: bool = True):
-    """Получить список вакансий с фильтрацией по статусу публикации"""
-    return db.query(Vacancy).filter(
-        Vacancy.is_published == is_published
-    ).offset(skip).limit(limit).all()
+def _touch_public(db: Session, *published: bool):
+    """Новая версия публичной коллекции (в текущей транзакции), если вакансия была или стала опубликованной"""
+    if any(published):
+        collection_version.bump(db, "vacancies")
 
-def get_unpublished(db: Session):
-    """Получить все неопубликованные вакансии (для модерации), исключая отклонённые"""
-    return db.query(Vacancy).filter(
+def _invalidate_public(vacancy_id: int, *published: bool):
+    """Сбросить кэш публичного каталога, если вакансия была или стала опубликованной"""
+    if any(published):
+        response_cache.invalidate("vacancies", f"vacancy:{vacancy_id}")
+
+def _paginate(query, *, skip: int, limit: int, after_id: Optional[int]):
+    """
+    Keyset-пагинация по (is_published, id): с курсором — WHERE id > :after_id,
+    без курсора — старый OFFSET для обратной совместимости.
+    """
+    query = query.order_by(Vacancy.id)
+    if after_id is not None:
+        query = query.filter(Vacancy.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_multi(
+    db: Session,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    is_published: bool = True,
+    after_id: Optional[int] = None,
+    columns: Sequence = (),
+):
+    """
+    Получить список вакансий с фильтрацией по статусу публикации.
+    columns — проекция (см. RowSerializer.columns): вместо ORM-объектов
+    вернутся лёгкие строки Row только с нужными колонками.
+    """
+    query = db.query(*(columns or (Vacancy,))).filter(Vacancy.is_published == is_published)
+    return _paginate(query, skip=skip, limit=limit, after_id=after_id)
+
+def _unpublished_query(db: Session, *columns):
+    return db.query(*(columns or (Vacancy,))).filter(
         Vacancy.is_published == False,
         Vacancy.rejection_reason == None
-    ).all()
+    )
+
+def get_unpublished(
+    db: Session,
+    *,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    company_name: Optional[str] = None,
+):
+    """
+    Очередь модерации: неопубликованные вакансии, исключая отклонённые,
+    в порядке подачи (id растёт вместе с created_at), с курсором по id.
+    """
+    query = _unpublished_query(db)
+    if owner_id is not None:
+        query = query.filter(Vacancy.owner_id == owner_id)
+    if company_name is not None:
+        query = query.filter(Vacancy.company_name == company_name)
+    return _paginate(query, skip=0, limit=limit, after_id=after_id)
+
+def count_unpublished(
+    db: Session,
+    *,
+    owner_id: Optional[int] = None,
+    company_name: Optional[str] = None,
+) -> int:
+    """Размер очереди — из счётчиков; COUNT(*) только для сочетания обоих фильтров"""
+    name = stats.pending_counter(owner_id=owner_id, company_name=company_name)
+    if name is not None:
+        return stats.count(db, "vacancy", name)
+    return _unpublished_query(db, Vacancy.id).filter(
+        Vacancy.owner_id == owner_id, Vacancy.company_name == company_name
+    ).count()
+
+def oldest_unpublished(db: Session):
+    """Время подачи самой старой записи в очереди (None — очередь пуста)"""
+    return _unpublished_query(db, Vacancy.created_at).order_by(Vacancy.id).limit(1).scalar()
 
 def get_by_owner(db: Session, owner_id: int, include_rejected: bool = False):
     """Получить все вакансии конкретного пользователя (HR)"""
@@ -63,12 +135,15 @@ def create_with_owner(db: Session, *, obj_in: VacancyCreate, owner_id: int):
         is_published=False  # По умолчанию не опубликовано (требует модерации)
     )
     db.add(db_obj)
+    db.flush()
+    stats.add(db, db_obj)
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 def update(db: Session, *, db_obj: Vacancy, obj_in: VacancyCreate):
     """Обновить существующую вакансию"""
+    stats.remove(db, db_obj)
     # Обновляем все поля из VacancyCreate
     db_obj.title = obj_in.title
     db_obj.company_name = obj_in.company_name
@@ -82,7 +157,11 @@ def update(db: Session, *, db_obj: Vacancy, obj_in: VacancyCreate):
     db_obj.work_schedule = obj_in.work_schedule
     db_obj.additional_info = obj_in.additional_info
     
+    stats.add(db, db_obj)
+    search_index.sync(db, db_obj)
+    _touch_public(db, db_obj.is_published)
     db.commit()
+    _invalidate_public(db_obj.id, db_obj.is_published)
     db.refresh(db_obj)
     return db_obj
 
@@ -90,8 +169,14 @@ def publish(db: Session, *, vacancy_id: int):
     """Опубликовать вакансию (для модератора)"""
     vacancy = db.query(Vacancy).filter(Vacancy.id == vacancy_id).first()
     if vacancy:
+        was_published = vacancy.is_published
+        stats.remove(db, vacancy)
         vacancy.is_published = True
+        stats.add(db, vacancy)
+        search_index.sync(db, vacancy)
+        _touch_public(db, was_published, True)
         db.commit()
+        _invalidate_public(vacancy_id, was_published, True)
         db.refresh(vacancy)
     return vacancy
 
@@ -99,8 +184,14 @@ def unpublish(db: Session, *, vacancy_id: int):
     """Снять вакансию с публикации"""
     vacancy = db.query(Vacancy).filter(Vacancy.id == vacancy_id).first()
     if vacancy:
+        was_published = vacancy.is_published
+        stats.remove(db, vacancy)
         vacancy.is_published = False
+        stats.add(db, vacancy)
+        search_index.sync(db, vacancy)
+        _touch_public(db, was_published, False)
         db.commit()
+        _invalidate_public(vacancy_id, was_published, False)
         db.refresh(vacancy)
     return vacancy
 
@@ -108,8 +199,13 @@ def delete(db: Session, *, vacancy_id: int):
     """Удалить вакансию"""
     vacancy = db.query(Vacancy).filter(Vacancy.id == vacancy_id).first()
     if vacancy:
+        was_published = vacancy.is_published
+        stats.remove(db, vacancy)
+        search_index.remove(db, vacancy)
         db.delete(vacancy)
+        _touch_public(db, was_published)
         db.commit()
+        _invalidate_public(vacancy_id, was_published)
     return vacancy
 
 def search(
@@ -121,12 +217,19 @@ def search(
     salary_max: float = None,
     work_schedule: str = None,
     location: str = None,
-    is_published: bool = True
+    q: str = None,
+    is_published: bool = True,
+    after_id: Optional[int] = None,
+    columns: Sequence = (),
 ):
     """
-    Поиск вакансий с фильтрацией
+    Поиск вакансий с фильтрацией.
+    q — полнотекстовый запрос: результаты сортируются по релевантности (BM25)
     """
-    query = db.query(Vacancy).filter(Vacancy.is_published == is_published)
+    query = db.query(*(columns or (Vacancy,))).filter(Vacancy.is_published == is_published)
+    
+    if q:
+        query = search_index.apply_match(query, Vacancy, q)
     
     if salary_min:
         query = query.filter(Vacancy.salary_max >= salary_min)
@@ -140,51 +243,49 @@ def search(
     if location:
         query = query.filter(Vacancy.work_location.ilike(f"%{location}%"))
     
-    return query.offset(skip).limit(limit).all()
+    return _paginate(query, skip=skip, limit=limit, after_id=after_id)
 
 def reject_vacancy(db: Session, *, vacancy_id: int, rejection_reason: str):
     vacancy = db.query(Vacancy).filter(Vacancy.id == vacancy_id).first()
     if not vacancy:
         return None
+    was_published = vacancy.is_published
+    stats.remove(db, vacancy)
     vacancy.rejection_reason = rejection_reason
     vacancy.is_published = False
     db.add(vacancy)
+    stats.add(db, vacancy)
+    search_index.remove(db, vacancy)
+    _touch_public(db, was_published)
     db.commit()
+    _invalidate_public(vacancy_id, was_published)
     db.refresh(vacancy)
     return vacancy
 
+def bulk_publish(db: Session, *, ids: List[int]):
+    """Опубликовать несколько вакансий одним UPDATE; итог по каждому id"""
+    outcomes, changed = bulk.moderate(db, Vacancy, ids, publish=True)
+    _finish_bulk(db, changed, now_published=True)
+    return outcomes
+
+def bulk_reject(db: Session, *, ids: List[int], rejection_reason: str):
+    """Отклонить несколько вакансий одним UPDATE; итог по каждому id"""
+    outcomes, changed = bulk.moderate(db, Vacancy, ids, publish=False, rejection_reason=rejection_reason)
+    _finish_bulk(db, changed, now_published=False)
+    return outcomes
+
+def _finish_bulk(db: Session, changed, *, now_published: bool):
+    """Версия коллекции, коммит и сброс кэша — один раз на пакет"""
+    touched = [vacancy_id for vacancy_id, was_published in changed if was_published or now_published]
+    if touched:
+        collection_version.bump(db, "vacancies")
+    db.commit()
+    if touched:
+        response_cache.invalidate("vacancies", *(f"vacancy:{vacancy_id}" for vacancy_id in touched))
+
 def get_statistics(db: Session):
-    """Получить статистику по вакансиям"""
-    total = db.query(Vacancy).count()
-    published = db.query(Vacancy).filter(Vacancy.is_published == True).count()
-    pending = db.query(Vacancy).filter(Vacancy.is_published == False).count()
-    
-    # Статистика по графику работы
-    schedule_stats = {}
-    for schedule in ['Полный день', 'Гибкий график', 'Удаленная работа', 'Сменный график', 'Вахтовый метод']:
-        count = db.query(Vacancy).filter(
-            Vacancy.work_schedule == schedule,
-            Vacancy.is_published == True
-        ).count()
-        schedule_stats[schedule] = count
-    
-    # Средняя зарплата
-    from sqlalchemy import func
-    avg_salary = db.query(
-        func.avg(Vacancy.salary_min).label('avg_min'),
-        func.avg(Vacancy.salary_max).label('avg_max')
-    ).filter(Vacancy.is_published == True).first()
-    
-    return {
-        'total': total,
-        'published': published,
-        'pending_moderation': pending,
-        'by_work_schedule': schedule_stats,
-        'average_salary': {
-            'min': float(avg_salary.avg_min) if avg_salary.avg_min else 0,
-            'max': float(avg_salary.avg_max) if avg_salary.avg_max else 0
-        }
-    }
+    """Получить статистику по вакансиям (из счётчиков stat_counters)"""
+    return stats.get_vacancy_statistics(db)
 
 def get_by_company(db: Session, company_name: str, is_published: bool = True):
     """Получить все вакансии конкретной компании"""
@@ -193,16 +294,16 @@ def get_by_company(db: Session, company_name: str, is_published: bool = True):
         Vacancy.is_published == is_published
     ).all()
 
-def get_high_salary(db: Session, min_threshold: float = 200000, limit: int = 10):
+def get_high_salary(db: Session, min_threshold: float = 200000, limit: int = 10, columns: Sequence = ()):
     """Получить вакансии с высокой зарплатой"""
-    return db.query(Vacancy).filter(
+    return db.query(*(columns or (Vacancy,))).filter(
         Vacancy.is_published == True,
         Vacancy.salary_max >= min_threshold
     ).order_by(Vacancy.salary_max.desc()).limit(limit).all()
 
-def get_remote_jobs(db: Session, limit: int = 100):
+def get_remote_jobs(db: Session, limit: int = 100, columns: Sequence = ()):
     """Получить все удаленные вакансии"""
-    return db.query(Vacancy).filter(
+    return db.query(*(columns or (Vacancy,))).filter(
         Vacancy.is_published == True,
         Vacancy.work_schedule.in_(['Удаленная работа', 'Гибкий график'])
     ).limit(limit).all()
\ No newline at end of file
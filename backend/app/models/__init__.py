@@ -1,4 +1,8 @@
 from .user import User
 from .vacancy import Vacancy
 from .internship import Internship
-from .application import Application
\ No newline at end of file
+from .application import Application
+from .resume_blob import ResumeBlob
+from .application_field import ApplicationField
+from .stat_counter import StatCounter
+from .collection_version import CollectionVersion
@@ -1,6 +1,6 @@
 # app/models/application.py
 
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, String, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -15,5 +15,16 @@ class Application(Base):
     # НОВОЕ:
     resume_file_path = Column(String, nullable=True)  # путь к файлу
     resume_data = Column(Text, nullable=True)         # JSON-строка с анкетой
+    resume_blob_id = Column(Integer, ForeignKey("resume_blobs.id"), nullable=True)  # файл в хранилище
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Проверка «уже откликался»: (applicant_id, vacancy_id) / (applicant_id, internship_id)
+        Index("ix_applications_applicant_vacancy", "applicant_id", "vacancy_id"),
+        Index("ix_applications_applicant_internship", "applicant_id", "internship_id"),
+        # Отклики на вакансии/стажировки HR
+        Index("ix_applications_vacancy_id", "vacancy_id"),
+        Index("ix_applications_internship_id", "internship_id"),
+        Index("ix_applications_resume_blob_id", "resume_blob_id"),
+    )
@@ -0,0 +1,22 @@
+# app/models/application_field.py
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.core.database import Base
+
+class ApplicationField(Base):
+    """
+    Поле анкеты отклика в виде ключ/значение (навык, образование, город).
+    Заполняется при создании отклика из resume_data, чтобы фильтровать
+    откликнувшихся в БД по индексу, а не разбирая JSON в Python.
+    Значения нормализованы: см. app.core.questionnaire.
+    """
+    __tablename__ = "application_fields"
+
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(32), primary_key=True)
+    value = Column(String(255), primary_key=True)
+
+    __table_args__ = (
+        # Фильтр «отклики с навыком X»: key = ? AND value = ? → application_id
+        Index("ix_application_fields_key_value", "key", "value", "application_id"),
+    )
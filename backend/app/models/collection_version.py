@@ -0,0 +1,17 @@
+# app/models/collection_version.py
+
+from sqlalchemy import Column, Integer, String, DateTime
+from app.core.database import Base
+
+class CollectionVersion(Base):
+    """
+    Версия публичной коллекции ("vacancies", "internships"): увеличивается
+    в той же транзакции, что и любое изменение опубликованных записей.
+    По ней строятся ETag/Last-Modified каталога — ответить 304 можно,
+    не выполняя запрос списка.
+    """
+    __tablename__ = "collection_versions"
+
+    name = Column(String(32), primary_key=True)
+    version = Column(Integer, default=1, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
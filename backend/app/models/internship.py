@@ -1,8 +1,8 @@
 # models/internship.py
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Float, Index, DateTime
+from sqlalchemy.sql import func
 from app.core.database import Base
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Float
 
 
 class Internship(Base):
@@ -24,4 +24,15 @@ class Internship(Base):
     # Системные поля
     is_published = Column(Boolean, default=False)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    rejection_reason = Column(String, nullable=True)
\ No newline at end of file
+    rejection_reason = Column(String, nullable=True)
+    # default дублирует server_default: в БД, где колонку добавила миграция, у неё нет DEFAULT
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now())
+
+    # Индексы
+    __table_args__ = (
+        # Публичный список, очередь модерации и keyset-пагинация: WHERE is_published = :flag AND id > :cursor
+        Index("ix_internships_published_id", "is_published", "id"),
+        # «Мои стажировки» университета
+        Index("ix_internships_owner_id", "owner_id"),
+    )
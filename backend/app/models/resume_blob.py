@@ -0,0 +1,21 @@
+# app/models/resume_blob.py
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ResumeBlob(Base):
+    """
+    Файл резюме в контентно-адресуемом хранилище: один файл на одно
+    содержимое (SHA-256), сколько бы откликов на него ни ссылалось.
+    """
+    __tablename__ = "resume_blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), unique=True, index=True, nullable=False)
+    filename = Column(String, unique=True, index=True, nullable=False)  # имя файла в uploads/resumes
+    size = Column(Integer, nullable=False)
+    content_type = Column(String, nullable=True)
+    ref_count = Column(Integer, default=0, nullable=False)             # сколько откликов ссылается на файл
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
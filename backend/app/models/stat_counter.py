@@ -0,0 +1,18 @@
+# app/models/stat_counter.py
+
+from sqlalchemy import Column, Integer, String, Float
+from app.core.database import Base
+
+class StatCounter(Base):
+    """
+    Счётчик статистики: (entity, name) → count и сумма total.
+    entity — "vacancy" / "internship", name — например "status:published",
+    "schedule:Полный день", "salary_min". Обновляется в CRUD в той же
+    транзакции, что и сама запись (см. app.crud.stats).
+    """
+    __tablename__ = "stat_counters"
+
+    entity = Column(String(32), primary_key=True)
+    name = Column(String(255), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+    total = Column(Float, default=0.0, nullable=False)
@@ -1,6 +1,7 @@
 # app/models/user.py
 
-from sqlalchemy import Column, Integer, String, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Index, text
+from sqlalchemy.sql import func
 from app.core.database import Base
 
 class User(Base):
@@ -11,4 +12,14 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(Enum("admin", "hr", "university", "applicant", name="userrole"), nullable=False)
     is_active = Column(Boolean, default=True)
-    rejection_reason = Column(String, nullable=True)  # Новое поле для причины отклонения
\ No newline at end of file
+    rejection_reason = Column(String, nullable=True)  # Новое поле для причины отклонения
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())  # Время подачи заявки
+
+    __table_args__ = (
+        # Заявки HR/ВУЗов, ожидающие одобрения администратора
+        Index(
+            "ix_users_pending", "role",
+            sqlite_where=text("is_active = 0 AND rejection_reason IS NULL"),
+            postgresql_where=text("is_active = false AND rejection_reason IS NULL"),
+        ),
+    )
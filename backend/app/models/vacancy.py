@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Float, Index, DateTime
+from sqlalchemy.sql import func
 from app.core.database import Base
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Float
 
 class Vacancy(Base):
     __tablename__ = "vacancies"
@@ -33,3 +33,18 @@ class Vacancy(Base):
     is_published = Column(Boolean, default=False)           # Статус публикации (по умолчанию на модерации)
     owner_id = Column(Integer, ForeignKey("users.id"))      # ID владельца (HR)
     rejection_reason = Column(String, nullable=True)
+    # default дублирует server_default: в БД, где колонку добавила миграция, у неё нет DEFAULT
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now())
+
+    # ===== ИНДЕКСЫ =====
+    __table_args__ = (
+        # Публичные списки, очередь модерации и keyset-пагинация: WHERE is_published = :flag AND id > :cursor
+        Index("ix_vacancies_published_id", "is_published", "id"),
+        # /vacancies/high-salary и фильтры по графику работы
+        Index("ix_vacancies_published_salary_max", "is_published", "salary_max"),
+        Index("ix_vacancies_published_schedule", "is_published", "work_schedule"),
+        Index("ix_vacancies_company_published", "company_name", "is_published"),
+        # «Мои вакансии» HR
+        Index("ix_vacancies_owner_id", "owner_id"),
+    )
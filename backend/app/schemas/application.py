@@ -17,6 +17,7 @@ class Application(ApplicationBase):
     resume_file_path: Optional[str] = None
     resume_data: Optional[Dict[str, Any]] = None  # ← теперь dict
     created_at: datetime
+    posting_title: Optional[str] = None  # название вакансии/стажировки (во «входящих» HR)
 
     @field_validator('resume_data', mode='before')
     @classmethod
@@ -29,4 +30,16 @@ class Application(ApplicationBase):
         return v
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ApplicationSummary(ApplicationBase):
+    """Строка списка откликов: без анкеты, она отдаётся только в карточке отклика"""
+    id: int
+    applicant_id: int
+    created_at: datetime
+    posting_title: Optional[str] = None
+    has_file: bool = False
+
+    class Config:
+        from_attributes = True
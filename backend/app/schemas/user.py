@@ -1,6 +1,7 @@
 # app/schemas/user.py
 
 from pydantic import BaseModel, EmailStr
+from datetime import datetime
 from typing import Optional
 
 class UserCreate(BaseModel):
@@ -18,6 +19,7 @@ class UserResponse(BaseModel):
     role: str
     is_active: bool  # Добавляем для модерации
     rejection_reason: Optional[str] = None  # Добавляем для модерации
+    created_at: Optional[datetime] = None  # Время подачи заявки (очередь модерации)
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -2,6 +2,15 @@
 from pydantic import BaseModel
 from typing import Optional
 
+def vacancy_description(responsibilities: Optional[str], requirements: Optional[str]) -> str:
+    """Краткое описание для публичного списка (VacancyPublic.description)"""
+    parts = []
+    if responsibilities:
+        parts.append(f"Обязанности: {responsibilities[:100]}...")
+    if requirements:
+        parts.append(f"Требования: {requirements[:100]}...")
+    return " ".join(parts) if parts else "Описание отсутствует"
+
 class VacancyBase(BaseModel):
     title: str
     company_name: Optional[str] = None
@@ -38,12 +47,7 @@ class VacancyPublic(VacancyBase):
     if computed_field:
         @computed_field(return_type=str)
         def description(self) -> str:
-            parts = []
-            if self.responsibilities:
-                parts.append(f"Обязанности: {self.responsibilities[:100]}...")
-            if self.requirements:
-                parts.append(f"Требования: {self.requirements[:100]}...")
-            return " ".join(parts) if parts else "Описание отсутствует"
+            return vacancy_description(self.responsibilities, self.requirements)
     else:
         pass
 
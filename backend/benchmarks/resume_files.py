@@ -0,0 +1,171 @@
+"""
+Бенчмарк загрузки и скачивания резюме.
+Запустите: python backend/benchmarks/resume_files.py [--size-kb 2048] [--rounds 50]
+
+Скрипт поднимает приложение на временной SQLite-базе и временном uploads/,
+загружает резюме и сравнивает скачивание:
+- legacy   — прежний обработчик (FileResponse с application/octet-stream,
+             isfile + поиск отклика по resume_file_path + запрос вакансии),
+             смонтирован рядом только на время бенчмарка;
+- full     — текущий download_resume, полный ответ;
+- 304      — повторный запрос с If-None-Match;
+- range    — первые 64 КБ (Range: bytes=0-65535).
+Для каждого варианта — медиана и p95 времени ответа, байты тела и число
+SQL-запросов на запрос. Отдельно — пропускная способность загрузки.
+TestClient работает без сети, так что время — это стоимость обработки
+в приложении, а не передачи по сети.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Временная БД и каталог загрузок вместо рабочих: задаём до импорта настроек
+_tmp_dir = tempfile.mkdtemp(prefix="mosprom-bench-")
+os.chdir(_tmp_dir)
+os.makedirs("uploads", exist_ok=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from fastapi import Depends, HTTPException
+from fastapi.responses import FileResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.api.deps import get_db
+from app.core.database import SessionLocal, engine
+from app.core.security import get_current_user, get_password_hash
+from app.schemas.vacancy import VacancyCreate
+from main import app
+
+
+@app.get("/bench/legacy/resume/{filename}", include_in_schema=False)
+async def legacy_download_resume(
+    filename: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Обработчик download_resume до перехода на send_file — для сравнения"""
+    if current_user.role != "hr":
+        raise HTTPException(status_code=403, detail="Only HR can download resumes")
+
+    file_path = os.path.join("uploads", "resumes", filename)
+    if not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="Resume file not found")
+
+    application = db.query(models.Application).filter(
+        models.Application.resume_file_path == os.path.join("uploads", "resumes", filename)
+    ).first()
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    if application.vacancy_id:
+        vacancy = db.query(models.Vacancy).filter(models.Vacancy.id == application.vacancy_id).first()
+        if not vacancy or vacancy.owner_id != current_user.id:
+            raise HTTPException(status_code=403, detail="You don't own this application")
+
+    return FileResponse(file_path, media_type="application/octet-stream", filename=filename)
+
+
+_statements = [0]
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statement(*args):
+    _statements[0] += 1
+
+
+def _user(db: Session, email: str, role: str) -> int:
+    user = models.User(email=email, hashed_password=get_password_hash("bench123"), role=role, is_active=True)
+    db.add(user)
+    db.flush()
+    crud.stats.add(db, user)
+    db.commit()
+    return user.id
+
+
+def _token(client: TestClient, email: str) -> dict:
+    response = client.post("/api/v1/auth/token", data={"username": email, "password": "bench123"})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _measure(rounds: int, call):
+    """(медиана мс, p95 мс, байт тела, SQL на запрос, статус)"""
+    call()  # прогрев: кэш токенов, открытые соединения
+    timings, size, status = [], 0, None
+    _statements[0] = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        response = call()
+        timings.append((time.perf_counter() - started) * 1000)
+        size, status = len(response.content), response.status_code
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95, size, _statements[0] / rounds, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=2048, help="размер резюме, КБ")
+    parser.add_argument("--rounds", type=int, default=50, help="запросов на вариант")
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        db = SessionLocal()
+        hr_id = _user(db, "bench-hr@example.com", "hr")
+        vacancy_id = crud.vacancy.create_with_owner(db, obj_in=VacancyCreate(title="Бенчмарк"), owner_id=hr_id).id
+        crud.vacancy.publish(db, vacancy_id=vacancy_id)
+        applicants = [f"bench-applicant{i}@example.com" for i in range(args.rounds)]
+        for email in applicants:
+            _user(db, email, "applicant")
+        db.close()
+
+        hr_headers = _token(client, "bench-hr@example.com")
+        applicant_headers = [_token(client, email) for email in applicants]
+
+        # Загрузка: каждый соискатель — свой файл (без дедупликации)
+        size = args.size_kb * 1024
+        payloads = [b"%PDF-1.4\n" + os.urandom(size - 9) for _ in applicants]
+        started = time.perf_counter()
+        for headers, payload in zip(applicant_headers, payloads):
+            response = client.post(
+                f"/api/v1/applications/vacancy/{vacancy_id}",
+                files={"resume_file": ("cv.pdf", payload, "application/pdf")},
+                headers=headers,
+            )
+            response.raise_for_status()
+        upload_seconds = time.perf_counter() - started
+        filename = os.path.basename(response.json()["resume_file_path"])
+
+        url = f"/api/v1/applications/resume/{filename}"
+        etag = client.get(url, headers=hr_headers).headers["etag"]
+        variants = [
+            ("legacy", lambda: client.get(f"/bench/legacy/resume/{filename}", headers=hr_headers)),
+            ("full", lambda: client.get(url, headers=hr_headers)),
+            ("304", lambda: client.get(url, headers={**hr_headers, "If-None-Match": etag})),
+            ("range", lambda: client.get(url, headers={**hr_headers, "Range": "bytes=0-65535"})),
+        ]
+
+        print(f"Резюме {args.size_kb} КБ, {args.rounds} запросов на вариант")
+        print(
+            f"Загрузка: {args.rounds / upload_seconds:.1f} файлов/с, "
+            f"{args.rounds * size / upload_seconds / 2 ** 20:.1f} МБ/с"
+        )
+        print(f"{'вариант':<8} {'статус':>6} {'медиана, мс':>12} {'p95, мс':>9} {'байт':>10} {'SQL':>5}")
+        for name, call in variants:
+            median, p95, body, statements, status = _measure(args.rounds, call)
+            print(f"{name:<8} {status:>6} {median:>12.2f} {p95:>9.2f} {body:>10} {statements:>5.1f}")
+
+
+if __name__ == "__main__":
+    main()
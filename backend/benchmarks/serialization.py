@@ -0,0 +1,126 @@
+"""
+Бенчмарк сериализации каталога вакансий: стоимость на строку до и после
+перехода на RowSerializer.
+Запустите: python backend/benchmarks/serialization.py [--rows 100] [--loops 200]
+С FAST_JSON_RESPONSE=true (и установленным orjson) dumps — это orjson.
+
+Варианты (одна страница из --rows опубликованных вакансий):
+- response_model — как FastAPI для list[VacancyPublic]: валидация
+  ORM-объектов, dump в JSON-совместимые типы и json.dumps;
+- TypeAdapter    — прежний путь кэша ответов: validate + dump_json;
+- rows/ORM       — RowSerializer + dumps по ORM-объектам;
+- rows/Row       — RowSerializer + dumps по кортежам query(*columns).
+Для сравнения — время самого SQL-запроса страницы (с загрузкой ORM-объектов).
+Перед замером проверяется, что все варианты дают одинаковый JSON.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Временная БД и каталог загрузок вместо рабочих: задаём до импорта настроек
+_tmp_dir = tempfile.mkdtemp(prefix="mosprom-bench-")
+os.chdir(_tmp_dir)
+os.makedirs("uploads", exist_ok=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app import crud, models
+from app.api.v1.vacancies import _public
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.schemas.vacancy import VacancyCreate, VacancyPublic
+from main import app
+
+_PARAGRAPH = "Разработка и сопровождение сервисов на Python, FastAPI и PostgreSQL. "
+
+
+def _seed(db, rows: int) -> None:
+    owner = models.User(email="bench-hr@example.com", hashed_password="-", role="hr", is_active=True)
+    db.add(owner)
+    db.flush()
+    crud.stats.add(db, owner)
+    db.commit()
+    for number in range(rows):
+        vacancy = crud.vacancy.create_with_owner(
+            db,
+            obj_in=VacancyCreate(
+                title=f"Python-разработчик {number}",
+                responsibilities=_PARAGRAPH * 8,
+                requirements=_PARAGRAPH * 6,
+                conditions=_PARAGRAPH * 4,
+                salary_min=150000,
+                salary_max=250000,
+                work_location="Москва",
+                work_schedule="полный день",
+            ),
+            owner_id=owner.id,
+        )
+        crud.vacancy.publish(db, vacancy_id=vacancy.id)
+
+
+def _per_row(loops: int, rows: int, call) -> float:
+    """Микросекунды на строку, лучшее из трёх прогонов"""
+    call()
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(loops):
+            call()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / loops / rows * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="строк на странице")
+    parser.add_argument("--loops", type=int, default=200, help="повторов на замер")
+    args = parser.parse_args()
+
+    # TestClient поднимает приложение: миграции и поисковый индекс
+    with TestClient(app):
+        db = SessionLocal()
+        _seed(db, args.rows)
+
+        def load_objects():
+            db.expunge_all()
+            return crud.vacancy.get_multi(db, limit=args.rows)
+
+        objects = load_objects()
+        tuples = crud.vacancy.get_multi(db, limit=args.rows, columns=_public.columns(models.Vacancy))
+        adapter = TypeAdapter(list[VacancyPublic])
+
+        def response_model():
+            # FastAPI 0.110: validate → dump_python(mode="json") → JSONResponse (json.dumps)
+            content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+            return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+        variants = [
+            ("response_model", response_model),
+            ("TypeAdapter", lambda: adapter.dump_json(adapter.validate_python(objects, from_attributes=True))),
+            ("rows/ORM", lambda: _public.dump_json(objects)),
+            ("rows/Row", lambda: _public.dump_json(tuples)),
+        ]
+
+        expected = json.loads(variants[0][1]())
+        for name, call in variants[1:]:
+            assert json.loads(call()) == expected, f"{name}: ответ отличается от response_model"
+
+        print(f"{args.rows} вакансий, dumps: {'orjson' if settings.FAST_JSON_RESPONSE else 'pydantic-core'}")
+        print(f"{'SQL (страница)':<16} {_per_row(args.loops // 10 or 1, args.rows, load_objects):8.1f} мкс/строку")
+        for name, call in variants:
+            print(f"{name:<16} {_per_row(args.loops, args.rows, call):8.1f} мкс/строку")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
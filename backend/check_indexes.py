@@ -0,0 +1,156 @@
+"""
+Проверка, что запросы CRUD-слоя идут по индексам.
+Запустите: python backend/check_indexes.py
+
+Скрипт поднимает временную SQLite-базу со схемой после всех миграций,
+вызывает функции чтения из app.crud, перехватывает их SQL и прогоняет
+каждый SELECT через EXPLAIN QUERY PLAN. Ошибка — полный проход по таблице
+(«SCAN <table>» без индекса) или план не по тем индексам, что указаны
+для запроса в CHECKS: так видно, если планировщик перестал выбирать
+индекс, ради которого он заведён.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append('backend')
+
+# Временная БД вместо рабочей: задаём до импорта настроек
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'check.db')}"
+
+from sqlalchemy import event
+from app import crud
+from app.core.database import SessionLocal, engine
+from app.core.migrations import run_migrations
+from app.core.search import create_search_index
+
+
+# (запрос, индексы в его плане, вызов). «PRIMARY KEY» — поиск по rowid,
+# *_fts — поисковый индекс FTS5
+CHECKS = [
+    ("vacancy.get", ("PRIMARY KEY",), lambda db: crud.vacancy.get(db, id=1)),
+    ("vacancy.get_multi", ("ix_vacancies_published_id",),
+     lambda db: crud.vacancy.get_multi(db, limit=10)),
+    ("vacancy.get_multi (cursor)", ("ix_vacancies_published_id",),
+     lambda db: crud.vacancy.get_multi(db, limit=10, after_id=5)),
+    ("vacancy.get_unpublished", ("ix_vacancies_published_id",),
+     lambda db: crud.vacancy.get_unpublished(db)),
+    ("vacancy.get_unpublished (cursor, owner)", ("ix_vacancies_published_id",),
+     lambda db: crud.vacancy.get_unpublished(db, after_id=5, owner_id=2)),
+    ("vacancy.get_unpublished (company)", ("ix_vacancies_company_published",),
+     lambda db: crud.vacancy.get_unpublished(db, company_name="ТехноКомпани")),
+    ("vacancy.oldest_unpublished", ("ix_vacancies_published_id",),
+     lambda db: crud.vacancy.oldest_unpublished(db)),
+    ("vacancy.get_by_owner", ("ix_vacancies_owner_id",),
+     lambda db: crud.vacancy.get_by_owner(db, owner_id=1)),
+    ("vacancy.search", ("ix_vacancies_published_schedule",),
+     lambda db: crud.vacancy.search(db, work_schedule="Полный день")),
+    ("vacancy.search (q)", ("vacancies_fts", "PRIMARY KEY"),
+     lambda db: crud.vacancy.search(db, q="разработчик")),
+    ("vacancy.get_by_company", ("ix_vacancies_company_published",),
+     lambda db: crud.vacancy.get_by_company(db, company_name="ТехноКомпани")),
+    ("vacancy.get_high_salary", ("ix_vacancies_published_salary_max",),
+     lambda db: crud.vacancy.get_high_salary(db)),
+    ("vacancy.get_remote_jobs", ("ix_vacancies_published_schedule",),
+     lambda db: crud.vacancy.get_remote_jobs(db)),
+    ("internship.get", ("PRIMARY KEY",), lambda db: crud.internship.get(db, id=1)),
+    ("internship.get_multi", ("ix_internships_published_id",),
+     lambda db: crud.internship.get_multi(db, limit=10)),
+    ("internship.get_unpublished", ("ix_internships_published_id",),
+     lambda db: crud.internship.get_unpublished(db)),
+    ("internship.get_unpublished (company)", ("ix_internships_published_id",),
+     lambda db: crud.internship.get_unpublished(db, after_id=5, company_name="МГУ")),
+    ("internship.oldest_unpublished", ("ix_internships_published_id",),
+     lambda db: crud.internship.oldest_unpublished(db)),
+    ("internship.get_by_owner", ("ix_internships_owner_id",),
+     lambda db: crud.internship.get_by_owner(db, owner_id=1)),
+    ("internship.search (q)", ("internships_fts", "PRIMARY KEY"),
+     lambda db: crud.internship.search(db, q="стажировка")),
+    ("user.get", ("PRIMARY KEY",), lambda db: crud.user.get(db, id=1)),
+    ("user.get_by_email", ("ix_users_email",),
+     lambda db: crud.user.get_by_email(db, email="admin@technopolis.ru")),
+    ("user.get_pending", ("ix_users_pending",), lambda db: crud.user.get_pending(db)),
+    ("user.get_pending (cursor, role)", ("ix_users_pending",),
+     lambda db: crud.user.get_pending(db, after_id=5, role="hr")),
+    ("user.oldest_pending", ("ix_users_pending",), lambda db: crud.user.oldest_pending(db)),
+    ("application.get_by_user_and_vacancy", ("ix_applications_applicant_vacancy",),
+     lambda db: crud.application.get_by_user_and_vacancy(db, user_id=1, vacancy_id=1)),
+    ("application.get_by_user_and_internship", ("ix_applications_applicant_internship",),
+     lambda db: crud.application.get_by_user_and_internship(db, user_id=1, internship_id=1)),
+    ("application.get_inbox", ("ix_vacancies_owner_id", "ix_applications_vacancy_id"),
+     lambda db: crud.application.get_inbox(db, owner_id=1, before_id=100, limit=20)),
+    ("application.get_inbox (internship)", ("PRIMARY KEY", "ix_applications_internship_id"),
+     lambda db: crud.application.get_inbox(db, owner_id=1, kind="internship", posting_id=1)),
+    ("application.get_inbox (skills, city)", ("PRIMARY KEY", "ix_application_fields_key_value"),
+     lambda db: crud.application.get_inbox(db, owner_id=1, skills=["Python"], city="Москва")),
+    ("application.get_detail", ("PRIMARY KEY",),
+     lambda db: crud.application.get_detail(db, application_id=1)),
+    ("resume_blob.get_for_owner", ("ix_resume_blobs_filename", "ix_applications_resume_blob_id", "PRIMARY KEY"),
+     lambda db: crud.resume_blob.get_for_owner(db, filename="x.pdf", owner_id=1)),
+]
+
+
+def used_indexes(plan_rows):
+    """Имена индексов из строк плана: «USING [COVERING] INDEX ix_…», rowid, FTS"""
+    used = set()
+    for row in plan_rows:
+        words = row[-1].split()
+        if "INDEX" in words and words[words.index("INDEX") - 1] in ("USING", "COVERING"):
+            used.add(words[words.index("INDEX") + 1])
+        elif "INTEGER PRIMARY KEY" in row[-1]:
+            used.add("PRIMARY KEY")
+        elif "VIRTUAL TABLE" in row[-1]:
+            used.add(words[1])
+    return used
+
+
+def full_scans(plan_rows):
+    """Строки плана вида «SCAN vacancies» — полный проход без индекса"""
+    scans = []
+    for row in plan_rows:
+        detail = row[-1]
+        if detail.startswith("SCAN") and "INDEX" not in detail and "VIRTUAL TABLE" not in detail:
+            scans.append(detail)
+    return scans
+
+
+run_migrations(engine)
+create_search_index(engine)
+
+captured = []
+
+@event.listens_for(engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip().upper().startswith("SELECT"):
+        captured.append((statement, parameters))
+
+failed = 0
+db = SessionLocal()
+try:
+    for name, expected, call in CHECKS:
+        captured.clear()
+        call(db)
+        statements = list(captured)
+        used = set()
+        for statement, parameters in statements:
+            with engine.connect() as conn:
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            used |= used_indexes(plan)
+            scans = full_scans(plan)
+            status = "✓" if not scans else "✗"
+            print(f"{status} {name}: " + "; ".join(row[-1] for row in plan))
+            if scans:
+                failed += 1
+        if used != set(expected):
+            print(f"✗ {name}: ожидались {', '.join(sorted(expected))}, в плане {', '.join(sorted(used)) or '—'}")
+            failed += 1
+finally:
+    db.close()
+
+print()
+if failed:
+    print(f"❌ Запросов без индекса или не по ожидаемому индексу: {failed}")
+    sys.exit(1)
+print("✅ Все запросы CRUD используют индексы")
@@ -10,7 +10,9 @@ import os
 sys.path.append('backend')
 
 from app.core.database import SessionLocal, engine, Base
+from app.core.migrations import run_migrations
 from app.core.security import get_password_hash
+from app.crud import stats
 from app.models import User, Vacancy, Internship
 
 
@@ -32,7 +34,7 @@ except Exception:
 
 # Создаем все таблицы заново
 print("\nСоздание новых таблиц...")
-Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 print("✓ Таблицы созданы")
 
 # Создаем сессию
@@ -84,6 +86,9 @@ try:
     db.add(uni2)
     print("✓ ВУЗ: mstu@university.ru / uni123")
     
+    db.flush()
+    for u in (admin, hr1, hr2, uni1, uni2):
+        stats.add(db, u)  # счётчики статистики
     db.commit()
     
     print("\nСоздание тестовых вакансий с полными данными...")
@@ -137,6 +142,8 @@ try:
     
     for v in vacancies:
         db.add(v)
+        db.flush()
+        stats.add(db, v)  # счётчики статистики
         status = "✓ Опубликовано" if v.is_published else "⏳ На модерации"
         print(f"{status}: {v.title}")
     
@@ -188,6 +195,8 @@ try:
 
     for i in internships:
         db.add(i)
+        db.flush()
+        stats.add(db, i)
         status = "✓ Опубликовано" if i.is_published else "⏳ На модерации"
         print(f"{status}: {i.title}")
     
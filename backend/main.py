@@ -1,20 +1,52 @@
 # main.py
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.staticfiles import StaticFiles  # ← НОВОЕ
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
 from app.api.v1 import auth, users, vacancies, internships, applications, moderation
-from app.core.database import engine, Base
+from app import crud
+from app.core.database import SessionLocal, async_engine, engine, pool_stats, replica_engine
+from app.core.migrations import run_migrations
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, gauges, render
+from app.core.response_cache import response_cache
+from app.core.search import create_search_index
+from app.core.serialization import FastJSONResponse
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.core.security import password_pool, require_metrics_access, token_cache
 
-# Создаём таблицы
-Base.metadata.create_all(bind=engine)
+# Создаём таблицы и применяем миграции схемы
+run_migrations(engine)
+# Полнотекстовый индекс (SQLite FTS5) для поиска по вакансиям и стажировкам
+create_search_index(engine)
 
 # Инициализируем приложение
-app = FastAPI(title="MosProm ОЭЗ Backend")
+# FAST_JSON_RESPONSE: все JSON-ответы кодируются через orjson
+app = FastAPI(
+    title="MosProm ОЭЗ Backend",
+    default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSE else JSONResponse,
+)
+
+# Останавливаем пул процессов bcrypt вместе с приложением
+app.add_event_handler("shutdown", password_pool.shutdown)
+# и закрываем соединения асинхронного движка, если он включён
+if async_engine is not None:
+    app.add_event_handler("shutdown", async_engine.dispose)
 
 # 🔥 Монтируем папку uploads как статику
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
+# Отсекаем слишком большие резюме до разбора multipart-тела
+# (запас в 1 МБ — на анкету и служебные части формы)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_prefix="/api/v1/applications/",
+    max_body_size=settings.MAX_RESUME_SIZE + 1024 * 1024,
+)
+
 # CORS
 origins = [
     "http://localhost:5173",
@@ -30,8 +62,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
+# Сжатие gzip/brotli (см. COMPRESSION_* в настройках). Ответы кэша каталога
+# приходят уже сжатыми и проходят без повторного сжатия
+app.add_middleware(CompressionMiddleware)
+
+# Метрики запросов — снаружи остальных middleware, чтобы время включало и их
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Роутеры
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
@@ -46,4 +87,47 @@ def read_root():
         "message": "MosProm ОЭЗ Backend is running!",
         "docs": "/docs",
         "redoc": "/redoc"
-    }
\ No newline at end of file
+    }
+
+def _pool_stats() -> dict:
+    pools = {"sync": pool_stats(engine)}
+    if replica_engine is not None:
+        pools["replica"] = pool_stats(replica_engine)
+    if async_engine is not None:
+        pools["async"] = pool_stats(async_engine.sync_engine)
+    return pools
+
+
+def _queue_metrics() -> dict:
+    db = SessionLocal()
+    try:
+        return crud.moderation.queue_metrics(db)
+    finally:
+        db.close()
+
+
+@app.get("/health")
+def health():
+    """Состояние сервиса, пулов соединений с БД и очередей модерации"""
+    return {"status": "ok", "db_pools": _pool_stats(), "moderation_queues": _queue_metrics()}
+
+
+if settings.METRICS_ENABLED:
+    @app.get(
+        "/metrics",
+        response_class=PlainTextResponse,
+        include_in_schema=False,
+        dependencies=[Depends(require_metrics_access)],
+    )
+    def metrics():
+        """Метрики в текстовом формате Prometheus (администраторам или по METRICS_TOKEN)"""
+        return PlainTextResponse(
+            render([
+                *gauges("db_pool", _pool_stats(), label="engine"),
+                *gauges("auth_token_cache", token_cache.stats()),
+                *gauges("password_hash_pool", password_pool.stats()),
+                *gauges("response_cache", response_cache.stats()),
+                *gauges("moderation_queue", _queue_metrics(), label="queue"),
+            ]),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
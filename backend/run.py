@@ -1,6 +1,8 @@
 # run.py
 import uvicorn
-from main import app
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    # Приложение передаётся строкой импорта: процессы пула bcrypt (spawn)
+    # заново импортируют этот модуль, и импорт main на верхнем уровне
+    # запускал бы в каждом из них миграции и создание поискового индекса
+    uvicorn.run("main:app", host="127.0.0.1", port=8000)
@@ -0,0 +1,103 @@
+"""
+Общие фикстуры тестов.
+Запустите: python -m pytest backend/tests
+
+Тесты работают во временном каталоге: своя SQLite-база и свой uploads/.
+Настройки читаются при импорте app, поэтому окружение задаётся здесь,
+до первого импорта приложения.
+"""
+
+import itertools
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_tmp_dir = tempfile.mkdtemp(prefix="mosprom-tests-")
+os.chdir(_tmp_dir)
+os.makedirs("uploads", exist_ok=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+# bcrypt в текущем процессе и с минимальной стоимостью — тесты про другое
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from fastapi.testclient import TestClient
+
+_emails = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(app):
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Активный пользователь с ролью role; возвращает (user, пароль)"""
+    from app.core.security import get_password_hash
+    from app.crud import stats
+    from app.models import User
+
+    def make(role: str = "applicant"):
+        password = "secret123"
+        user = User(
+            email=f"{role}{next(_emails)}@example.com",
+            hashed_password=get_password_hash(password),
+            role=role,
+            is_active=True,
+        )
+        db.add(user)
+        db.flush()
+        stats.add(db, user)
+        db.commit()
+        return user, password
+
+    return make
+
+
+@pytest.fixture
+def login(client):
+    """Заголовок Authorization для пользователя"""
+    def login(user, password: str) -> dict:
+        response = client.post(
+            "/api/v1/auth/token", data={"username": user.email, "password": password}
+        )
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return login
+
+
+@pytest.fixture
+def make_vacancy(db):
+    """Опубликованная вакансия владельца owner"""
+    from app import crud
+    from app.schemas.vacancy import VacancyCreate
+
+    def make(owner, title: str = "Python-разработчик"):
+        vacancy = crud.vacancy.create_with_owner(db, obj_in=VacancyCreate(title=title), owner_id=owner.id)
+        return crud.vacancy.publish(db, vacancy_id=vacancy.id)
+
+    return make
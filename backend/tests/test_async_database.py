@@ -0,0 +1,81 @@
+"""
+Режим ASYNC_DATABASE: AsyncSession на aiosqlite.
+
+Настройки читаются при импорте приложения, поэтому в обычном прогоне
+test_async_mode запускает отдельный процесс pytest с ASYNC_DATABASE=true:
+импорт приложения, этот модуль и тесты откликов и скачивания резюме.
+Остальные тесты модуля выполняются только в этом процессе: они проверяют,
+что роуты на get_async_db действительно работают через AsyncSession.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import event
+
+from app.core import database
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Модули, которые прогоняются и в async-режиме: роуты на get_async_db
+ASYNC_MODULES = ("test_async_database.py", "test_resume_storage.py", "test_resume_download.py", "test_metrics.py")
+
+async_only = pytest.mark.skipif(database.async_engine is None, reason="только при ASYNC_DATABASE=true")
+
+
+@pytest.mark.skipif(database.async_engine is not None, reason="уже в async-режиме")
+def test_async_mode():
+    pytest.importorskip("aiosqlite")
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+         *(os.path.join(TESTS_DIR, name) for name in ASYNC_MODULES)],
+        cwd=os.path.dirname(TESTS_DIR),
+        env={**os.environ, "ASYNC_DATABASE": "true"},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stdout[-5000:] + result.stderr[-5000:]
+
+
+@pytest.fixture
+def statements():
+    """SQL по движкам: {"sync": [...], "async": [...]}"""
+    executed = {"sync": [], "async": []}
+    listeners = []
+    for name, engine in (("sync", database.engine), ("async", database.async_engine.sync_engine)):
+        def record(conn, cursor, statement, *args, _name=name):
+            executed[_name].append(statement)
+        event.listen(engine, "before_cursor_execute", record)
+        listeners.append((engine, record))
+    yield executed
+    for engine, record in listeners:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@async_only
+def test_apply_and_download_use_async_session(client, make_user, make_vacancy, login, statements):
+    hr, password = make_user("hr")
+    vacancy = make_vacancy(hr)
+    hr_headers, applicant = login(hr, password), login(*make_user("applicant"))
+    content = b"%PDF-1.4 " + os.urandom(256)
+
+    statements["sync"].clear()
+    statements["async"].clear()
+    response = client.post(
+        f"/api/v1/applications/vacancy/{vacancy.id}",
+        files={"resume_file": ("cv.pdf", content, "application/pdf")},
+        headers=applicant,
+    )
+    assert response.status_code == 200, response.text
+    assert any("INSERT INTO applications" in sql for sql in statements["async"])
+    assert not any("applications" in sql for sql in statements["sync"])
+
+    filename = os.path.basename(response.json()["resume_file_path"])
+    statements["async"].clear()
+    download = client.get(f"/api/v1/applications/resume/{filename}", headers=hr_headers)
+    assert download.status_code == 200
+    assert download.content == content
+    assert any("resume_blobs" in sql for sql in statements["async"])
@@ -0,0 +1,66 @@
+"""
+Условные запросы к каталогу: 304 для записи — только по её собственному
+ETag (или «*», если запись существует); удалённая, снятая с публикации
+или чужая запись отвечает 404. If-Modified-Since при наличии ETag не даёт 304.
+"""
+
+import pytest
+
+from app import crud
+from app.core.response_cache import response_cache
+
+
+@pytest.fixture
+def vacancies(make_user, make_vacancy):
+    response_cache.clear()
+    hr, _ = make_user("hr")
+    return make_vacancy(hr, "Первая"), make_vacancy(hr, "Вторая")
+
+
+def _etag(client, vacancy_id) -> str:
+    response = client.get(f"/api/v1/vacancies/{vacancy_id}")
+    assert response.status_code == 200, response.text
+    return response.headers["etag"]
+
+
+def test_item_revalidates_with_its_own_etag(client, vacancies):
+    first, _ = vacancies
+    etag = _etag(client, first.id)
+    response = client.get(f"/api/v1/vacancies/{first.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_other_item_etag_does_not_match(client, vacancies):
+    first, second = vacancies
+    etag = _etag(client, first.id)
+    assert client.get(f"/api/v1/vacancies/{second.id}", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/v1/vacancies/999999", headers={"If-None-Match": etag}).status_code == 404
+
+
+@pytest.mark.parametrize("change", ["delete", "unpublish"])
+def test_removed_item_is_not_304(client, db, vacancies, change):
+    first, _ = vacancies
+    etag = _etag(client, first.id)
+    if change == "delete":
+        crud.vacancy.delete(db, vacancy_id=first.id)
+    else:
+        crud.vacancy.unpublish(db, vacancy_id=first.id)
+    assert client.get(f"/api/v1/vacancies/{first.id}", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_wildcard_needs_an_existing_item(client, db, vacancies):
+    first, second = vacancies
+    wildcard = {"If-None-Match": "*"}
+    assert client.get("/api/v1/vacancies/424242", headers=wildcard).status_code == 404
+    assert client.get(f"/api/v1/vacancies/{first.id}", headers=wildcard).status_code == 304
+    crud.vacancy.unpublish(db, vacancy_id=second.id)
+    assert client.get(f"/api/v1/vacancies/{second.id}", headers=wildcard).status_code == 404
+
+
+def test_change_within_the_same_second_is_not_304(client, db, vacancies):
+    first, second = vacancies
+    last_modified = client.get(f"/api/v1/vacancies/{first.id}").headers["last-modified"]
+    # Правка в ту же секунду: Last-Modified не изменится, версия — да
+    crud.vacancy.unpublish(db, vacancy_id=second.id)
+    response = client.get(f"/api/v1/vacancies/{first.id}", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
@@ -0,0 +1,102 @@
+"""
+Входящие отклики HR: страницы по X-Next-Cursor без потерь и повторов,
+доступ только для роли hr, фильтр по городу из анкеты (поле city
+формы отклика). Карточка отклика с fields= читает из БД
+только выбранные колонки.
+"""
+
+import json
+import os
+
+from sqlalchemy import event
+
+from app.core import database
+
+
+def test_inbox_pages_follow_next_cursor(client, make_user, make_vacancy, login):
+    hr, password = make_user("hr")
+    vacancy = make_vacancy(hr)
+    created = []
+    for _ in range(5):
+        response = client.post(
+            f"/api/v1/applications/vacancy/{vacancy.id}",
+            files={"resume_file": ("cv.pdf", b"%PDF-1.4 " + os.urandom(32), "application/pdf")},
+            headers=login(*make_user("applicant")),
+        )
+        assert response.status_code == 200, response.text
+        created.append(response.json()["id"])
+
+    headers, seen, cursor = login(hr, password), [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/applications/my-vacancy-applications", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(created) and len(seen) == len(set(seen))
+
+
+def test_inbox_is_hr_only(client, make_user, login):
+    for role in ("university", "applicant"):
+        headers = login(*make_user(role))
+        for kind in ("vacancy", "internship"):
+            response = client.get(f"/api/v1/applications/my-{kind}-applications", headers=headers)
+            assert response.status_code == 403, (role, kind)
+
+
+def test_inbox_filters_by_questionnaire_city(client, make_user, make_vacancy, login):
+    hr, password = make_user("hr")
+    vacancy = make_vacancy(hr)
+    ids = {}
+    for city in ("Москва", "Казань", None):
+        # Так анкету отправляет ApplyPage: пустое поле — null
+        questionnaire = {"full_name": "Иван", "phone": "+7", "email": "a@b.ru", "city": city}
+        response = client.post(
+            f"/api/v1/applications/vacancy/{vacancy.id}",
+            data={"resume_data": json.dumps(questionnaire)},
+            headers=login(*make_user("applicant")),
+        )
+        assert response.status_code == 200, response.text
+        ids[city] = response.json()["id"]
+
+    response = client.get(
+        "/api/v1/applications/my-vacancy-applications",
+        params={"city": "г. москва"},
+        headers=login(hr, password),
+    )
+    assert response.status_code == 200, response.text
+    assert [item["id"] for item in response.json()] == [ids["Москва"]]
+
+
+def test_detail_selects_only_requested_fields(client, make_user, make_vacancy, login):
+    hr, password = make_user("hr")
+    applicant = login(*make_user("applicant"))
+    vacancy = make_vacancy(hr, "Аналитик")
+    response = client.post(
+        f"/api/v1/applications/vacancy/{vacancy.id}",
+        data={"resume_data": json.dumps({"full_name": "Иван", "skills": "SQL"})},
+        headers=applicant,
+    )
+    assert response.status_code == 200, response.text
+    url = f"/api/v1/applications/{response.json()['id']}"
+
+    full = client.get(url, headers=login(hr, password)).json()
+    assert full["resume_data"] == {"full_name": "Иван", "skills": "SQL"}
+    assert full["posting_title"] == "Аналитик"
+
+    selects = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM applications" in statement:
+            selects.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", capture)
+    try:
+        narrow = client.get(url, params={"fields": "id,posting_title"}, headers=applicant)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", capture)
+    assert narrow.status_code == 200, narrow.text
+    assert narrow.json() == {"id": full["id"], "posting_title": "Аналитик"}
+    assert len(selects) == 1 and "resume_data" not in selects[0] and "created_at" not in selects[0]
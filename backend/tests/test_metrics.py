@@ -0,0 +1,81 @@
+"""
+Учёт SQL в метриках запроса: время каждого запроса меряется от его
+собственного начала, упавший запрос не сбивает замеры следующих
+и не оставляет состояния в соединении из пула; SQL async-роутов
+тоже считается. /metrics — только администраторам и по METRICS_TOKEN.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import engine
+
+
+@pytest.fixture
+def trace(app):
+    trace = metrics.RequestTrace()
+    token = metrics._current_trace.set(trace)
+    yield trace
+    metrics._current_trace.reset(token)
+
+
+def test_failed_statement_does_not_skew_timings(trace):
+    with engine.connect() as conn:
+        info = dict(conn.info)
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        # Пауза после упавшего запроса: если бы его время начала осталось
+        # в соединении, следующий запрос получил бы эти 0.2 с себе
+        time.sleep(0.2)
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        # Соединение вернётся в пул без следов замеров
+        assert conn.info == info
+
+    assert trace.statements == 1
+    assert trace.rows == 1
+    [(elapsed, statement)] = trace.queries
+    assert statement == "SELECT 1"
+    assert elapsed < 0.1
+
+
+def test_metrics_endpoint_counts_sql(client, make_user, login):
+    admin = login(*make_user("admin"))
+    metrics.request_metrics.clear()
+    assert client.get("/api/v1/vacancies/").status_code == 200
+    body = client.get("/metrics", headers=admin).text
+    assert 'http_requests_total{method="GET",route="/api/v1/vacancies/",status="200"} 1' in body
+    assert 'http_request_sql_statements_count{method="GET",route="/api/v1/vacancies/"} 1' in body
+
+
+def test_async_route_counts_sql(client, make_user, make_vacancy, login):
+    # apply_to_vacancy — async-роут: CRUD через crud.aio (пул потоков или
+    # AsyncSession.run_sync), SQL должен попасть в RequestTrace запроса
+    vacancy = make_vacancy(make_user("hr")[0])
+    headers = login(*make_user("applicant"))
+    metrics.request_metrics.clear()
+    response = client.post(
+        f"/api/v1/applications/vacancy/{vacancy.id}",
+        data={"resume_data": '{"full_name": "Иван"}'},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    route = metrics.request_metrics._routes[("POST", "/api/v1/applications/vacancy/{vacancy_id}")]
+    # Пользователь — из кэша токенов; вакансия, проверка повторного отклика, INSERT
+    assert route.statements.sum >= 3
+    assert route.rows >= 1
+
+
+def test_metrics_endpoint_requires_admin_or_token(client, make_user, login, monkeypatch):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=login(*make_user("hr"))).status_code == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 401
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert response.text.startswith("# HELP")
@@ -0,0 +1,46 @@
+"""
+Очередь модерации: размер из счётчиков (X-Total-Count) совпадает со списком,
+который отдаёт запрос очереди, в том числе для отклонения с пустой причиной.
+"""
+
+from app import crud
+from app.schemas.vacancy import VacancyCreate
+
+
+def _queue(client, headers, **params):
+    response = client.get("/api/v1/moderation/vacancies/pending", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_queue_total_matches_items(client, db, make_user, login):
+    admin = login(*make_user("admin"))
+    hr, _ = make_user("hr")
+    waiting = crud.vacancy.create_with_owner(db, obj_in=VacancyCreate(title="Ждёт"), owner_id=hr.id)
+    rejected = crud.vacancy.create_with_owner(db, obj_in=VacancyCreate(title="Отклонена"), owner_id=hr.id)
+    # Пустая причина — всё равно отклонение: запрос очереди её не покажет
+    crud.vacancy.reject_vacancy(db, vacancy_id=rejected.id, rejection_reason="")
+
+    response = _queue(client, admin, owner_id=hr.id)
+    assert [item["id"] for item in response.json()] == [waiting.id]
+    assert response.headers["X-Total-Count"] == "1"
+
+
+def test_queue_pages_follow_next_cursor(client, db, make_user, login):
+    admin = login(*make_user("admin"))
+    hr, _ = make_user("hr")
+    ids = [
+        crud.vacancy.create_with_owner(db, obj_in=VacancyCreate(title=f"Вакансия {n}"), owner_id=hr.id).id
+        for n in range(5)
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"owner_id": hr.id, "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = _queue(client, admin, **params)
+        assert response.headers["X-Total-Count"] == "5"
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == ids
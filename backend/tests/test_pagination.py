@@ -0,0 +1,42 @@
+"""
+Курсоры пагинации: подделанный курсор — 400, а не 500.
+"""
+
+import base64
+
+import pytest
+
+
+def _cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("raw", [
+    '{"id":1e400}',
+    '{"id":99999999999999999999999}',
+    '{"id":9223372036854775808}',
+    '{"id":-1}',
+    '{"id":0}',
+    '{"id":1.5}',
+    '{"id":"1"}',
+    '{"id":true}',
+    '{"id":null}',
+    '[1]',
+    '"id"',
+    '{}',
+    'not json',
+])
+def test_crafted_cursor_is_rejected(client, raw):
+    for url in ("/api/v1/vacancies/", "/api/v1/internships/"):
+        response = client.get(url, params={"cursor": _cursor(raw)})
+        assert response.status_code == 400, (url, raw, response.text)
+
+
+def test_garbage_cursor_is_rejected(client):
+    assert client.get("/api/v1/vacancies/", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_valid_cursor_is_accepted(client):
+    response = client.get("/api/v1/vacancies/", params={"cursor": _cursor('{"id":9223372036854775807}')})
+    assert response.status_code == 200
+    assert response.json() == []
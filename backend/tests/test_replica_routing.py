@@ -0,0 +1,163 @@
+"""
+Маршрутизация чтения на реплику: GET — на реплику, запись — на основную БД,
+после записи клиент читает с основной, пока не истечёт recent_writers.
+
+Реплика — второй SQLite-файл, снятый с основной через backup API
+(как будто репликация уже догнала основную).
+"""
+
+import os
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import event, make_url
+
+from app.core import database
+from app.core.response_cache import response_cache
+
+
+@pytest.fixture
+def statements():
+    """statements(engine) — список SQL этого движка; слушатели снимаются после теста"""
+    listeners = []
+
+    def record(engine) -> list:
+        executed = []
+
+        def append(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(engine, "before_cursor_execute", append)
+        listeners.append((engine, append))
+        return executed
+
+    yield record
+    for engine, append in listeners:
+        event.remove(engine, "before_cursor_execute", append)
+
+
+def _counting(factory, sessions: list):
+    def make():
+        session = factory()
+        sessions.append(session)
+        return session
+    return make
+
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path):
+    primary_path = make_url(str(database.engine.url)).database
+    replica_path = str(tmp_path / "replica.db")
+    source, target = sqlite3.connect(primary_path), sqlite3.connect(replica_path)
+    try:
+        source.backup(target)
+        target.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        source.close()
+        target.close()
+
+    replica_engine = database.build_engine(f"sqlite:///{replica_path}", read_only=True)
+    monkeypatch.setattr(database, "replica_engine", replica_engine)
+    monkeypatch.setattr(
+        database, "ReplicaSessionLocal",
+        database.sessionmaker(autocommit=False, autoflush=False, bind=replica_engine),
+    )
+    database.recent_writers.clear()
+    response_cache.clear()
+    yield replica_engine, replica_path
+    replica_engine.dispose()
+    database.recent_writers.clear()
+
+
+@pytest.fixture
+def hr_headers(make_user, login):
+    """Два HR: их пользователи должны попасть в снимок реплики"""
+    first = login(*make_user("hr"))
+    second = login(*make_user("hr"))
+    return first, second
+
+
+def _titles(response) -> set:
+    assert response.status_code == 200, response.text
+    return {item["title"] for item in response.json()}
+
+
+def test_reads_go_to_replica_and_writes_to_primary(client, hr_headers, replica, statements):
+    hr, _ = hr_headers
+    replica_engine, _ = replica
+    on_primary, on_replica = statements(database.engine), statements(replica_engine)
+
+    assert _titles(client.get("/api/v1/vacancies/my", headers=hr)) == set()
+    assert on_replica and not on_primary
+
+    on_replica.clear()
+    response = client.post("/api/v1/vacancies/", json={"title": "Только на основной"}, headers=hr)
+    assert response.status_code == 200, response.text
+    assert on_primary and not on_replica
+
+
+def test_read_your_writes_within_ttl(client, hr_headers, replica, statements, monkeypatch):
+    hr, other_hr = hr_headers
+    replica_engine, _ = replica
+    monkeypatch.setattr(database.recent_writers, "ttl", 0.5)
+
+    response = client.post("/api/v1/vacancies/", json={"title": "Свежая вакансия"}, headers=hr)
+    assert response.status_code == 200, response.text
+
+    on_primary, on_replica = statements(database.engine), statements(replica_engine)
+    # Писавший клиент сразу видит свою запись — чтение с основной
+    assert "Свежая вакансия" in _titles(client.get("/api/v1/vacancies/my", headers=hr))
+    assert on_primary and not on_replica
+
+    # Остальные клиенты по-прежнему читают с реплики
+    on_primary.clear()
+    client.get("/api/v1/vacancies/my", headers=other_hr)
+    assert on_replica and not on_primary
+
+    # После TTL и писавший клиент возвращается на реплику, где записи ещё нет
+    time.sleep(0.6)
+    on_primary.clear()
+    on_replica.clear()
+    assert "Свежая вакансия" not in _titles(client.get("/api/v1/vacancies/my", headers=hr))
+    assert on_replica and not on_primary
+
+
+@pytest.fixture
+def uploaded_resume(client, make_user, make_vacancy, login):
+    """(заголовки HR, имя файла) — отклик с резюме, до снимка реплики"""
+    hr, password = make_user("hr")
+    vacancy = make_vacancy(hr)
+    response = client.post(
+        f"/api/v1/applications/vacancy/{vacancy.id}",
+        files={"resume_file": ("cv.pdf", b"%PDF-1.4 " + os.urandom(64), "application/pdf")},
+        headers=login(*make_user("applicant")),
+    )
+    assert response.status_code == 200, response.text
+    return login(hr, password), os.path.basename(response.json()["resume_file_path"])
+
+
+def test_async_routes_use_routed_session(client, uploaded_resume, replica, statements, monkeypatch):
+    headers, filename = uploaded_resume
+    replica_engine, _ = replica
+    sessions = []
+    monkeypatch.setattr(database, "ReplicaSessionLocal", _counting(database.ReplicaSessionLocal, sessions))
+    monkeypatch.setattr(database, "SessionLocal", _counting(database.SessionLocal, sessions))
+    on_primary, on_replica = statements(database.engine), statements(replica_engine)
+
+    # async-роут (get_async_db) читает с реплики той же сессией, что и get_current_user
+    response = client.get(f"/api/v1/applications/resume/{filename}", headers=headers)
+    assert response.status_code == 200, response.text
+    assert on_replica and not on_primary
+    assert len(sessions) == 1
+
+
+def test_replica_connections_do_not_write(replica):
+    replica_engine, replica_path = replica
+    mtime = os.path.getmtime(replica_path)
+    with replica_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+    assert not os.path.exists(replica_path + "-wal")
+    assert os.path.getmtime(replica_path) == mtime
+
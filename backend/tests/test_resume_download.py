@@ -0,0 +1,81 @@
+"""
+Скачивание резюме: ровно один SQL-запрос на скачивание (файл и проверка
+владельца — одним запросом, пользователь — из кэша токенов), ETag/304
+и Range. Сравнение с прежним обработчиком — benchmarks/resume_files.py.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import event
+
+from app.core import database
+from app.models import ResumeBlob
+
+
+@pytest.fixture
+def resume(client, db, make_user, make_vacancy, login):
+    """(заголовки HR-владельца вакансии, имя файла, содержимое)"""
+    hr, password = make_user("hr")
+    vacancy = make_vacancy(hr)
+    content = b"%PDF-1.4 " + os.urandom(4096)
+    response = client.post(
+        f"/api/v1/applications/vacancy/{vacancy.id}",
+        files={"resume_file": ("cv.pdf", content, "application/pdf")},
+        headers=login(*make_user("applicant")),
+    )
+    assert response.status_code == 200, response.text
+    filename = os.path.basename(response.json()["resume_file_path"])
+    assert db.query(ResumeBlob).filter(ResumeBlob.filename == filename).count() == 1
+    return login(hr, password), filename, content
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    # При ASYNC_DATABASE запросы идут через async_engine
+    engines = [database.engine]
+    if database.async_engine is not None:
+        engines.append(database.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+def test_download_runs_one_statement(client, resume, statements):
+    headers, filename, content = resume
+    url = f"/api/v1/applications/resume/{filename}"
+    # Первый запрос прогревает кэш токенов (пользователь читается из БД)
+    assert client.get(url, headers=headers).status_code == 200
+
+    for _ in range(3):
+        statements.clear()
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.content == content
+        assert len(statements) == 1, statements
+
+
+
+def test_revalidation_and_ranges(client, resume):
+    headers, filename, content = resume
+    url = f"/api/v1/applications/resume/{filename}"
+    full = client.get(url, headers=headers)
+    assert full.headers["content-type"] == "application/pdf"
+    etag = full.headers["etag"]
+
+    cached = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+
+    partial = client.get(url, headers={**headers, "Range": "bytes=0-99"})
+    assert partial.status_code == 206
+    assert partial.content == content[:100]
+    assert partial.headers["content-range"] == f"bytes 0-99/{len(content)}"
+
+    assert client.get(url, headers={**headers, "Range": f"bytes={len(content)}-"}).status_code == 416
@@ -0,0 +1,121 @@
+"""
+Хранилище резюме: одинаковые файлы хранятся один раз, файл появляется
+на диске только вместе с закоммиченной записью resume_blobs, отзыв
+последнего отклика удаляет файл (но не тот, что снова загрузили, пока
+удалялась запись), Content-Type — по расширению.
+"""
+
+import os
+
+import pytest
+
+from app import crud
+from app.core import questionnaire, storage
+from app.models import ResumeBlob
+
+
+def _stored_files() -> set:
+    os.makedirs(storage.TMP_DIR, exist_ok=True)
+    return {
+        name for name in os.listdir(storage.RESUME_DIR)
+        if os.path.isfile(os.path.join(storage.RESUME_DIR, name))
+    }
+
+
+def _apply(client, headers, vacancy_id, content: bytes, filename: str = "cv.pdf", content_type: str = "application/pdf"):
+    return client.post(
+        f"/api/v1/applications/vacancy/{vacancy_id}",
+        files={"resume_file": (filename, content, content_type)},
+        headers=headers,
+    )
+
+
+@pytest.fixture
+def applicants(make_user, login):
+    return [login(*make_user("applicant")) for _ in range(2)]
+
+
+def test_same_content_is_stored_once_and_collected_on_delete(
+    client, db, make_user, make_vacancy, applicants
+):
+    hr, _ = make_user("hr")
+    vacancy = make_vacancy(hr)
+    before = _stored_files()
+    content = b"%PDF-1.4 same resume " + os.urandom(16)
+
+    first = _apply(client, applicants[0], vacancy.id, content)
+    second = _apply(client, applicants[1], vacancy.id, content)
+    assert first.status_code == second.status_code == 200, (first.text, second.text)
+
+    created = _stored_files() - before
+    assert len(created) == 1
+    assert os.listdir(storage.TMP_DIR) == []
+    blob = db.query(ResumeBlob).filter(ResumeBlob.filename == created.pop()).one()
+    assert blob.ref_count == 2
+    blob_id, path = blob.id, storage.blob_path(blob.filename)
+
+    assert client.delete(f"/api/v1/applications/{first.json()['id']}", headers=applicants[0]).status_code == 200
+    assert os.path.exists(path)
+    assert client.delete(f"/api/v1/applications/{second.json()['id']}", headers=applicants[1]).status_code == 200
+    assert not os.path.exists(path)
+    db.expire_all()
+    assert db.query(ResumeBlob).filter(ResumeBlob.id == blob_id).first() is None
+
+
+def test_upload_racing_delete_keeps_file(client, db, make_user, make_vacancy, applicants, monkeypatch):
+    hr, _ = make_user("hr")
+    vacancy = make_vacancy(hr)
+    content = b"%PDF-1.4 raced resume " + os.urandom(16)
+    first = _apply(client, applicants[0], vacancy.id, content)
+    assert first.status_code == 200, first.text
+    path = first.json()["resume_file_path"]
+
+    delete = crud.application.delete
+    uploads = []
+
+    def racing_delete(db, *, application):
+        # Запись о файле уже удалена и закоммичена, файл ещё на диске —
+        # в этот момент второй соискатель загружает то же резюме
+        orphan = delete(db, application=application)
+        uploads.append(_apply(client, applicants[1], vacancy.id, content))
+        return orphan
+
+    monkeypatch.setattr(crud.application, "delete", racing_delete)
+    assert client.delete(f"/api/v1/applications/{first.json()['id']}", headers=applicants[0]).status_code == 200
+
+    assert uploads[0].status_code == 200, uploads[0].text
+    assert uploads[0].json()["resume_file_path"] == path
+    assert os.path.exists(path)
+    db.expire_all()
+    assert db.query(ResumeBlob).filter(ResumeBlob.filename == os.path.basename(path)).one().ref_count == 1
+
+
+def test_failed_application_leaves_no_file(client, db, make_user, make_vacancy, applicants, monkeypatch):
+    hr, _ = make_user("hr")
+    vacancy = make_vacancy(hr)
+    before = _stored_files()
+
+    def broken(data):
+        raise RuntimeError("questionnaire failure")
+
+    monkeypatch.setattr(questionnaire, "extract_fields", broken)
+    with pytest.raises(RuntimeError):
+        _apply(client, applicants[0], vacancy.id, b"%PDF-1.4 " + os.urandom(16))
+
+    assert _stored_files() == before
+    assert os.listdir(storage.TMP_DIR) == []
+    assert db.query(ResumeBlob).count() == len(before)
+
+
+def test_content_type_comes_from_extension_whitelist(client, db, make_user, make_vacancy, applicants, login):
+    hr, password = make_user("hr")
+    vacancy = make_vacancy(hr)
+    response = _apply(client, applicants[0], vacancy.id, b"<script>x</script>" + os.urandom(8), "cv.html", "text/html")
+    assert response.status_code == 200, response.text
+
+    blob = db.query(ResumeBlob).filter(ResumeBlob.filename.like("%.html")).one()
+    assert blob.content_type == "application/octet-stream"
+    download = client.get(f"/api/v1/applications/resume/{blob.filename}", headers=login(hr, password))
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/octet-stream"
+    assert storage.guess_content_type("cv.DOCX").endswith("wordprocessingml.document")
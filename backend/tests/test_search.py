@@ -0,0 +1,27 @@
+"""
+Поиск без FTS5 (ILIKE): %, _ и \\ в запросе ищутся как обычные символы.
+"""
+
+import pytest
+
+from app import crud
+from app.core import search
+
+
+@pytest.fixture
+def titles(make_user, make_vacancy, monkeypatch):
+    monkeypatch.setattr(search, "_enabled", False)
+    hr, _ = make_user("hr")
+    for title in ("Скидка 100% на обучение", "Скидка 1000 рублей", "snake_case разработчик",
+                  "snakeXcase разработчик", "Путь C:\\data", "Путь C:data"):
+        make_vacancy(hr, title)
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("100%", {"Скидка 100% на обучение"}),
+    ("snake_case", {"snake_case разработчик"}),
+    ("C:\\d", {"Путь C:\\data"}),
+])
+def test_like_fallback_matches_wildcards_literally(db, titles, q, expected):
+    found = {vacancy.title for vacancy in crud.vacancy.search(db, q=q, limit=100)}
+    assert found == expected
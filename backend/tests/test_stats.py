@@ -0,0 +1,67 @@
+"""
+Счётчики статистики: имена из свободного текста укладываются в
+StatCounter.name и не сливаются, нулевые счётчики не хранятся.
+"""
+
+import uuid
+
+from app import crud
+from app.crud import stats
+from app.models import StatCounter
+from app.schemas.vacancy import VacancyCreate
+
+
+def _counter_names(db, entity: str) -> set:
+    return {name for (name,) in db.query(StatCounter.name).filter(StatCounter.entity == entity)}
+
+
+def test_long_company_names_fit_and_stay_distinct(db, make_user):
+    hr, _ = make_user("hr")
+    common = "ООО " + "Очень длинное название компании " * 10
+    companies = [common + "Север", common + "Юг"]
+    for company in companies:
+        crud.vacancy.create_with_owner(
+            db, obj_in=VacancyCreate(title="Вакансия", company_name=company), owner_id=hr.id
+        )
+    crud.vacancy.create_with_owner(
+        db, obj_in=VacancyCreate(title="Ещё одна", company_name=companies[0]), owner_id=hr.id
+    )
+
+    names = _counter_names(db, "vacancy")
+    assert all(len(name) <= stats.MAX_NAME_LENGTH for name in names)
+    assert crud.vacancy.count_unpublished(db, company_name=companies[0]) == 2
+    assert crud.vacancy.count_unpublished(db, company_name=companies[1]) == 1
+
+
+def test_counters_that_reach_zero_are_deleted(db, make_user, make_vacancy):
+    hr, _ = make_user("hr")
+    location = f"Локация {uuid.uuid4()}"
+    vacancy = crud.vacancy.create_with_owner(
+        db, obj_in=VacancyCreate(title="Временная", work_location=location), owner_id=hr.id
+    )
+    crud.vacancy.publish(db, vacancy_id=vacancy.id)
+    assert f"location:{location}" in _counter_names(db, "vacancy")
+    assert crud.stats.get_vacancy_statistics(db)["by_work_location"][location] == 1
+
+    crud.vacancy.delete(db, vacancy_id=vacancy.id)
+    db.expire_all()
+    assert f"location:{location}" not in _counter_names(db, "vacancy")
+    assert f"pending_owner:{hr.id}" not in _counter_names(db, "vacancy")
+    assert location not in crud.stats.get_vacancy_statistics(db)["by_work_location"]
+
+
+def test_bulk_moderation_prunes_emptied_queue_counters(db, make_user):
+    hr, _ = make_user("hr")
+    company = f"Компания {uuid.uuid4()}"
+    ids = [
+        crud.vacancy.create_with_owner(
+            db, obj_in=VacancyCreate(title=f"Вакансия {n}", company_name=company), owner_id=hr.id
+        ).id
+        for n in range(3)
+    ]
+    assert stats.count(db, "vacancy", f"pending_company:{company}") == 3
+
+    crud.vacancy.bulk_publish(db, ids=ids)
+    db.expire_all()
+    assert f"pending_company:{company}" not in _counter_names(db, "vacancy")
+    assert crud.vacancy.count_unpublished(db, company_name=company) == 0
@@ -20,26 +20,51 @@ import CheckCircleIcon from '@mui/icons-material/CheckCircle';
 import CancelIcon from '@mui/icons-material/Cancel';
 import PendingIcon from '@mui/icons-material/Pending';
 
+// Очереди модерации отдаются страницами: следующая — по курсору из заголовка
+// X-Next-Cursor, размер всей очереди — в X-Total-Count
+const QUEUES = {
+  vacancies: '/moderation/vacancies/pending',
+  internships: '/moderation/internships/pending',
+  users: '/moderation/users/pending',
+};
+
+const fetchQueuePage = (type, cursor) =>
+  api.get(QUEUES[type], { params: cursor ? { cursor } : {} });
+
+const readQueuePage = (response) => {
+  const total = Number(response.headers['x-total-count']);
+  return {
+    items: response.data,
+    cursor: response.headers['x-next-cursor'] || null,
+    total: Number.isNaN(total) ? response.data.length : total,
+  };
+};
+
 const AdminDashboardPage = () => {
   const [pending, setPending] = useState({ vacancies: [], internships: [], users: [] });
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [rejectionReasons, setRejectionReasons] = useState({});
   const [rejectionErrors, setRejectionErrors] = useState({});
+  const [cursors, setCursors] = useState({});
+  const [totals, setTotals] = useState({ vacancies: 0, internships: 0, users: 0 });
+  const [loadingMore, setLoadingMore] = useState(null);
 
   const fetchData = async () => {
     try {
       setLoading(true);
-      const [vacanciesRes, internshipsRes, usersRes] = await Promise.all([
-        api.get('/moderation/vacancies/pending'),
-        api.get('/moderation/internships/pending'),
-        api.get('/moderation/users/pending'),
-      ]);
-      setPending({
-        vacancies: vacanciesRes.data,
-        internships: internshipsRes.data,
-        users: usersRes.data,
+      const types = Object.keys(QUEUES);
+      const responses = await Promise.all(types.map((type) => fetchQueuePage(type)));
+      const next = { pending: {}, cursors: {}, totals: {} };
+      types.forEach((type, index) => {
+        const page = readQueuePage(responses[index]);
+        next.pending[type] = page.items;
+        next.cursors[type] = page.cursor;
+        next.totals[type] = page.total;
       });
+      setPending(next.pending);
+      setCursors(next.cursors);
+      setTotals(next.totals);
       setError(null);
     } catch (err) {
       setError('Не удалось загрузить данные для модерации.');
@@ -49,6 +74,33 @@ const AdminDashboardPage = () => {
     }
   };
 
+  const loadMore = async (type) => {
+    try {
+      setLoadingMore(type);
+      const page = readQueuePage(await fetchQueuePage(type, cursors[type]));
+      setPending((prev) => {
+        // Пока страница грузилась, очередь могла измениться — без дублей
+        const known = new Set(prev[type].map((item) => item.id));
+        return { ...prev, [type]: [...prev[type], ...page.items.filter((item) => !known.has(item.id))] };
+      });
+      setCursors((prev) => ({ ...prev, [type]: page.cursor }));
+      setTotals((prev) => ({ ...prev, [type]: page.total }));
+    } catch (err) {
+      alert('Не удалось загрузить следующую страницу.');
+      console.error(err);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
+  const removeItem = (type, id) => {
+    setPending((prev) => ({
+      ...prev,
+      [type]: prev[type].filter((item) => item.id !== id),
+    }));
+    setTotals((prev) => ({ ...prev, [type]: Math.max(0, (prev[type] || 0) - 1) }));
+  };
+
   useEffect(() => {
     fetchData();
   }, []);
@@ -56,10 +108,7 @@ const AdminDashboardPage = () => {
   const handlePublish = async (type, id) => {
     try {
       await api.patch(`/moderation/${type}/${id}/publish`);
-      setPending((prev) => ({
-        ...prev,
-        [type]: prev[type].filter((item) => item.id !== id),
-      }));
+      removeItem(type, id);
     } catch (err) {
       alert('Ошибка при публикации.');
       console.error(err);
@@ -84,10 +133,7 @@ const AdminDashboardPage = () => {
         { rejection_reason: reason }
       );
       
-      setPending((prev) => ({
-        ...prev,
-        [type]: prev[type].filter((item) => item.id !== id),
-      }));
+      removeItem(type, id);
       
       setRejectionReasons((prev) => {
         const newReasons = { ...prev };
@@ -135,7 +181,18 @@ const AdminDashboardPage = () => {
     );
   }
 
-  const totalPending = pending.vacancies.length + pending.internships.length + pending.users.length;
+  const totalPending = totals.vacancies + totals.internships + totals.users;
+
+  const renderLoadMore = (type) =>
+    cursors[type] && (
+      <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+        <Button variant="outlined" onClick={() => loadMore(type)} disabled={loadingMore === type}>
+          {loadingMore === type
+            ? 'Загрузка...'
+            : `Показать ещё (${pending[type].length} из ${totals[type]})`}
+        </Button>
+      </Box>
+    );
 
   return (
     <Box>
@@ -236,6 +293,7 @@ const AdminDashboardPage = () => {
               </CardContent>
             </Card>
           )}
+          {renderLoadMore('vacancies')}
         </Grid>
 
         {/* Стажировки */}
@@ -319,6 +377,7 @@ const AdminDashboardPage = () => {
               </CardContent>
             </Card>
           )}
+          {renderLoadMore('internships')}
         </Grid>
 
         {/* Пользователи */}
@@ -394,6 +453,7 @@ const AdminDashboardPage = () => {
               </CardContent>
             </Card>
           )}
+          {renderLoadMore('users')}
         </Grid>
       </Grid>
     </Box>
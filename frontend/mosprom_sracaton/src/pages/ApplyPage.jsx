@@ -30,6 +30,7 @@ const ApplyPage = () => {
     full_name: '',
     phone: '',
     email: user?.email || '',
+    city: '',
     education: '',
     experience: '',
     skills: ''
@@ -78,6 +79,7 @@ const ApplyPage = () => {
           full_name: formData.full_name.trim(),
           phone: formData.phone.trim(),
           email: formData.email.trim(),
+          city: formData.city.trim() || null,
           education: formData.education.trim() || null,
           experience: formData.experience.trim() || null,
           skills: formData.skills.trim() || null
@@ -181,6 +183,13 @@ const ApplyPage = () => {
                 type="email"
                 error={!formData.email.trim()}
               />
+              <TextField
+                label="Город"
+                name="city"
+                value={formData.city}
+                onChange={handleFormChange}
+                helperText="По городу HR может отбирать отклики"
+              />
               <TextField
                 label="Образование"
                 name="education"
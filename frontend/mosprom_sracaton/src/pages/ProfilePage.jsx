@@ -27,28 +27,57 @@ import CancelIcon from '@mui/icons-material/Cancel';
 import CheckCircleIcon from '@mui/icons-material/CheckCircle';
 import PendingIcon from '@mui/icons-material/Pending';
 
-// Компонент для отображения деталей отклика
+// Компонент для отображения деталей отклика.
+// В списке откликов анкеты нет — она загружается по кнопке из /applications/{id}
 const ApplicationDetails = ({ application }) => {
   const API_BASE_URL = 'http://localhost:8000';
+  const [details, setDetails] = useState(null);
+  const [loadingDetails, setLoadingDetails] = useState(false);
+  const [detailsError, setDetailsError] = useState(null);
+
+  const loadDetails = async () => {
+    try {
+      setLoadingDetails(true);
+      setDetailsError(null);
+      const res = await api.get(`/applications/${application.id}`);
+      setDetails(res.data);
+    } catch (e) {
+      console.error('Ошибка загрузки отклика:', e);
+      setDetailsError('Не удалось загрузить анкету');
+    } finally {
+      setLoadingDetails(false);
+    }
+  };
 
   let resumeData = null;
-  if (application.resume_data) {
+  if (details?.resume_data) {
     try {
-      resumeData = typeof application.resume_data === 'string'
-        ? JSON.parse(application.resume_data)
-        : application.resume_data;
+      resumeData = typeof details.resume_data === 'string'
+        ? JSON.parse(details.resume_data)
+        : details.resume_data;
     } catch (e) {
       console.error('Ошибка парсинга JSON в resume_data:', e);
     }
   }
 
+  if (!details) {
+    return (
+      <Box sx={{ mt: 1 }}>
+        <Button size="small" onClick={loadDetails} disabled={loadingDetails}>
+          {loadingDetails ? 'Загрузка...' : (application.has_file ? 'Открыть анкету и резюме' : 'Открыть анкету')}
+        </Button>
+        {detailsError && <Alert severity="error" sx={{ mt: 1 }}>{detailsError}</Alert>}
+      </Box>
+    );
+  }
+
   return (
     <Box sx={{ mt: 1, p: 2, border: '1px solid #eee', borderRadius: 1 }}>
-      {application.resume_file_path && (
+      {details.resume_file_path && (
         <Button
           variant="outlined"
           startIcon={<DescriptionIcon />}
-          href={`${API_BASE_URL}/${application.resume_file_path}`}
+          href={`${API_BASE_URL}/${details.resume_file_path}`}
           target="_blank"
           rel="noopener noreferrer"
         >
@@ -136,11 +165,17 @@ const RejectionNotifications = ({ rejections }) => {
   );
 };
 
+// Отклики отдаются страницами: следующая — по курсору из заголовка X-Next-Cursor
+const fetchApplicationsPage = (cursor) =>
+  api.get('/applications/my-vacancy-applications', { params: cursor ? { cursor } : {} });
+
 const ProfilePage = () => {
   const user = useAuthStore((state) => state.user);
   const [myVacancies, setMyVacancies] = useState([]);
   const [myInternships, setMyInternships] = useState([]);
   const [myApplications, setMyApplications] = useState([]);
+  const [applicationsCursor, setApplicationsCursor] = useState(null);
+  const [loadingMoreApplications, setLoadingMoreApplications] = useState(false);
   const [rejectedItems, setRejectedItems] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -161,7 +196,7 @@ const ProfilePage = () => {
           const allVacanciesRes = await api.get('/vacancies/my?include_rejected=true');
           
           // Получаем отклики
-          const applicationsRes = await api.get('/applications/my-vacancy-applications');
+          const applicationsRes = await fetchApplicationsPage();
 
           console.log('Активные вакансии:', vacanciesRes.data);
           console.log('Все вакансии:', allVacanciesRes.data);
@@ -196,6 +231,7 @@ const ProfilePage = () => {
           setRejectedItems(rejected);
           
           setMyApplications(applicationsRes.data);
+          setApplicationsCursor(applicationsRes.headers['x-next-cursor'] || null);
         }
 
         if (user.role === 'university') {
@@ -227,6 +263,23 @@ const ProfilePage = () => {
     fetchUserData();
   }, [user]);
 
+  const loadMoreApplications = async () => {
+    try {
+      setLoadingMoreApplications(true);
+      const res = await fetchApplicationsPage(applicationsCursor);
+      setMyApplications((prev) => {
+        const known = new Set(prev.map((app) => app.id));
+        return [...prev, ...res.data.filter((app) => !known.has(app.id))];
+      });
+      setApplicationsCursor(res.headers['x-next-cursor'] || null);
+    } catch (err) {
+      setError('Не удалось загрузить следующие отклики.');
+      console.error('Ошибка загрузки откликов:', err);
+    } finally {
+      setLoadingMoreApplications(false);
+    }
+  };
+
   if (!user) {
     return <Alert severity="warning">Пожалуйста, войдите в систему для просмотра профиля.</Alert>;
   }
@@ -388,7 +441,7 @@ const ProfilePage = () => {
                       {myApplications.map((app) => (
                         <ListItem key={app.id} divider alignItems="flex-start">
                           <ListItemText
-                            primary={`Отклик на вакансию ID: ${app.vacancy_id}`}
+                            primary={`Отклик на вакансию: ${app.posting_title || `ID ${app.vacancy_id}`}`}
                             secondary={
                               <>
                                 <Typography component="span" variant="body2" color="text.primary">
@@ -404,6 +457,13 @@ const ProfilePage = () => {
                   ) : (
                     <Alert severity="info">Новых откликов пока нет.</Alert>
                   )}
+                  {applicationsCursor && (
+                    <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+                      <Button variant="outlined" onClick={loadMoreApplications} disabled={loadingMoreApplications}>
+                        {loadingMoreApplications ? 'Загрузка...' : 'Показать ещё'}
+                      </Button>
+                    </Box>
+                  )}
                 </CardContent>
               </Card>
             )}